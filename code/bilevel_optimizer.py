@@ -0,0 +1,213 @@
+# bilevel_optimizer.py
+# 双层优化: 外层搜索 SCBC 变量 (θ5, PR_SCBC)，对每个 SCBC 设计点内层把 ORC 变量 (θw, PR_ORC) 优化到最优。
+# 内层复用 SCBC 子循环缓存，每个外层点只求解一次 SCBC，其余都是只算 ORC 的廉价模拟
+import os
+import csv
+import time
+import argparse
+import numpy as np
+import scipy.optimize
+
+import genetic_algorithm_optimizer as ga
+import state_point_calculator
+import full_cycle_simulator
+import hybrid_optimizer
+
+# --- Configuration ---
+SCBC_VAR_NAMES = ["theta_5_c", "pr_scbc"]  # 外层变量 (决定 SCBC)
+ORC_VAR_NAMES = ["theta_w_c", "pr_orc"]  # 内层变量 (只影响 ORC)
+# 两层都先在粗网格上搜索再用带边界的 Nelder-Mead 细化: 适应度在 θw 和 PR_SCBC 方向上都有台阶
+# (ORC 蒸发夹点位置切换时跳变约 0.01)，从单一起点出发的梯度法会停在台阶错误的一侧
+OUTER_GRID_POINTS = 5  # 外层网格每个变量的点数，网格上的 SCBC 点并行求解
+OUTER_MAX_ITERATIONS = 40
+OUTER_XATOL = 1e-3  # 外层 Nelder-Mead 的收敛步长 (缩放坐标)
+INNER_GRID_POINTS = 7
+INNER_MAX_ITERATIONS = 60
+INNER_XATOL = 1e-4
+# 与局部精修相同，收紧回热迭代容差，避免求解器噪声干扰单纯形的比较
+PARAM_OVERRIDES = hybrid_optimizer.REFINE_PARAM_OVERRIDES
+
+BILEVEL_LOG_FILE = os.path.join(ga.OUTPUT_DIR, "bilevel_optimization_log.csv")
+
+
+def _scaled_bounds(var_names):
+    lower, upper = ga.gene_bounds()
+    indices = [ga.VAR_NAMES.index(var_name) for var_name in var_names]
+    return lower[indices], upper[indices]
+
+
+def _grid(n_points):
+    """[0, 1]^2 上 n_points × n_points 的网格点 [n_points², 2]。"""
+    axis = np.linspace(0.0, 1.0, n_points)
+    return np.array([[a, b] for a in axis for b in axis])
+
+
+def _nelder_mead(objective, x0, grid_spacing, max_iterations, xatol):
+    """在 [0, 1]^2 内从网格最优点出发做 Nelder-Mead，初始单纯形边长取半个网格间距 (朝区域内侧)。"""
+    step = 0.5 * grid_spacing
+    simplex = np.vstack([x0, x0 + np.diag(np.where(x0 + step > 1.0, -step, step))])
+    return scipy.optimize.minimize(objective, x0, method="Nelder-Mead", bounds=[(0.0, 1.0)] * 2,
+                                   options={"maxiter": max_iterations, "xatol": xatol, "fatol": 1e-9,
+                                            "initial_simplex": simplex})
+
+
+def solve_orc_subproblem(scbc_genes, param_overrides=None, grid_points=None, max_iterations=None):
+    """
+    内层问题: SCBC 变量固定为 scbc_genes ({"theta_5_c": ..., "pr_scbc": ...}) 时求最优的 (θw, PR_ORC)。
+    先在 grid_points × grid_points 的 ORC 网格上评估，再从最优网格点出发做 Nelder-Mead。
+    SCBC 子循环缓存保证这里的 SCBC 只求解一次 (可在进程池工作进程中调用)。
+    返回 {"genes", "fitness", "sim_results", "n_orc_evaluations", "n_scbc_solves", "eval_time_s"}，
+    所有 ORC 设计点都失败时 fitness 为 -inf。
+    """
+    grid_points = grid_points or INNER_GRID_POINTS
+    max_iterations = max_iterations or INNER_MAX_ITERATIONS
+    if not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED:
+        full_cycle_simulator.enable_scbc_stage_cache(ga.SCBC_STAGE_CACHE_SIZE)
+    scbc_solves_before = full_cycle_simulator.get_scbc_stage_cache_stats()["misses"]
+    lower, upper = _scaled_bounds(ORC_VAR_NAMES)
+    start_time = time.perf_counter()
+    memo = {}  # 缩放坐标 -> (适应度, 模拟指标)
+
+    def evaluate(x_scaled):
+        x_scaled = np.clip(x_scaled, 0.0, 1.0)
+        key = tuple(np.round(x_scaled, 12))
+        if key not in memo:
+            genes = dict(scbc_genes, **dict(zip(ORC_VAR_NAMES, lower + x_scaled * (upper - lower))))
+            sim_results = ga.run_simulation_inprocess(genes, param_overrides)
+            fitness = ga.fitness_from_metrics(sim_results) if sim_results is not None else None
+            memo[key] = (fitness if fitness is not None else -float('inf'), sim_results)
+        return memo[key][0]
+
+    def objective(x_scaled):
+        fitness = evaluate(x_scaled)
+        return -fitness if np.isfinite(fitness) else hybrid_optimizer.FAILED_OBJECTIVE
+
+    grid = _grid(grid_points)
+    grid_fitness = np.array([evaluate(x) for x in grid])
+    x_best = grid[int(np.argmax(grid_fitness))]
+    if np.isfinite(grid_fitness.max()):
+        solution = _nelder_mead(objective, x_best, 1.0 / (grid_points - 1), max_iterations, INNER_XATOL)
+        if evaluate(solution.x) > evaluate(x_best):
+            x_best = np.clip(solution.x, 0.0, 1.0)
+    fitness, sim_results = memo[tuple(np.round(x_best, 12))]
+    return {
+        "genes": dict(scbc_genes, **dict(zip(ORC_VAR_NAMES, lower + x_best * (upper - lower)))),
+        "fitness": fitness,
+        "sim_results": sim_results,
+        "n_orc_evaluations": len(memo),
+        "n_scbc_solves": full_cycle_simulator.get_scbc_stage_cache_stats()["misses"] - scbc_solves_before,
+        "eval_time_s": time.perf_counter() - start_time
+    }
+
+
+def run_bilevel_optimization(n_workers=None, outer_grid_points=None, inner_grid_points=None,
+                             outer_max_iterations=None):
+    """
+    双层优化 (与 ga.run_genetic_algorithm 的适应度相同):
+    外层先在 outer_grid_points² 的 (θ5, PR_SCBC) 网格上并行求解内层问题，再从最优网格点出发做 Nelder-Mead；
+    外层每个设计点的适应度是内层 ORC 最优化后的适应度。
+    返回最优个体字典 (格式同 ga.run_genetic_algorithm)，另含 n_scbc_solves、n_orc_evaluations 和 n_outer_points。
+    """
+    outer_grid_points = outer_grid_points or OUTER_GRID_POINTS
+    inner_grid_points = inner_grid_points or INNER_GRID_POINTS
+    outer_max_iterations = outer_max_iterations or OUTER_MAX_ITERATIONS
+    n_workers = n_workers if n_workers is not None else (ga.PARALLEL_WORKERS or ga.default_worker_count())
+    lower, upper = _scaled_bounds(SCBC_VAR_NAMES)
+    outer_memo = {}  # 缩放坐标 -> 内层结果
+    totals = {"n_scbc_solves": 0, "n_orc_evaluations": 0}
+
+    # 日志每行一个外层 SCBC 设计点及其内层最优的 ORC 变量
+    log_file = open(BILEVEL_LOG_FILE, 'w', encoding='utf-8', newline='')
+    log_writer = csv.writer(log_file)
+    log_writer.writerow(["Stage", "OuterPoint"] + ga.VAR_NAMES +
+                        ["Fitness", "ThermalEfficiency", "ExergyEfficiency", "ORC_Evaluations", "EvalTime_s"])
+
+    def scbc_genes(x_scaled):
+        return dict(zip(SCBC_VAR_NAMES, lower + np.clip(x_scaled, 0.0, 1.0) * (upper - lower)))
+
+    def record(stage, x_scaled, inner_result):
+        outer_memo[tuple(np.round(x_scaled, 12))] = inner_result
+        totals["n_scbc_solves"] += inner_result["n_scbc_solves"]
+        totals["n_orc_evaluations"] += inner_result["n_orc_evaluations"]
+        sim_results = inner_result["sim_results"] or {}
+        log_writer.writerow(
+            [stage, len(outer_memo)] + [f"{inner_result['genes'][var_name]:.6f}" for var_name in ga.VAR_NAMES] +
+            [f"{inner_result['fitness']:.8f}"] +
+            [f"{sim_results[metric]:.8f}" if sim_results.get(metric) is not None else "N/A"
+             for metric in ("thermal_efficiency", "exergy_efficiency")] +
+            [inner_result["n_orc_evaluations"], f"{inner_result['eval_time_s']:.3f}"])
+        log_file.flush()
+
+    def outer_objective(x_scaled):
+        x_scaled = np.clip(x_scaled, 0.0, 1.0)
+        key = tuple(np.round(x_scaled, 12))
+        if key not in outer_memo:
+            record("refine", x_scaled, solve_orc_subproblem(scbc_genes(x_scaled), PARAM_OVERRIDES,
+                                                            inner_grid_points))
+        fitness = outer_memo[key]["fitness"]
+        return -fitness if np.isfinite(fitness) else hybrid_optimizer.FAILED_OBJECTIVE
+
+    print(f"双层优化开始。外层网格 {outer_grid_points}×{outer_grid_points} ({', '.join(SCBC_VAR_NAMES)})，"
+          f"内层网格 {inner_grid_points}×{inner_grid_points} ({', '.join(ORC_VAR_NAMES)})，工作进程 {n_workers}")
+    start_time = time.time()
+    # 主进程中的物性缓存 (串行网格和外层细化使用; 工作进程由 ga.create_worker_pool 各自开启)。
+    # 与 GA 的进程池一样不使用热启动，串行和并行计算的外层网格结果相同。
+    # 结束后关闭由这里 (以及主进程中的 solve_orc_subproblem) 开启的缓存，调用前已开启的缓存保持开启
+    disable_on_exit = []
+    if ga.USE_PROPERTY_CACHE and not state_point_calculator.PROPERTY_CACHE_ENABLED:
+        state_point_calculator.enable_property_cache(ga.PROPERTY_CACHE_SIZE)
+        disable_on_exit.append(state_point_calculator.disable_property_cache)
+    if not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED:
+        disable_on_exit.append(full_cycle_simulator.disable_scbc_stage_cache)
+    try:
+        # 1. 外层网格: 各 SCBC 点的内层问题互相独立，交给进程池并行求解
+        grid = _grid(outer_grid_points)
+        tasks = [(scbc_genes(x), PARAM_OVERRIDES, inner_grid_points) for x in grid]
+        if n_workers > 1:
+            with ga.create_worker_pool(n_workers) as pool:
+                grid_results = pool.starmap(solve_orc_subproblem, tasks)
+        else:
+            grid_results = [solve_orc_subproblem(*task) for task in tasks]
+        for x, inner_result in zip(grid, grid_results):
+            record("grid", x, inner_result)
+        x_best = grid[int(np.argmax([inner_result["fitness"] for inner_result in grid_results]))]
+        print(f"  外层网格完成: 最优适应度 {outer_memo[tuple(np.round(x_best, 12))]['fitness']:.6f}, "
+              f"SCBC 求解 {totals['n_scbc_solves']} 次, ORC 模拟 {totals['n_orc_evaluations']} 次")
+
+        # 2. 外层细化 (串行; 每个外层点求解一次 SCBC，内层只算 ORC)
+        solution = _nelder_mead(outer_objective, x_best, 1.0 / (outer_grid_points - 1), outer_max_iterations,
+                                OUTER_XATOL)
+        if outer_objective(solution.x) < outer_objective(x_best):
+            x_best = np.clip(solution.x, 0.0, 1.0)
+        inner_result = outer_memo[tuple(np.round(x_best, 12))]
+    finally:
+        log_file.close()
+        for disable_cache in disable_on_exit:
+            disable_cache()
+
+    sim_results = inner_result["sim_results"] or {}
+    best = {
+        "genes": inner_result["genes"],
+        "fitness": inner_result["fitness"],
+        "metrics": {"eta_t": sim_results.get("thermal_efficiency"),
+                    "eta_e": sim_results.get("exergy_efficiency"),
+                    "cost_c": sim_results.get("cost")},
+        "n_scbc_solves": totals["n_scbc_solves"],
+        "n_orc_evaluations": totals["n_orc_evaluations"],
+        "n_outer_points": len(outer_memo)
+    }
+    print(f"双层优化结束，耗时 {time.time() - start_time:.2f} 秒。外层 {best['n_outer_points']} 个 SCBC 设计点，"
+          f"SCBC 求解 {best['n_scbc_solves']} 次，ORC 模拟 {best['n_orc_evaluations']} 次 "
+          f"(扁平 4 维 GA 每次模拟都求解 SCBC，默认设置最多 {ga.POPULATION_SIZE * ga.MAX_GENERATIONS} 次)")
+    hybrid_optimizer._print_result("双层优化最优个体", best, best["n_orc_evaluations"])
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SCBC/ORC联合循环双层优化: 外层 (θ5, PR_SCBC)，内层 (θw, PR_ORC)。")
+    parser.add_argument("--workers", type=int, default=None, help="外层网格的并行工作进程数 (默认取 CPU 亲和性掩码)")
+    parser.add_argument("--outer-grid", type=int, default=OUTER_GRID_POINTS, help="外层网格每个变量的点数")
+    parser.add_argument("--inner-grid", type=int, default=INNER_GRID_POINTS, help="内层网格每个变量的点数")
+    parser.add_argument("--outer-iterations", type=int, default=OUTER_MAX_ITERATIONS, help="外层 Nelder-Mead 最大迭代数")
+    args = parser.parse_args()
+    best_solution = run_bilevel_optimization(args.workers, args.outer_grid, args.inner_grid, args.outer_iterations)
@@ -2,7 +2,8 @@
 
 import sys
 import os
-from state_point_calculator import StatePoint # 假设 'state_point_calculator.py' 在同一目录或Python路径中
+import numpy as np
+from state_point_calculator import StatePoint, StateBatch # 假设 'state_point_calculator.py' 在同一目录或Python路径中
 # 如果 StatePoint 类依赖全局的 T0_K, P0_PA 进行㶲计算，
 # 确保 '状态点计算.py' 中的这些值是您希望使用的。
 
@@ -245,8 +246,8 @@ def model_heat_exchanger_effectiveness(
     P_cold_out_Pa = P_cold_in_Pa - pressure_drop_cold_Pa
 
     Q_exchanged_J = 0
-    state_hot_out = StatePoint(fluid_hot, name=f"{state_hot_in.name}_out_{name_suffix}")
-    state_cold_out = StatePoint(fluid_cold, name=f"{state_cold_in.name}_out_{name_suffix}")
+    state_hot_out = StatePoint(fluid_hot, "{}_out_{}", name_args=(state_hot_in, name_suffix))
+    state_cold_out = StatePoint(fluid_cold, "{}_out_{}", name_args=(state_cold_in, name_suffix))
     state_hot_out.m_dot = m_dot_hot
     state_cold_out.m_dot = m_dot_cold
 
@@ -296,8 +297,8 @@ def model_evaporator_GO(
     P_hot_out_Pa = state_hot_in.P - pressure_drop_hot_Pa
     P_cold_out_Pa = state_cold_in.P - pressure_drop_cold_Pa
 
-    state_hot_out = StatePoint(state_hot_in.fluid, name=f"{state_hot_in.name}_out_{name_suffix}")
-    state_cold_out = StatePoint(state_cold_in.fluid, name=f"{state_cold_in.name}_out_{name_suffix}")
+    state_hot_out = StatePoint(state_hot_in.fluid, "{}_out_{}", name_args=(state_hot_in, name_suffix))
+    state_cold_out = StatePoint(state_cold_in.fluid, "{}_out_{}", name_args=(state_cold_in, name_suffix))
     state_hot_out.m_dot = state_hot_in.m_dot
     state_cold_out.m_dot = state_cold_in.m_dot
     
@@ -370,7 +371,7 @@ def model_cooler_set_T_out(
 
     P_out_Pa = state_in.P - pressure_drop_Pa
     
-    state_out = StatePoint(fluid_name=state_in.fluid, name=f"{state_in.name}_out_{name_suffix}")
+    state_out = StatePoint(state_in.fluid, "{}_out_{}", name_args=(state_in, name_suffix))
     
     if target_state_is_saturated_liquid:
         print(f"信息: 冷却器 {name_suffix} 目标为饱和液体，将使用 P, Q=0 设置出口状态。")
@@ -420,7 +421,7 @@ def model_heater_set_T_out(
 
     P_out_Pa = state_in.P - pressure_drop_Pa
     
-    state_out = StatePoint(fluid_name=state_in.fluid, name=f"{state_in.name}_out_{name_suffix}")
+    state_out = StatePoint(state_in.fluid, "{}_out_{}", name_args=(state_in, name_suffix))
     state_out.props_from_PT(P_out_Pa, T_out_K)
     state_out.m_dot = state_in.m_dot # 传递质量流量
 
@@ -435,6 +436,87 @@ def model_heater_set_T_out(
 
     return state_out, Q_absorbed_J
 
+# --- 批量版本 (StateBatch): 一次计算 N 个设计点的同一部件，供 simulate_many 使用 ---
+# 物性均按单位质量计算 (J/kg)，流量比由调用者给出；失败的元素 valid 为 False，对应的焓和功为 NaN。
+
+def _isentropic_batch(state_in: StateBatch, P_out_Pa, eta_isen, expansion, name_out):
+    if not np.all((0 < np.asarray(eta_isen)) & (np.asarray(eta_isen) <= 1)):
+        raise ValueError("等熵效率必须在 (0, 1] 范围内。")
+    ideal_state_out = StateBatch(state_in.fluid, f"{name_out}_ideal").props_from_PS(P_out_Pa, state_in.s)
+    if expansion:
+        h_out_actual_J_kg = state_in.h - (state_in.h - ideal_state_out.h) * eta_isen
+    else:
+        h_out_actual_J_kg = state_in.h + (ideal_state_out.h - state_in.h) / eta_isen
+    state_out_actual = StateBatch(state_in.fluid, name_out).props_from_PH(P_out_Pa, h_out_actual_J_kg)
+    state_out_actual.valid &= state_in.valid & ideal_state_out.valid
+    return state_out_actual, h_out_actual_J_kg - state_in.h
+
+
+def model_compressor_batch(state_in: StateBatch, P_out_Pa, eta_isen):
+    """
+    model_compressor_MC 的批量版本 (也用于再压缩机)。
+    P_out_Pa 和 eta_isen 可以是标量或与 state_in 等长的数组。
+    返回 (state_out_actual, W_consumed_J_kg 数组)。
+    """
+    return _isentropic_batch(state_in, P_out_Pa, eta_isen, expansion=False, name_out="压缩机出口")
+
+
+def model_turbine_batch(state_in: StateBatch, P_out_Pa, eta_isen):
+    """model_turbine_T 的批量版本。返回 (state_out_actual, W_produced_J_kg 数组)，功为正值。"""
+    state_out_actual, dh_J_kg = _isentropic_batch(state_in, P_out_Pa, eta_isen, expansion=True, name_out="透平出口")
+    return state_out_actual, -dh_J_kg
+
+
+def model_pump_batch(state_in: StateBatch, P_out_Pa, eta_isen):
+    """model_pump_ORC 的批量版本。返回 (state_out_actual, W_consumed_J_kg 数组)。"""
+    return _isentropic_batch(state_in, P_out_Pa, eta_isen, expansion=False, name_out="泵出口")
+
+
+def model_heat_exchanger_effectiveness_batch(
+    state_hot_in: StateBatch,
+    state_cold_in: StateBatch,
+    effectiveness,
+    hot_fluid_is_C_min_side: bool = True,
+    flow_ratio_hot_to_cold=1.0
+):
+    """
+    model_heat_exchanger_effectiveness 的批量版本 (不考虑压降)。
+    flow_ratio_hot_to_cold 为热侧与冷侧质量流量之比 (标量或数组)。
+    返回 (state_hot_out, state_cold_out, Q_exchanged_J_kg)，Q 按单位热侧流量计。
+    """
+    if not np.all((0 <= np.asarray(effectiveness)) & (np.asarray(effectiveness) <= 1)):
+        raise ValueError("换热器效能必须在 [0, 1] 范围内。")
+    dT_max_K = state_hot_in.T - state_cold_in.T
+    if hot_fluid_is_C_min_side:
+        state_hot_out = StateBatch(state_hot_in.fluid).props_from_PT(state_hot_in.P,
+                                                                     state_hot_in.T - effectiveness * dT_max_K)
+        Q_exchanged_J_kg = state_hot_in.h - state_hot_out.h
+        state_cold_out = StateBatch(state_cold_in.fluid).props_from_PH(
+            state_cold_in.P, state_cold_in.h + Q_exchanged_J_kg * flow_ratio_hot_to_cold)
+    else:
+        state_cold_out = StateBatch(state_cold_in.fluid).props_from_PT(state_cold_in.P,
+                                                                       state_cold_in.T + effectiveness * dT_max_K)
+        Q_exchanged_J_kg = (state_cold_out.h - state_cold_in.h) / flow_ratio_hot_to_cold
+        state_hot_out = StateBatch(state_hot_in.fluid).props_from_PH(state_hot_in.P,
+                                                                     state_hot_in.h - Q_exchanged_J_kg)
+    valid = state_hot_in.valid & state_cold_in.valid & state_hot_out.valid & state_cold_out.valid
+    state_hot_out.valid, state_cold_out.valid = valid.copy(), valid.copy()
+    return state_hot_out, state_cold_out, Q_exchanged_J_kg
+
+
+def model_heater_set_T_out_batch(state_in: StateBatch, T_out_K):
+    """model_heater_set_T_out 的批量版本 (不考虑压降)。返回 (state_out, Q_absorbed_J_kg 数组)。"""
+    state_out = StateBatch(state_in.fluid).props_from_PT(state_in.P, T_out_K)
+    state_out.valid &= state_in.valid
+    return state_out, state_out.h - state_in.h
+
+
+def model_cooler_set_T_out_batch(state_in: StateBatch, T_out_K):
+    """model_cooler_set_T_out 的批量版本 (不考虑压降)。返回 (state_out, Q_rejected_J_kg 数组)。"""
+    state_out = StateBatch(state_in.fluid).props_from_PT(state_in.P, T_out_K)
+    state_out.valid &= state_in.valid
+    return state_out, state_in.h - state_out.h
+
 if __name__ == '__main__':
     # 设置输出重定向到文件
     tee = TeeOutput('cycle_components_output.txt')
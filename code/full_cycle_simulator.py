@@ -1,6 +1,9 @@
 import json
 import contextlib
-from state_point_calculator import StatePoint, to_kelvin, to_pascal, T0_K
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Optional
+from state_point_calculator import StatePoint, StateBatch, to_kelvin, to_pascal, get_reference_state
 from cycle_components import (
     model_compressor_MC,
     model_turbine_T,
@@ -8,9 +11,18 @@ from cycle_components import (
     model_heat_exchanger_effectiveness,
     model_evaporator_GO,
     model_cooler_set_T_out,
-    model_heater_set_T_out
+    model_heater_set_T_out,
+    model_compressor_batch,
+    model_turbine_batch,
+    model_pump_batch,
+    model_heat_exchanger_effectiveness_batch,
+    model_heater_set_T_out_batch,
+    model_cooler_set_T_out_batch
 )
+import modify_cycle_parameters
 import sys  # For redirecting output if needed
+import numpy as np
+import scipy.optimize
 sys.stdout.reconfigure(encoding='utf-8')
 
 # Optional: for numerical root finding
@@ -29,6 +41,7 @@ def calculate_exergy_efficiency(Q_in_J_s, T_source_K, W_net_J_s):
         火用效率 (无量纲)
     """
     # 卡诺因子
+    T0_K, _ = get_reference_state()
     carnot_factor = 1 - T0_K / T_source_K
     
     # 热输入的火用
@@ -52,8 +65,300 @@ def calculate_theoretical_exergy_efficiency(T_source_K):
     返回:
         理论火用效率 (无量纲)
     """
+    T0_K, _ = get_reference_state()
     return 1 - T0_K / T_source_K
 
+def _no_log(*args, **kwargs):
+    """verbose=False 时替代 print，不做任何格式化和输出"""
+    pass
+
+# SCBC 质量流量求解方式 (参数文件 scbc_parameters.mass_flow_solve_mode):
+#   "per_kg"    - 按单位质量流量收敛一次回热器，再线性缩放到目标 Q_ER (默认)
+#   "iterative" - 原始方式，反复调整总流量并重新计算整个高温侧，直到 Q_ER 误差 < 0.1%
+#   "equation_oriented" - 把 h6, h7, m_dot_total, m_dot_orc 联立为一个方程组，用 scipy.optimize.root 求解。
+#                         SCBC 残差与 m_dot_orc 无关 (雅可比为块三角)，m_dot_orc 只出现在 ORC 蒸发器的能量平衡中，不反馈到 SCBC。
+#                         因此与 "per_kg" 的区别只在于回热迭代 (h6, h7) 与流量缩放联立求解，收敛后两者给出相同的解；
+#                         ORC 状态点直接按解出的 m_dot_orc 计算，不再单独求解 ORC 流量。残差函数调用次数记在 eo_nfev 中
+MASS_FLOW_SOLVE_MODES = ("per_kg", "iterative", "equation_oriented")
+
+# ORC 流量求解方式 (参数文件 orc_parameters.orc_mdot_solve_mode):
+#   "direct" - 由已知的蒸发器出口状态直接计算流量，失败时用有界求根 (默认)
+#   "search" - 原始方式，每次按 ±2% 调整流量并重新计算出口状态，最多 max_iter_orc_mdot 次
+ORC_MDOT_SOLVE_MODES = ("direct", "search")
+
+# SCBC 回热迭代 (撕裂流 h6/h7) 的加速方法 (参数文件 scbc_parameters.regen_accelerator):
+#   "substitution" - 原始的逐次代换；"wegstein" - 逐分量 Wegstein (默认)；
+#   "anderson" - Anderson 混合；"secant" - Broyden 拟牛顿 (多元割线法)
+REGEN_ACCELERATORS = ("substitution", "wegstein", "anderson", "secant")
+
+# 热启动 (continuation): 用相邻设计点的收敛解作为撕裂变量 (h6, h7, m_dot_total, m_dot_orc) 的初值。
+# 设计点向量为 (θ5 °C, PR_SCBC, θw °C, PR_ORC)，最近邻按下面的尺度归一化后的欧氏距离查找，
+# 距离超过 WARM_START_MAX_DISTANCE 时仍使用参数文件中的固定初值。
+# 缓存中有多个近邻时，用最近的 WARM_START_NEIGHBOURS 个解做局部线性拟合 (一阶预测)，沿扫描路径外推初值。
+WARM_START_DESIGN_SCALE = (10.0, 0.2, 3.0, 0.2)
+WARM_START_MAX_DISTANCE = 5.0
+WARM_START_NEIGHBOURS = 3
+WARM_START_CACHE_ENABLED = False
+WARM_START_CACHE_MAXSIZE = 5000
+_warm_start_cache = OrderedDict()
+_warm_start_stats = {"hits": 0, "misses": 0}
+
+# SCBC 子循环缓存: SCBC 的解只取决于 SCBC 工质、吸热量和 scbc_parameters (θ5, PR_SCBC 及固定设置)，
+# ORC 只用到 SCBC 交出的 Q_GO、T8、T9。只改变 ORC 参数 (θw, PR_ORC 等) 的设计点直接复用缓存的 SCBC 结果，只重算 ORC。
+# "equation_oriented" 模式的结果还包含联立解出的 ORC 流量，该模式下的键包含 ORC 参数，只有 ORC 参数也相同时才命中。
+SCBC_STAGE_CACHE_ENABLED = False
+SCBC_STAGE_CACHE_MAXSIZE = 1000
+_scbc_stage_cache = OrderedDict()
+_scbc_stage_stats = {"hits": 0, "misses": 0}
+
+
+@dataclass
+class CycleSimulationResult:
+    """
+    simulate_scbc_orc_cycle 的结构化返回结果。
+    功率单位为 MW，效率为无量纲小数，质量流量单位为 kg/s。
+    scbc_states / orc_states 为计算得到的全部状态点 (StatePoint 对象)。
+    """
+    W_net_scbc_MW: float
+    W_net_orc_MW: float
+    W_net_combined_MW: float
+    Q_er_MW: float
+    eta_scbc_thermal: float
+    eta_scbc_exergy: float
+    eta_orc_thermal: float
+    eta_orc_exergy: float
+    eta_combined_thermal: Optional[float]
+    eta_combined_exergy: Optional[float]
+    carnot_efficiency: float
+    m_dot_total_kg_s: float
+    m_dot_mc_branch_kg_s: float
+    m_dot_rc_kg_s: float
+    m_dot_orc_kg_s: Optional[float]
+    Q_go_MW: Optional[float]
+    mflow_iterations: int
+    regen_iterations: int
+    orc_mdot_iterations: Optional[int]
+    scbc_states: dict = field(default_factory=dict)
+    orc_states: dict = field(default_factory=dict)
+    eo_nfev: Optional[int] = None  # "equation_oriented" 模式的残差函数调用次数 (该模式没有流量/回热迭代，两者记为 0)
+    regen_residual_history: list = field(default_factory=list)  # 最后一次回热迭代的 [(|Δh6|, |Δh7|) kJ/kg]
+    tear_variables: dict = field(default_factory=dict)  # 收敛后的撕裂变量，可作为相邻设计点的 warm_start
+
+
+@dataclass
+class SCBCStageResult:
+    """
+    simulate_scbc_stage 的返回结果: 收敛后的 SCBC 状态点和性能，以及交给 ORC 的 GO 换热数据。
+    功和热量单位为 J/s (W)，温度单位为 K。
+    """
+    scbc_states: dict
+    Q_er_J_s: float
+    W_net_scbc_J_s: float
+    Q_go_J_s: Optional[float]  # GO 中 SCBC 热侧放出的热量 (正值)
+    T8_go_hot_in_K: float
+    T9_go_hot_out_K: float
+    eta_scbc_thermal: float
+    eta_scbc_exergy: float
+    carnot_efficiency: float
+    T_er_source_K: float
+    mflow_iterations: int
+    regen_iterations: int
+    regen_residual_history: list = field(default_factory=list)
+    m_dot_orc_kg_s: Optional[float] = None  # "equation_oriented" 模式联立解出的 ORC 流量，ORC 子循环直接使用
+    eo_nfev: Optional[int] = None  # "equation_oriented" 模式的残差函数调用次数
+    cached: bool = False  # 取自 SCBC 子循环缓存 (本次未求解 SCBC，迭代次数记为 0)
+
+    def copy(self, **changes):
+        """复制结果 (状态点和残差历史也复制)，调用方修改返回的状态点不会影响缓存中的结果。"""
+        return replace(self, scbc_states={key: state.clone() for key, state in self.scbc_states.items()},
+                       regen_residual_history=list(self.regen_residual_history), **changes)
+
+
+def design_vector_from_params(params):
+    """从参数字典中取出设计点向量 (θ5 °C, PR_SCBC, θw °C, PR_ORC)，缺少任一项时返回 None。"""
+    scbc_params = params.get("scbc_parameters", {})
+    orc_params = params.get("orc_parameters", {})
+    design = (scbc_params.get("T5_turbine_inlet_C"), scbc_params.get("PR_main_cycle_pressure_ratio"),
+              orc_params.get("target_theta_w_orc_turbine_inlet_C"), orc_params.get("target_pr_orc_expansion_ratio"))
+    if any(v is None for v in design):
+        return None
+    return tuple(float(v) for v in design)
+
+
+def enable_warm_start_cache(maxsize=None):
+    """开启最近邻热启动缓存: 之后每次成功的仿真都会记录其撕裂变量，未显式传入 warm_start 时自动查找最近的解。"""
+    global WARM_START_CACHE_ENABLED, WARM_START_CACHE_MAXSIZE
+    WARM_START_CACHE_ENABLED = True
+    if maxsize is not None:
+        WARM_START_CACHE_MAXSIZE = maxsize
+
+
+def disable_warm_start_cache(clear=True):
+    """关闭热启动缓存 (默认同时清空)。"""
+    global WARM_START_CACHE_ENABLED
+    WARM_START_CACHE_ENABLED = False
+    if clear:
+        clear_warm_start_cache()
+
+
+def clear_warm_start_cache():
+    """清空热启动缓存和统计信息。"""
+    _warm_start_cache.clear()
+    _warm_start_stats.update(hits=0, misses=0)
+
+
+def get_warm_start_cache_stats():
+    """返回热启动缓存的命中、未命中次数和当前条目数。"""
+    return dict(_warm_start_stats, size=len(_warm_start_cache))
+
+
+def export_warm_start_cache():
+    """按插入顺序导出热启动缓存 [(设计点, 撕裂变量字典), ...] 和统计信息，供检查点保存。"""
+    return [(design, dict(tears)) for design, tears in _warm_start_cache.items()], dict(_warm_start_stats)
+
+
+def import_warm_start_cache(entries, stats=None):
+    """用 export_warm_start_cache() 的结果替换当前热启动缓存 (保持原插入顺序，恢复后的查找结果与导出时一致)。"""
+    _warm_start_cache.clear()
+    for design, tears in entries:
+        _warm_start_cache[tuple(design)] = dict(tears)
+    if stats is not None:
+        _warm_start_stats.update(stats)
+
+
+def find_warm_start(params):
+    """
+    在热启动缓存中查找 params 设计点附近的已收敛解，返回撕裂变量字典 (格式同 CycleSimulationResult.tear_variables)。
+    有两个以上近邻时对最近的 WARM_START_NEIGHBOURS 个解做局部线性拟合，返回在该设计点的预测值
+    (限制在近邻取值范围向外延伸半个范围之内，避免近邻共线时外推出物性范围)；否则返回最近解本身。
+    缓存为空、设计点不完整或最近距离超过 WARM_START_MAX_DISTANCE 时返回 None。
+    """
+    design = design_vector_from_params(params)
+    if design is None or not _warm_start_cache:
+        _warm_start_stats["misses"] += 1
+        return None
+    designs = np.array(list(_warm_start_cache.keys()))
+    offsets = (designs - np.array(design)) / np.array(WARM_START_DESIGN_SCALE)
+    distances = np.sqrt((offsets ** 2).sum(axis=1))
+    neighbours = np.argsort(distances)[:WARM_START_NEIGHBOURS]
+    if distances[neighbours[0]] > WARM_START_MAX_DISTANCE:
+        _warm_start_stats["misses"] += 1
+        return None
+    _warm_start_stats["hits"] += 1
+    nearest = _warm_start_cache[tuple(designs[neighbours[0]])]
+    if len(neighbours) < 2 or distances[neighbours[0]] == 0:
+        return nearest
+
+    # 局部线性模型 y ≈ c0 + c·Δx，设计点本身 Δx = 0，所以预测值就是截距 c0
+    neighbour_tears = [_warm_start_cache[tuple(designs[i])] for i in neighbours]
+    A = np.column_stack([np.ones(len(neighbours)), offsets[neighbours]])
+    predicted = dict(nearest)
+    for key in nearest:
+        values = [tear.get(key) for tear in neighbour_tears]
+        if any(v is None for v in values):
+            continue
+        coef = np.linalg.lstsq(A, np.array(values, dtype=float), rcond=None)[0]
+        margin = 0.5 * (max(values) - min(values))
+        if np.isfinite(coef[0]) and coef[0] > 0:
+            predicted[key] = float(min(max(coef[0], min(values) - margin), max(values) + margin))
+    return predicted
+
+
+def _store_warm_start(params, tear_variables):
+    design = design_vector_from_params(params)
+    if design is None or not tear_variables:
+        return
+    _warm_start_cache[design] = tear_variables
+    _warm_start_cache.move_to_end(design)
+    while len(_warm_start_cache) > WARM_START_CACHE_MAXSIZE:
+        _warm_start_cache.popitem(last=False)
+
+
+def scbc_stage_key(params):
+    """
+    SCBC 子循环缓存的键 (SCBC 相关参数的 JSON 串)。
+    "equation_oriented" 模式的结果还包含联立解出的 ORC 流量，键中加入 ORC 工质、ORC 参数和换热器参数。
+    """
+    scbc_params = params.get("scbc_parameters", {})
+    key_parts = [params.get("fluids", {}).get("scbc", "CO2"), params.get("reference_conditions"),
+                 params.get("notes", {}).get("phi_ER_MW_heat_input", 600.0), scbc_params]
+    if scbc_params.get("mass_flow_solve_mode", "per_kg") == "equation_oriented":
+        key_parts += [params.get("fluids", {}).get("orc", "R245fa"), params.get("orc_parameters"),
+                      params.get("heat_exchangers_common")]
+    return json.dumps(key_parts, sort_keys=True)
+
+
+def enable_scbc_stage_cache(maxsize=None):
+    """开启 SCBC 子循环缓存: 之后 SCBC 参数相同的仿真直接复用已收敛的 SCBC 结果。"""
+    global SCBC_STAGE_CACHE_ENABLED, SCBC_STAGE_CACHE_MAXSIZE
+    SCBC_STAGE_CACHE_ENABLED = True
+    if maxsize is not None:
+        SCBC_STAGE_CACHE_MAXSIZE = maxsize
+
+
+def disable_scbc_stage_cache(clear=True):
+    """关闭 SCBC 子循环缓存 (默认同时清空)。"""
+    global SCBC_STAGE_CACHE_ENABLED
+    SCBC_STAGE_CACHE_ENABLED = False
+    if clear:
+        clear_scbc_stage_cache()
+
+
+def clear_scbc_stage_cache():
+    """清空 SCBC 子循环缓存和统计信息。"""
+    _scbc_stage_cache.clear()
+    _scbc_stage_stats.update(hits=0, misses=0)
+
+
+def get_scbc_stage_cache_stats():
+    """返回 SCBC 子循环缓存的命中、未命中次数和当前条目数。"""
+    return dict(_scbc_stage_stats, size=len(_scbc_stage_cache))
+
+
+def export_scbc_stage_cache():
+    """按 LRU 顺序导出 SCBC 子循环缓存 [(键, SCBCStageResult), ...] 和统计信息，供检查点保存。"""
+    return list(_scbc_stage_cache.items()), dict(_scbc_stage_stats)
+
+
+def import_scbc_stage_cache(entries, stats=None):
+    """用 export_scbc_stage_cache() 的结果替换当前 SCBC 子循环缓存。"""
+    _scbc_stage_cache.clear()
+    _scbc_stage_cache.update(entries)
+    if stats is not None:
+        _scbc_stage_stats.update(stats)
+
+
+def order_for_continuation(points, scale=None):
+    """
+    为扫描/批量计算排列设计点顺序，使相邻两次计算的设计点尽量接近 (热启动效果最好)。
+    从字典序最小的点出发，每次走到尚未计算的最近点 (贪心最近邻)；规则网格上得到蛇形路径，一维扫描保持单调顺序。
+    points 为 [N, d] 数组，scale 为各维的归一化尺度 (默认取各维的取值范围)。返回索引列表。
+    """
+    points = np.asarray(points, dtype=float).reshape(len(points), -1)
+    if len(points) == 0:
+        return []
+    if scale is None:
+        scale = np.ptp(points, axis=0)
+    scale = np.where(np.asarray(scale, dtype=float) > 0, scale, 1.0)
+    scaled = points / scale
+    remaining = list(np.lexsort(scaled.T[::-1]))
+    order = [remaining.pop(0)]
+    while remaining:
+        distances = np.linalg.norm(scaled[remaining] - scaled[order[-1]], axis=1)
+        order.append(remaining.pop(int(np.argmin(distances))))
+    return [int(i) for i in order]
+
+
+def _tear_variables_from_states(scbc_states, m_dot_orc_kg_s=None):
+    """从收敛后的 SCBC 状态点提取撕裂变量 (单位 J/kg、kg/s)。"""
+    return {
+        "h6_J_kg": scbc_states["P6_Turbine_Out_HTR_HotIn"].h,
+        "h7_J_kg": scbc_states["P7_HTR_HotOut_LTR_HotIn"].h,
+        "m_dot_total_kg_s": scbc_states["P5_ER_Out_Turbine_In"].m_dot,
+        "m_dot_orc_kg_s": m_dot_orc_kg_s,
+    }
+
+
 def load_cycle_parameters(filename="cycle_setup_parameters.json"):
     """从JSON文件加载循环设定参数"""
     try:
@@ -96,13 +401,127 @@ def load_cycle_parameters(filename="cycle_setup_parameters.json"):
         return None
 
 
+def scbc_regen_pass(params, state2, state6_in, state7_in, current_m_dot_total, current_m_dot_mc_branch,
+                    pass_number=1):
+    """
+    回热器的一次逐次代换: 给定 HTR 热侧进口 (点6) 和 LTR 热侧进口 (点7)，
+    依次计算 LTR -> RC -> 混合点3 -> HTR -> ER -> 透平。
+    返回字典: states (本次计算的各状态点), W_t_J_kg, W_rc_J_kg, Q_er_calc_J_s，
+    其中 states 的 "P6_Turbine_Out_HTR_HotIn" / "P7_HTR_HotOut_LTR_HotIn" 即为下一次的点6/点7。
+    任何一步失败时返回 None。
+    """
+    scbc_params = params.get("scbc_parameters", {})
+    scbc_fluid = params.get("fluids", {}).get("scbc", "CO2")
+    P_low_cycle_Pa = state6_in.P
+
+    eta_L = scbc_params.get('eta_L_LTR_effectiveness')
+    state8_calc_ltr, state_ltr_cold_out, _ = model_heat_exchanger_effectiveness(
+        state_hot_in=state7_in, state_cold_in=state2, effectiveness=eta_L,
+        hot_fluid_is_C_min_side=True, name_suffix=f"LTR_RegenIter{pass_number}"
+    )
+    if not (state8_calc_ltr and state_ltr_cold_out): return None
+
+    m_dot_rc = current_m_dot_total - current_m_dot_mc_branch
+    # RC进口与LTR热出口同状态，直接复制物性，只改流量
+    state8r_rc_in = state8_calc_ltr.with_flow(m_dot_rc, name="P8r_RC_In_RegenIter{}", name_args=(pass_number,))
+
+    eta_rc = scbc_params.get('eta_C_compressor')
+    state_rc_out, W_rc_J_kg = model_compressor_MC(state8r_rc_in, state2.P, eta_rc)
+    if not state_rc_out: return None
+
+    m_dot_3_calc = state_ltr_cold_out.m_dot + state_rc_out.m_dot
+    if abs(m_dot_3_calc) < 1e-6: return None
+    h3_mixed_J_kg = (state_ltr_cold_out.m_dot * state_ltr_cold_out.h + \
+                     state_rc_out.m_dot * state_rc_out.h) / m_dot_3_calc
+    state3_calc = StatePoint(scbc_fluid, "P3_Mixed_RegenIter{}", name_args=(pass_number,))
+    state3_calc.props_from_PH(state2.P, h3_mixed_J_kg)
+    state3_calc.m_dot = m_dot_3_calc
+    if not state3_calc.h: return None
+    if abs(state3_calc.m_dot - current_m_dot_total) > 0.01 * current_m_dot_total:  # Check consistency
+        print(
+            f"  警告 (RegenIter {pass_number}): 混合点3流量 {state3_calc.m_dot:.2f} 与当前总流量 {current_m_dot_total:.2f} 不符。")
+        state3_calc.m_dot = current_m_dot_total
+
+    eta_H = scbc_params.get('eta_H_HTR_effectiveness')
+    state7_htr_hot_out, state4_htr_cold_out, _ = model_heat_exchanger_effectiveness(
+        state_hot_in=state6_in, state_cold_in=state3_calc, effectiveness=eta_H,
+        hot_fluid_is_C_min_side=True, name_suffix=f"HTR_RegenIter{pass_number}"
+    )
+    if not (state7_htr_hot_out and state4_htr_cold_out): return None
+
+    T5_target_C = scbc_params.get('T5_turbine_inlet_C')
+    state5_er_out, Q_er_calc_J_s = model_heater_set_T_out(
+        state_in=state4_htr_cold_out, T_out_K=to_kelvin(T5_target_C),
+        name_suffix=f"ER_RegenIter{pass_number}"
+    )
+    if not state5_er_out: return None
+
+    eta_T = scbc_params.get('eta_T_turbine')
+    state6_turbine_out, W_t_J_kg = model_turbine_T(state5_er_out, P_low_cycle_Pa, eta_T)
+    if not state6_turbine_out: return None
+
+    return {
+        "states": {
+            "P8r_RC_In": state8r_rc_in, "P3'_RC_Out": state_rc_out,
+            "P3''_LTR_ColdOut": state_ltr_cold_out, "P3_Mixed_HTR_ColdIn": state3_calc,
+            "P4_HTR_ColdOut_ER_In": state4_htr_cold_out, "P5_ER_Out_Turbine_In": state5_er_out,
+            "P6_Turbine_Out_HTR_HotIn": state6_turbine_out, "P7_HTR_HotOut_LTR_HotIn": state7_htr_hot_out,
+            "P8_LTR_HotOut_Total": state8_calc_ltr  # This is before split to GO and RC
+        },
+        "W_t_J_kg": W_t_J_kg, "W_rc_J_kg": W_rc_J_kg, "Q_er_calc_J_s": Q_er_calc_J_s
+    }
+
+
+def _next_regen_guess(accelerator, x_history, g_history):
+    """
+    根据回热迭代的历史 (输入 x_k = [h6, h7] 和一次代换后的输出 g_k) 给出下一次的输入。
+    substitution: x = g；wegstein: 逐分量 Wegstein 加速 (q 限制在 [-5, 0])；
+    anderson: Anderson 混合 (最近 3 步)；secant: 对残差 g - x 的 Broyden 拟牛顿步。
+    历史不足时退化为逐次代换。
+    """
+    x_k, g_k = x_history[-1], g_history[-1]
+    if accelerator == "substitution" or len(x_history) < 2:
+        return g_k
+    x_prev, g_prev = x_history[-2], g_history[-2]
+    if accelerator == "wegstein":
+        dx = x_k - x_prev
+        safe = np.abs(dx) > 1e-9
+        slope = np.where(safe, (g_k - g_prev) / np.where(safe, dx, 1.0), 0.0)
+        q = np.where(np.abs(slope - 1.0) > 1e-9, slope / (slope - 1.0), 0.0)
+        q = np.clip(q, -5.0, 0.0)
+        return q * x_k + (1.0 - q) * g_k
+    f_history = [g - x for g, x in zip(g_history, x_history)]
+    if accelerator == "anderson":
+        depth = min(3, len(x_history) - 1)
+        dF = np.column_stack([f_history[-i] - f_history[-i - 1] for i in range(1, depth + 1)])
+        dG = np.column_stack([g_history[-i] - g_history[-i - 1] for i in range(1, depth + 1)])
+        gamma = np.linalg.lstsq(dF, f_history[-1], rcond=None)[0]
+        return g_k - dG @ gamma
+    if accelerator == "secant":
+        # Broyden (good) 更新的雅可比近似，从 -I (即逐次代换) 开始逐步修正
+        jacobian = -np.eye(len(x_k))
+        for i in range(1, len(x_history)):
+            dx = x_history[i] - x_history[i - 1]
+            df = f_history[i] - f_history[i - 1]
+            if dx @ dx > 1e-12:
+                jacobian += np.outer(df - jacobian @ dx, dx) / (dx @ dx)
+        try:
+            return x_k - np.linalg.solve(jacobian, f_history[-1])
+        except np.linalg.LinAlgError:
+            return g_k
+    return g_k
+
+
 def calculate_scbc_high_temp_loop(
-        params, state1_mc_in, current_m_dot_total, current_m_dot_mc_branch
+        params, state1_mc_in, current_m_dot_total, current_m_dot_mc_branch, solver_stats=None, regen_guess=None
 ):
     """
     封装SCBC高温侧和相关低温侧的计算逻辑。
-    此函数会进行内部迭代以收敛回热器。
+    此函数会进行内部迭代以收敛回热器 (撕裂流为点6/点7的焓，加速方法由 scbc_parameters.regen_accelerator 选择)。
     返回计算得到的 Q_er_calc (J/s), W_net_scbc_J_s, 和所有相关的状态点。
+    如果传入 solver_stats 字典，将在其中记录回热迭代次数 (regen_iterations)、是否收敛 (regen_converged)、
+    所用加速方法 (regen_accelerator) 和每次迭代的残差 (regen_residual_history, [(|Δh6|, |Δh7|) kJ/kg])。
+    regen_guess 为 (h6, h7) J/kg 时用作撕裂流初值 (热启动)，否则使用参数文件中的 T6/T7 猜测温度。
     """
     scbc_params = params.get("scbc_parameters", {})
     scbc_fluid = params.get("fluids", {}).get("scbc", "CO2")
@@ -125,132 +544,121 @@ def calculate_scbc_high_temp_loop(
     # --- SCBC高温侧迭代计算 (HTR, ER, Turbine T, LTR, RC) ---
     max_iter_scbc_regen = scbc_params.get("max_iter_scbc_main_loop", 20)
     tol_scbc_h_kJ_kg = scbc_params.get("tol_scbc_h_kJ_kg", 0.1)
+    regen_accelerator = scbc_params.get("regen_accelerator", "wegstein")
+    if regen_accelerator not in REGEN_ACCELERATORS:
+        print(f"警告: 未知的回热迭代加速方法 {regen_accelerator}，改用 substitution。")
+        regen_accelerator = "substitution"
 
     P_low_cycle_Pa = state1.P  # 透平出口和回热器热侧低压等于主压缩机进口压力
 
-    T6_iter_C_guess = scbc_params.get('T6_HTR_hot_in_C_guess', 455.03)
     state6_iter = StatePoint(scbc_fluid, "P6_Iter_HTR_HotIn_MFLOW_ITER")
-    state6_iter.props_from_PT(P_low_cycle_Pa, to_kelvin(T6_iter_C_guess))
-    state6_iter.m_dot = current_m_dot_total  # 总流量
-    if not state6_iter.h: return None, None, None
-
-    T7_iter_C_guess = scbc_params.get('T7_LTR_hot_in_C_guess', 306.16)
     state7_iter = StatePoint(scbc_fluid, "P7_Iter_LTR_HotIn_MFLOW_ITER")
-    state7_iter.props_from_PT(P_low_cycle_Pa, to_kelvin(T7_iter_C_guess))
+    if regen_guess is not None:
+        state6_iter.props_from_PH(P_low_cycle_Pa, regen_guess[0])
+        state7_iter.props_from_PH(P_low_cycle_Pa, regen_guess[1])
+    if regen_guess is None or state6_iter.T is None or state7_iter.T is None:
+        T6_iter_C_guess = scbc_params.get('T6_HTR_hot_in_C_guess', 455.03)
+        state6_iter.props_from_PT(P_low_cycle_Pa, to_kelvin(T6_iter_C_guess))
+        T7_iter_C_guess = scbc_params.get('T7_LTR_hot_in_C_guess', 306.16)
+        state7_iter.props_from_PT(P_low_cycle_Pa, to_kelvin(T7_iter_C_guess))
+    state6_iter.m_dot = current_m_dot_total  # 总流量
     state7_iter.m_dot = current_m_dot_total  # 总流量
-    if not state7_iter.h: return None, None, None
-
-    state3_calc, state4_htr_cold_out, state5_er_out = None, None, None
-    state6_turbine_out, state7_htr_hot_out, state8_calc_ltr = None, None, None
-    state_ltr_cold_out, state_rc_out, state8r_rc_in = None, None, None
-    W_t_J_kg, W_rc_J_kg, Q_er_calc_J_s = 0, 0, 0
+    if not state6_iter.h or not state7_iter.h: return None, None, None
 
+    regen_pass = None
+    x_history, g_history, residual_history = [], [], []
     converged_scbc_regen = False
     for i_scbc_regen in range(max_iter_scbc_regen):
-        h6_old_J_kg = state6_iter.h
-        h7_old_J_kg = state7_iter.h
-
-        eta_L = scbc_params.get('eta_L_LTR_effectiveness')
-        _state8_calc_ltr, _state_ltr_cold_out, _ = model_heat_exchanger_effectiveness(
-            state_hot_in=state7_iter, state_cold_in=state2, effectiveness=eta_L,
-            hot_fluid_is_C_min_side=True, name_suffix=f"LTR_RegenIter{i_scbc_regen + 1}"
-        )
-        if not (_state8_calc_ltr and _state_ltr_cold_out): return None, None, None
-        state8_calc_ltr, state_ltr_cold_out = _state8_calc_ltr, _state_ltr_cold_out
-
-        m_dot_rc = current_m_dot_total - current_m_dot_mc_branch
-        _state8r_rc_in = StatePoint(scbc_fluid, f"P8r_RC_In_RegenIter{i_scbc_regen + 1}")
-        _state8r_rc_in.props_from_PH(state8_calc_ltr.P, state8_calc_ltr.h)  # RC进口与LTR热出口同状态
-        _state8r_rc_in.m_dot = m_dot_rc
-        state8r_rc_in = _state8r_rc_in
-
-        eta_rc = scbc_params.get('eta_C_compressor')
-        _state_rc_out, _W_rc_J_kg = model_compressor_MC(state8r_rc_in, state2.P, eta_rc)
-        if not _state_rc_out: return None, None, None
-        state_rc_out, W_rc_J_kg = _state_rc_out, _W_rc_J_kg
-
-        m_dot_3_calc = state_ltr_cold_out.m_dot + state_rc_out.m_dot
-        if abs(m_dot_3_calc) < 1e-6: return None, None, None
-        h3_mixed_J_kg = (state_ltr_cold_out.m_dot * state_ltr_cold_out.h + \
-                         state_rc_out.m_dot * state_rc_out.h) / m_dot_3_calc
-        _state3_calc = StatePoint(scbc_fluid, f"P3_Mixed_RegenIter{i_scbc_regen + 1}")
-        _state3_calc.props_from_PH(state2.P, h3_mixed_J_kg)
-        _state3_calc.m_dot = m_dot_3_calc
-        if not _state3_calc.h: return None, None, None
-        state3_calc = _state3_calc
-        if abs(state3_calc.m_dot - current_m_dot_total) > 0.01 * current_m_dot_total:  # Check consistency
-            print(
-                f"  警告 (RegenIter {i_scbc_regen + 1}): 混合点3流量 {state3_calc.m_dot:.2f} 与当前总流量 {current_m_dot_total:.2f} 不符。")
-            state3_calc.m_dot = current_m_dot_total
-
-        eta_H = scbc_params.get('eta_H_HTR_effectiveness')
-        _state7_htr_hot_out, _state4_htr_cold_out, _ = model_heat_exchanger_effectiveness(
-            state_hot_in=state6_iter, state_cold_in=state3_calc, effectiveness=eta_H,
-            hot_fluid_is_C_min_side=True, name_suffix=f"HTR_RegenIter{i_scbc_regen + 1}"
-        )
-        if not (_state7_htr_hot_out and _state4_htr_cold_out): return None, None, None
-        state7_htr_hot_out, state4_htr_cold_out = _state7_htr_hot_out, _state4_htr_cold_out
-
-        T5_target_C = scbc_params.get('T5_turbine_inlet_C')
-        _state5_er_out, _Q_er_calc_J_s = model_heater_set_T_out(
-            state_in=state4_htr_cold_out, T_out_K=to_kelvin(T5_target_C),
-            name_suffix=f"ER_RegenIter{i_scbc_regen + 1}"
-        )
-        if not _state5_er_out: return None, None, None
-        state5_er_out, Q_er_calc_J_s = _state5_er_out, _Q_er_calc_J_s
-
-        eta_T = scbc_params.get('eta_T_turbine')
-        _state6_turbine_out, _W_t_J_kg = model_turbine_T(state5_er_out, P_low_cycle_Pa, eta_T)
-        if not _state6_turbine_out: return None, None, None
-        state6_turbine_out, W_t_J_kg = _state6_turbine_out, _W_t_J_kg
-
-        state6_iter = state6_turbine_out
-        state7_iter = state7_htr_hot_out
+        regen_pass = scbc_regen_pass(params, state2, state6_iter, state7_iter,
+                                     current_m_dot_total, current_m_dot_mc_branch, pass_number=i_scbc_regen + 1)
+        if regen_pass is None: return None, None, None
+        state6_out = regen_pass["states"]["P6_Turbine_Out_HTR_HotIn"]
+        state7_out = regen_pass["states"]["P7_HTR_HotOut_LTR_HotIn"]
 
-        delta_h6_kJ_kg = abs(state6_iter.h - h6_old_J_kg) / 1000
-        delta_h7_kJ_kg = abs(state7_iter.h - h7_old_J_kg) / 1000
+        delta_h6_kJ_kg = abs(state6_out.h - state6_iter.h) / 1000
+        delta_h7_kJ_kg = abs(state7_out.h - state7_iter.h) / 1000
+        residual_history.append((delta_h6_kJ_kg, delta_h7_kJ_kg))
 
         if delta_h6_kJ_kg < tol_scbc_h_kJ_kg and delta_h7_kJ_kg < tol_scbc_h_kJ_kg:
             converged_scbc_regen = True
             # print(f"  SCBC回热器在迭代 {i_scbc_regen + 1} 次后收敛。")
             break
 
+        x_history.append(np.array([state6_iter.h, state7_iter.h]))
+        g_history.append(np.array([state6_out.h, state7_out.h]))
+        h6_next, h7_next = (float(h) for h in _next_regen_guess(regen_accelerator, x_history, g_history))
+        if h6_next == state6_out.h and h7_next == state7_out.h:
+            state6_iter, state7_iter = state6_out, state7_out
+            continue
+        # 加速后的撕裂流需要重新计算物性；失败时退回逐次代换的结果
+        _state6_next = StatePoint(scbc_fluid, "P6_Iter_HTR_HotIn_Accel").props_from_PH(P_low_cycle_Pa, h6_next)
+        _state7_next = StatePoint(scbc_fluid, "P7_Iter_LTR_HotIn_Accel").props_from_PH(P_low_cycle_Pa, h7_next)
+        if _state6_next.T is None or _state7_next.T is None:
+            state6_iter, state7_iter = state6_out, state7_out
+            continue
+        _state6_next.m_dot = current_m_dot_total
+        _state7_next.m_dot = current_m_dot_total
+        state6_iter, state7_iter = _state6_next, _state7_next
+
+    if solver_stats is not None:
+        solver_stats["regen_iterations"] = i_scbc_regen + 1
+        solver_stats["regen_converged"] = converged_scbc_regen
+        solver_stats["regen_accelerator"] = regen_accelerator
+        solver_stats["regen_residual_history"] = residual_history
+
     if not converged_scbc_regen:
         print(f"  警告: SCBC回热器在 {max_iter_scbc_regen} 次迭代后未收敛。")
         # return None, None, None # Or allow to proceed with last values
 
-    W_t_total_J_s = W_t_J_kg * state5_er_out.m_dot if state5_er_out and state5_er_out.m_dot else 0
-    W_rc_total_J_s = W_rc_J_kg * state_rc_out.m_dot if state_rc_out and state_rc_out.m_dot else 0
+    pass_states = regen_pass["states"]
+    state5_er_out, state_rc_out = pass_states["P5_ER_Out_Turbine_In"], pass_states["P3'_RC_Out"]
+    W_t_total_J_s = regen_pass["W_t_J_kg"] * state5_er_out.m_dot if state5_er_out.m_dot else 0
+    W_rc_total_J_s = regen_pass["W_rc_J_kg"] * state_rc_out.m_dot if state_rc_out.m_dot else 0
     W_net_scbc_J_s = W_t_total_J_s - W_mc_total_J_s - W_rc_total_J_s
 
     # Package all state points for returning
-    scbc_states = {
-        "P1_MC_In": state1, "P2_MC_Out": state2,
-        "P8r_RC_In": state8r_rc_in, "P3'_RC_Out": state_rc_out,
-        "P3''_LTR_ColdOut": state_ltr_cold_out, "P3_Mixed_HTR_ColdIn": state3_calc,
-        "P4_HTR_ColdOut_ER_In": state4_htr_cold_out, "P5_ER_Out_Turbine_In": state5_er_out,
-        "P6_Turbine_Out_HTR_HotIn": state6_turbine_out, "P7_HTR_HotOut_LTR_HotIn": state7_htr_hot_out,
-        "P8_LTR_HotOut_Total": state8_calc_ltr  # This is before split to GO and RC
-    }
+    scbc_states = {"P1_MC_In": state1, "P2_MC_Out": state2}
+    scbc_states.update(pass_states)
 
-    return Q_er_calc_J_s, W_net_scbc_J_s, scbc_states
+    return regen_pass["Q_er_calc_J_s"], W_net_scbc_J_s, scbc_states
 
 
-def simulate_scbc_orc_cycle(params):
-    if params is None:
-        print("由于参数加载失败，无法开始仿真。")
-        return
+def solve_scbc_per_kg(params, state1_base, mc_branch_to_total_ratio, Q_ER_target_J_s, solver_stats=None,
+                      regen_guess=None):
+    """
+    按 1 kg/s 总流量收敛一次回热器，再把所有流量线性缩放到目标吸热量。
+    各状态点的强度参数只取决于压比、温度、效率和分流比，与绝对流量无关，
+    因此 Q_ER 和净功都与总流量成正比，不需要外层质量流量迭代。
+    返回值与 calculate_scbc_high_temp_loop 相同 (Q_er_calc_J_s, W_net_scbc_J_s, scbc_states)，失败时为 None。
+    """
+    state1_per_kg = state1_base.with_flow(mc_branch_to_total_ratio, name="P1_MC_In_MFLOW_ITER")
+    Q_er_per_kg_J_s, W_net_per_kg_J_s, states_per_kg = calculate_scbc_high_temp_loop(
+        params, state1_per_kg, 1.0, mc_branch_to_total_ratio, solver_stats=solver_stats, regen_guess=regen_guess
+    )
+    if Q_er_per_kg_J_s is None or W_net_per_kg_J_s is None or Q_er_per_kg_J_s <= 0:
+        return None, None, None
+
+    m_dot_total_kg_s = Q_ER_target_J_s / Q_er_per_kg_J_s
+    scbc_states = {
+        name: state.with_flow(state.m_dot * m_dot_total_kg_s) if state and state.m_dot is not None else state
+        for name, state in states_per_kg.items()
+    }
+    return Q_er_per_kg_J_s * m_dot_total_kg_s, W_net_per_kg_J_s * m_dot_total_kg_s, scbc_states
 
-    print("\n--- 开始SCBC/ORC联合循环仿真 (固定Q_ER, 迭代质量流量) ---")
-    # ... (print scbc_params as before) ...
+
+def simulate_scbc_stage(params, verbose=True, warm_start=None):
+    """
+    SCBC 子循环: 质量流量/回热迭代、低温侧 (GO 热侧、CS) 和 SCBC 性能，不含 ORC。
+    warm_start 的含义同 simulate_scbc_orc_cycle。返回 SCBCStageResult；SCBC计算失败时返回 None。
+    """
+    log = print if verbose else _no_log
     scbc_params = params.get("scbc_parameters", {})
-    orc_params = params.get("orc_parameters", {})
     scbc_fluid = params.get("fluids", {}).get("scbc", "CO2")
 
     # --- 目标吸热量 ---
     Q_ER_target_MW = params.get("notes", {}).get("phi_ER_MW_heat_input", 600.0)
     Q_ER_target_J_s = Q_ER_target_MW * 1e6
-    print(f"目标吸热器热量 Q_ER_target: {Q_ER_target_MW:.2f} MW")
+    log(f"目标吸热器热量 Q_ER_target: {Q_ER_target_MW:.2f} MW")
 
     # --- 初始化SCBC循环起点 (点1) ---
     p1_kpa = scbc_params.get('p1_compressor_inlet_kPa')
@@ -276,6 +684,17 @@ def simulate_scbc_orc_cycle(params):
 
     current_m_dot_total_kg_s = initial_m_dot_total  # Start with initial guess from params
 
+    if warm_start is None and WARM_START_CACHE_ENABLED:
+        warm_start = find_warm_start(params)
+    if isinstance(warm_start, CycleSimulationResult):
+        warm_start = warm_start.tear_variables
+    regen_guess = None
+    if warm_start:
+        regen_guess = (warm_start["h6_J_kg"], warm_start["h7_J_kg"])
+        current_m_dot_total_kg_s = warm_start.get("m_dot_total_kg_s") or current_m_dot_total_kg_s
+        log(f"热启动: h6 = {regen_guess[0] / 1e3:.2f} kJ/kg, h7 = {regen_guess[1] / 1e3:.2f} kJ/kg, "
+            f"m_dot_total = {current_m_dot_total_kg_s:.2f} kg/s")
+
     max_iter_mflow = 20  # Max iterations for mass flow
     tol_q_er_relative = 0.001  # Relative tolerance for Q_ER (0.1%)
 
@@ -283,81 +702,107 @@ def simulate_scbc_orc_cycle(params):
     W_net_scbc_J_s_final = None
     final_scbc_states = None
 
-    print(f"\n--- 开始SCBC质量流量迭代 (目标Q_ER={Q_ER_target_MW:.2f}MW) ---")
-    for i_mflow in range(max_iter_mflow):
-        print(
-            f"质量流量迭代 {i_mflow + 1}/{max_iter_mflow}: 当前总流量 m_dot_total = {current_m_dot_total_kg_s:.2f} kg/s")
-
-        current_m_dot_mc_branch_kg_s = current_m_dot_total_kg_s * mc_branch_to_total_ratio
-        # current_m_dot_rc_kg_s = current_m_dot_total_kg_s * rc_flow_ratio_of_total
-        # current_m_dot_mc_branch_kg_s = current_m_dot_total_kg_s - current_m_dot_rc_kg_s
-
-        # Create a fresh state1 for MC inlet with current mc_branch flow
-        state1_iter_mc_in = StatePoint(fluid_name=scbc_fluid, name="P1_MC_In_MFLOW_ITER")
-        state1_iter_mc_in.P = state1_base.P  # Pressure and Temp of point 1 are fixed
-        state1_iter_mc_in.T = state1_base.T
-        state1_iter_mc_in.h = state1_base.h  # Copy other props
-        state1_iter_mc_in.s = state1_base.s
-        state1_iter_mc_in.d = state1_base.d
-        state1_iter_mc_in.e = state1_base.e
-        state1_iter_mc_in.q = state1_base.q
-        state1_iter_mc_in.m_dot = current_m_dot_mc_branch_kg_s  # Set current iteration's MC flow
-
-        Q_er_calc_J_s, W_net_scbc_J_s, scbc_states_iter = calculate_scbc_high_temp_loop(
-            params, state1_iter_mc_in, current_m_dot_total_kg_s, current_m_dot_mc_branch_kg_s
+    regen_stats = {}
+    mflow_iterations = 0
+    mass_flow_solve_mode = scbc_params.get("mass_flow_solve_mode", "per_kg")
+    if mass_flow_solve_mode not in MASS_FLOW_SOLVE_MODES:
+        print(f"警告: 未知的质量流量求解方式 {mass_flow_solve_mode}，改用 per_kg。")
+        mass_flow_solve_mode = "per_kg"
+
+    if mass_flow_solve_mode == "per_kg":
+        log(f"\n--- SCBC按单位总质量流量求解，再按目标Q_ER={Q_ER_target_MW:.2f}MW缩放流量 ---")
+        Q_er_calc_J_s_final, W_net_scbc_J_s_final, final_scbc_states = solve_scbc_per_kg(
+            params, state1_base, mc_branch_to_total_ratio, Q_ER_target_J_s, solver_stats=regen_stats,
+            regen_guess=regen_guess
         )
-
-        if Q_er_calc_J_s is None or W_net_scbc_J_s is None:
-            print(f"  质量流量迭代 {i_mflow + 1}: SCBC高温侧计算失败。尝试调整流量。")
-            # Simple adjustment: if fails, reduce flow slightly and hope it enters a more stable region
-            current_m_dot_total_kg_s *= 0.95
-            if current_m_dot_total_kg_s < 100:  # Lower bound to prevent too small flow
-                print("  错误: 质量流量过低，迭代中止。")
+        mflow_iterations = 1
+        if Q_er_calc_J_s_final is not None:
+            log(f"  缩放后 Q_ER_calc = {Q_er_calc_J_s_final / 1e6:.2f} MW")
+    elif mass_flow_solve_mode == "equation_oriented":
+        log(f"\n--- SCBC/ORC联立求解 (h6, h7, m_dot_total, m_dot_orc; 目标Q_ER={Q_ER_target_MW:.2f}MW) ---")
+        Q_er_calc_J_s_final, W_net_scbc_J_s_final, final_scbc_states = solve_cycle_equation_oriented(
+            params, state1_base, mc_branch_to_total_ratio, Q_ER_target_J_s, solver_stats=regen_stats,
+            warm_start=warm_start
+        )
+        if Q_er_calc_J_s_final is not None:
+            log(f"  联立求解残差函数调用 {regen_stats['eo_nfev']} 次, Q_ER_calc = {Q_er_calc_J_s_final / 1e6:.2f} MW, "
+                f"m_dot_orc = {regen_stats['eo_m_dot_orc_kg_s']:.2f} kg/s")
+    else:
+        log(f"\n--- 开始SCBC质量流量迭代 (目标Q_ER={Q_ER_target_MW:.2f}MW) ---")
+        for i_mflow in range(max_iter_mflow):
+            log(
+                f"质量流量迭代 {i_mflow + 1}/{max_iter_mflow}: 当前总流量 m_dot_total = {current_m_dot_total_kg_s:.2f} kg/s")
+
+            current_m_dot_mc_branch_kg_s = current_m_dot_total_kg_s * mc_branch_to_total_ratio
+            # current_m_dot_rc_kg_s = current_m_dot_total_kg_s * rc_flow_ratio_of_total
+            # current_m_dot_mc_branch_kg_s = current_m_dot_total_kg_s - current_m_dot_rc_kg_s
+
+            # Point 1 state is fixed; copy it with the current iteration's MC branch flow
+            state1_iter_mc_in = state1_base.with_flow(current_m_dot_mc_branch_kg_s, name="P1_MC_In_MFLOW_ITER")
+
+            Q_er_calc_J_s, W_net_scbc_J_s, scbc_states_iter = calculate_scbc_high_temp_loop(
+                params, state1_iter_mc_in, current_m_dot_total_kg_s, current_m_dot_mc_branch_kg_s,
+                solver_stats=regen_stats, regen_guess=regen_guess
+            )
+            mflow_iterations = i_mflow + 1
+
+            if Q_er_calc_J_s is None or W_net_scbc_J_s is None:
+                log(f"  质量流量迭代 {i_mflow + 1}: SCBC高温侧计算失败。尝试调整流量。")
+                # Simple adjustment: if fails, reduce flow slightly and hope it enters a more stable region
+                current_m_dot_total_kg_s *= 0.95
+                if current_m_dot_total_kg_s < 100:  # Lower bound to prevent too small flow
+                    print("  错误: 质量流量过低，迭代中止。")
+                    break
+                continue
+
+            Q_er_calc_J_s_final = Q_er_calc_J_s
+            W_net_scbc_J_s_final = W_net_scbc_J_s
+            final_scbc_states = scbc_states_iter
+            # h6/h7 与总流量无关，下一次流量迭代从本次收敛的回热器状态开始
+            regen_guess = (scbc_states_iter["P6_Turbine_Out_HTR_HotIn"].h, scbc_states_iter["P7_HTR_HotOut_LTR_HotIn"].h)
+
+            error_q_er = (Q_er_calc_J_s - Q_ER_target_J_s) / Q_ER_target_J_s
+            log(f"  计算得到的 Q_ER_calc = {Q_er_calc_J_s / 1e6:.2f} MW, 相对误差 = {error_q_er * 100:.2f}%")
+
+            if abs(error_q_er) < tol_q_er_relative:
+                log(f"质量流量迭代在 {i_mflow + 1} 次后收敛。")
                 break
-            continue
-
-        Q_er_calc_J_s_final = Q_er_calc_J_s
-        W_net_scbc_J_s_final = W_net_scbc_J_s
-        final_scbc_states = scbc_states_iter
-
-        error_q_er = (Q_er_calc_J_s - Q_ER_target_J_s) / Q_ER_target_J_s
-        print(f"  计算得到的 Q_ER_calc = {Q_er_calc_J_s / 1e6:.2f} MW, 相对误差 = {error_q_er * 100:.2f}%")
 
-        if abs(error_q_er) < tol_q_er_relative:
-            print(f"质量流量迭代在 {i_mflow + 1} 次后收敛。")
-            break
-
-        # Simple proportional adjustment for m_dot_total
-        # If Q_calc < Q_target, need more m_dot. If Q_calc > Q_target, need less m_dot.
-        # Adjust m_dot proportionally to Q_target / Q_calc, with damping
-        adjustment_factor = (Q_ER_target_J_s / Q_er_calc_J_s)
-        damping = 0.5  # 0 < damping <= 1. Smaller means slower but more stable.
-        current_m_dot_total_kg_s *= (1 + damping * (adjustment_factor - 1))
+            # Simple proportional adjustment for m_dot_total
+            # If Q_calc < Q_target, need more m_dot. If Q_calc > Q_target, need less m_dot.
+            # Adjust m_dot proportionally to Q_target / Q_calc, with damping
+            adjustment_factor = (Q_ER_target_J_s / Q_er_calc_J_s)
+            damping = 0.5  # 0 < damping <= 1. Smaller means slower but more stable.
+            current_m_dot_total_kg_s *= (1 + damping * (adjustment_factor - 1))
 
-        # Ensure m_dot stays within reasonable bounds (e.g., 100 to 5000 kg/s)
-        current_m_dot_total_kg_s = max(100.0, min(current_m_dot_total_kg_s, 5000.0))
+            # Ensure m_dot stays within reasonable bounds (e.g., 100 to 5000 kg/s)
+            current_m_dot_total_kg_s = max(100.0, min(current_m_dot_total_kg_s, 5000.0))
 
-        if i_mflow == max_iter_mflow - 1:
-            print("警告: 质量流量迭代达到最大次数但未收敛。")
+            if i_mflow == max_iter_mflow - 1:
+                print("警告: 质量流量迭代达到最大次数但未收敛。")
 
     if Q_er_calc_J_s_final is None or W_net_scbc_J_s_final is None or final_scbc_states is None:
+        if warm_start:
+            # 热启动初值可能落在收敛域之外，改用参数文件中的默认初值重算 (warm_start={} 不再查缓存)
+            print("警告: 热启动求解失败，改用默认初值重新计算。")
+            return simulate_scbc_stage(params, verbose=verbose, warm_start={})
         print("错误: SCBC循环未能成功计算。仿真终止。")
         return
 
-    print("\n--- SCBC质量流量迭代结束 ---")
+    log("\n--- SCBC质量流量迭代结束 ---")
     # Ensure final_scbc_states and its keys exist before trying to access them
     if final_scbc_states and \
             final_scbc_states.get('P5_ER_Out_Turbine_In') and \
             final_scbc_states.get('P1_MC_In') and \
             final_scbc_states.get("P3'_RC_Out"):  # Check if the problematic key exists
 
-        print(f"  最终总质量流量 m_dot_total: {final_scbc_states['P5_ER_Out_Turbine_In'].m_dot:.2f} kg/s")
-        print(f"  最终主压气机支路流量 m_dot_mc_branch: {final_scbc_states['P1_MC_In'].m_dot:.2f} kg/s")
+        log(f"  最终总质量流量 m_dot_total: {final_scbc_states['P5_ER_Out_Turbine_In'].m_dot:.2f} kg/s")
+        log(f"  最终主压气机支路流量 m_dot_mc_branch: {final_scbc_states['P1_MC_In'].m_dot:.2f} kg/s")
 
         # FIX APPLIED HERE:
         rc_outlet_key = "P3'_RC_Out"  # Define the key as a variable
         if final_scbc_states.get(rc_outlet_key) and hasattr(final_scbc_states[rc_outlet_key], 'm_dot'):
-            print(f"  最终再压气机支路流量 m_dot_rc: {final_scbc_states[rc_outlet_key].m_dot:.2f} kg/s")
+            log(f"  最终再压气机支路流量 m_dot_rc: {final_scbc_states[rc_outlet_key].m_dot:.2f} kg/s")
         else:
             print(f"  警告: 无法获取最终再压气机支路流量，键 '{rc_outlet_key}' 或其 'm_dot' 属性未找到。")
 
@@ -365,24 +810,22 @@ def simulate_scbc_orc_cycle(params):
         print("  警告: final_scbc_states 中的一个或多个必需键缺失，无法打印所有最终质量流量。")
 
     # Print final converged SCBC states
-    print("\n最终计算得到的SCBC状态点（质量流量和回热器均收敛后）:")
+    log("\n最终计算得到的SCBC状态点（质量流量和回热器均收敛后）:")
     if final_scbc_states:  # Check if it's not None
         for name, state_obj in final_scbc_states.items():
-            print(f"点 {name}:")  # This 'name' is the key from the dictionary
-            print(state_obj)
+            log(f"点 {name}:")  # This 'name' is the key from the dictionary
+            log(state_obj)
     else:
-        print("  未能计算最终SCBC状态点。")
+        log("  未能计算最终SCBC状态点。")
 
     # --- SCBC低温侧计算 (CS, GO) using converged states and flows ---
-    print("\n--- SCBC低温侧计算 (使用最终流量) ---")
+    log("\n--- SCBC低温侧计算 (使用最终流量) ---")
     state8_ltr_hot_out_final = final_scbc_states["P8_LTR_HotOut_Total"]
     m_dot_mc_branch_final = final_scbc_states["P1_MC_In"].m_dot  # This is the flow for GO hot side
 
-    state8_go_in = StatePoint(scbc_fluid, "P8_GO_HotIn_Final")
-    state8_go_in.props_from_PH(state8_ltr_hot_out_final.P, state8_ltr_hot_out_final.h)
-    state8_go_in.m_dot = m_dot_mc_branch_final
-    print("\n蒸发器GO SCBC热侧进口状态 (点8m):")
-    print(state8_go_in)
+    state8_go_in = state8_ltr_hot_out_final.with_flow(m_dot_mc_branch_final, name="P8_GO_HotIn_Final")
+    log("\n蒸发器GO SCBC热侧进口状态 (点8m):")
+    log(state8_go_in)
 
     # 使用参数中的T9_precooler_outlet_C替代硬编码值
     T9_target_C = scbc_params.get('T9_precooler_outlet_C', 84.26)  # 从参数中读取预冷器出口温度，默认为论文值
@@ -391,10 +834,10 @@ def simulate_scbc_orc_cycle(params):
     )
     if not state9_go_hot_out: print("错误: 蒸发器GO SCBC热侧计算失败。"); return
     final_scbc_states["P9_GO_HotOut_CS_In"] = state9_go_hot_out
-    print("\n计算得到的蒸发器GO SCBC热侧出口状态 (点9):")
-    print(state9_go_hot_out)
+    log("\n计算得到的蒸发器GO SCBC热侧出口状态 (点9):")
+    log(state9_go_hot_out)
     if Q_go_scbc_side_J_s is not None:
-        print(f"蒸发器GO SCBC热侧放出热量 Q_GO_SCBC: {abs(Q_go_scbc_side_J_s) / 1e6:.2f} MW")
+        log(f"蒸发器GO SCBC热侧放出热量 Q_GO_SCBC: {abs(Q_go_scbc_side_J_s) / 1e6:.2f} MW")
 
     state1_cs_out_calc, Q_cs_J_s = model_cooler_set_T_out(
         state_in=state9_go_hot_out, T_out_K=to_kelvin(t1_c), name_suffix="CS_Final"
@@ -407,85 +850,366 @@ def simulate_scbc_orc_cycle(params):
     W_net_scbc_MW_final = W_net_scbc_J_s_final / 1e6
     Q_in_scbc_MW_final = Q_er_calc_J_s_final / 1e6
     eta_scbc_thermal_final = W_net_scbc_MW_final / Q_in_scbc_MW_final if Q_in_scbc_MW_final > 1e-6 else 0
-    print(f"\nSCBC净输出功 (最终): {W_net_scbc_MW_final:.2f} MW")
-    print(f"SCBC吸热器吸热量 Q_ER (最终): {Q_in_scbc_MW_final:.2f} MW")
-    print(f"SCBC热效率 (最终): {eta_scbc_thermal_final * 100:.2f}%")
+    log(f"\nSCBC净输出功 (最终): {W_net_scbc_MW_final:.2f} MW")
+    log(f"SCBC吸热器吸热量 Q_ER (最终): {Q_in_scbc_MW_final:.2f} MW")
+    log(f"SCBC热效率 (最终): {eta_scbc_thermal_final * 100:.2f}%")
     
     # 计算SCBC循环的火用效率
     # 使用状态点5的实际温度，而不是参数中的设定值，以更准确反映热力学状态
     T_er_source_K = final_scbc_states["P5_ER_Out_Turbine_In"].T if final_scbc_states and final_scbc_states.get("P5_ER_Out_Turbine_In") else to_kelvin(scbc_params.get('T5_turbine_inlet_C', 600))
     theoretical_exergy_eff = calculate_theoretical_exergy_efficiency(T_er_source_K)
-    print(f"基于T5温度 {T_er_source_K-273.15:.2f}°C 的理论火用效率: {theoretical_exergy_eff * 100:.2f}%")
+    log(f"基于T5温度 {T_er_source_K-273.15:.2f}°C 的理论火用效率: {theoretical_exergy_eff * 100:.2f}%")
     eta_scbc_exergy = calculate_exergy_efficiency(Q_er_calc_J_s_final, T_er_source_K, W_net_scbc_J_s_final)
-    print(f"SCBC火用效率 (最终): {eta_scbc_exergy * 100:.2f}%")
+    log(f"SCBC火用效率 (最终): {eta_scbc_exergy * 100:.2f}%")
     
+    return SCBCStageResult(
+        scbc_states=final_scbc_states,
+        Q_er_J_s=Q_er_calc_J_s_final,
+        W_net_scbc_J_s=W_net_scbc_J_s_final,
+        Q_go_J_s=abs(Q_go_scbc_side_J_s) if Q_go_scbc_side_J_s is not None else None,
+        T8_go_hot_in_K=state8_go_in.T,
+        T9_go_hot_out_K=state9_go_hot_out.T,
+        eta_scbc_thermal=eta_scbc_thermal_final,
+        eta_scbc_exergy=eta_scbc_exergy,
+        carnot_efficiency=theoretical_exergy_eff,
+        T_er_source_K=T_er_source_K,
+        mflow_iterations=mflow_iterations,
+        regen_iterations=regen_stats.get("regen_iterations", 0),
+        regen_residual_history=regen_stats.get("regen_residual_history", []),
+        m_dot_orc_kg_s=regen_stats.get("eo_m_dot_orc_kg_s") if mass_flow_solve_mode == "equation_oriented" else None,
+        eo_nfev=regen_stats.get("eo_nfev")
+    )
+
+
+def simulate_scbc_stage_cached(params, verbose=True, warm_start=None):
+    """
+    开启 SCBC 子循环缓存时按 scbc_stage_key 查找缓存，命中则返回缓存结果的副本 (cached=True，迭代次数为 0，
+    不再查找热启动初值)，否则调用 simulate_scbc_stage 并缓存结果的副本 (LRU 淘汰，失败的结果不缓存)。
+    """
+    key = scbc_stage_key(params) if SCBC_STAGE_CACHE_ENABLED else None
+    if key is not None and key in _scbc_stage_cache:
+        _scbc_stage_cache.move_to_end(key)
+        _scbc_stage_stats["hits"] += 1
+        if verbose:
+            print("SCBC子循环参数与缓存中的设计点相同，直接使用缓存的SCBC结果。")
+        cached_result = _scbc_stage_cache[key]
+        return cached_result.copy(cached=True, mflow_iterations=0, regen_iterations=0,
+                                  eo_nfev=0 if cached_result.eo_nfev is not None else None)
+    scbc_result = simulate_scbc_stage(params, verbose=verbose, warm_start=warm_start)
+    if key is not None:
+        _scbc_stage_stats["misses"] += 1
+        if scbc_result is not None:
+            _scbc_stage_cache[key] = scbc_result.copy()
+            while len(_scbc_stage_cache) > SCBC_STAGE_CACHE_MAXSIZE:
+                _scbc_stage_cache.popitem(last=False)
+    return scbc_result
+
+
+def simulate_orc_stage(params, scbc_result, verbose=True):
+    """
+    ORC 子循环: 用 SCBC 阶段交出的 GO 换热量和 SCBC 侧进出口温度 (Q_GO, T8, T9) 计算 ORC。
+    "equation_oriented" 模式下 ORC 流量取联立求解的结果，ORC 只按该流量计算状态点，不再求解流量。
+    返回 simulate_orc_standalone 的结果字典；换热量为零或 ORC 计算失败时返回 None。
+    """
+    log = print if verbose else _no_log
+    if scbc_result.Q_go_J_s is None or scbc_result.Q_go_J_s <= 1e-6:
+        log("\n由于SCBC到ORC的换热量为零或无效，跳过ORC仿真。")
+        return None
+    # Pass necessary data to ORC simulation
+    params["intermediate_results"] = {
+        "Q_GO_to_ORC_J_s": scbc_result.Q_go_J_s,
+        "T8_GO_HotIn_K": scbc_result.T8_go_hot_in_K,  # SCBC side GO inlet temp
+        "T9_GO_HotOut_K": scbc_result.T9_go_hot_out_K,  # SCBC side GO outlet temp
+        "m_dot_orc_kg_s": scbc_result.m_dot_orc_kg_s  # 联立求解模式下已解出的 ORC 流量 (其他模式为 None)
+    }
+    log("\n\n--- 开始ORC独立循环仿真 (使用SCBC最终换热数据) ---")
+    orc_results = simulate_orc_standalone(
+        orc_params=params.get("orc_parameters", {}),
+        common_params=params,  # Pass the main params dict
+        intermediate_scbc_data=params["intermediate_results"],
+        verbose=verbose
+    )
+    if orc_results and orc_results.get("W_net_orc_MW") is not None:
+        log("\n--- ORC独立循环仿真完成 ---")
+        log(f"ORC净输出功: {orc_results['W_net_orc_MW']:.2f} MW")
+        log(f"ORC热效率: {orc_results.get('eta_orc_thermal', 0) * 100:.2f}%")
+        log(f"ORC火用效率: {orc_results.get('eta_orc_exergy', 0) * 100:.2f}%")  # 输出ORC火用效率
+        return orc_results
+    log("ORC独立循环仿真失败或未返回有效结果。")
+    return None
+
+
+def simulate_scbc_orc_cycle(params, verbose=True, warm_start=None):
+    """
+    运行SCBC/ORC联合循环仿真: SCBC 子循环 (simulate_scbc_stage_cached) 之后是 ORC 子循环 (simulate_orc_stage)。
+    verbose=False 时跳过所有过程信息的格式化和打印 (错误和警告仍会输出)，供优化器和扫描脚本使用。
+    warm_start 可以是相邻设计点的 CycleSimulationResult 或其 tear_variables 字典，用作撕裂变量
+    (h6, h7, m_dot_total, m_dot_orc) 的初值；为 None 且已开启热启动缓存时自动使用缓存中最近设计点的解。
+    开启 SCBC 子循环缓存 (enable_scbc_stage_cache) 后，SCBC 参数相同的设计点只重算 ORC。
+    返回 CycleSimulationResult；参数无效或SCBC计算失败时返回 None。
+    """
+    log = print if verbose else _no_log
+    if params is None:
+        print("由于参数加载失败，无法开始仿真。")
+        return
+
+    log("\n--- 开始SCBC/ORC联合循环仿真 (固定Q_ER, 迭代质量流量) ---")
+    scbc_result = simulate_scbc_stage_cached(params, verbose=verbose, warm_start=warm_start)
+    if scbc_result is None:
+        return
+    final_scbc_states = scbc_result.scbc_states
+    W_net_scbc_MW_final = scbc_result.W_net_scbc_J_s / 1e6
+    Q_in_scbc_MW_final = scbc_result.Q_er_J_s / 1e6
+    T_er_source_K = scbc_result.T_er_source_K
+
     # --- ORC仿真 ---
-    W_net_orc_MW = 0
-    eta_orc_thermal = 0
-    eta_orc_exergy = 0  # 添加ORC火用效率变量
-    if Q_go_scbc_side_J_s is not None and abs(Q_go_scbc_side_J_s) > 1e-6:
-        # Pass necessary data to ORC simulation
-        params["intermediate_results"] = {
-            "Q_GO_to_ORC_J_s": abs(Q_go_scbc_side_J_s),
-            "T8_GO_HotIn_K": state8_go_in.T,  # SCBC side GO inlet temp
-            "T9_GO_HotOut_K": state9_go_hot_out.T  # SCBC side GO outlet temp
-        }
-        print("\n\n--- 开始ORC独立循环仿真 (使用SCBC最终换热数据) ---")
-        orc_results = simulate_orc_standalone(
-            orc_params=orc_params,
-            common_params=params,  # Pass the main params dict
-            intermediate_scbc_data=params["intermediate_results"]
-        )
-        if orc_results and orc_results.get("W_net_orc_MW") is not None:
-            print("\n--- ORC独立循环仿真完成 ---")
-            W_net_orc_MW = orc_results.get("W_net_orc_MW", 0)
-            eta_orc_thermal = orc_results.get("eta_orc_thermal", 0)
-            eta_orc_exergy = orc_results.get("eta_orc_exergy", 0)  # 获取ORC火用效率
-            print(f"ORC净输出功: {W_net_orc_MW:.2f} MW")
-            print(f"ORC热效率: {eta_orc_thermal * 100:.2f}%")
-            print(f"ORC火用效率: {eta_orc_exergy * 100:.2f}%")  # 输出ORC火用效率
-        else:
-            print("ORC独立循环仿真失败或未返回有效结果。")
-    else:
-        print("\n由于SCBC到ORC的换热量为零或无效，跳过ORC仿真。")
+    orc_results = simulate_orc_stage(params, scbc_result, verbose=verbose)
+    orc_ok = orc_results is not None
+    W_net_orc_MW = orc_results["W_net_orc_MW"] if orc_ok else 0
+    eta_orc_thermal = orc_results.get("eta_orc_thermal", 0) if orc_ok else 0
+    eta_orc_exergy = orc_results.get("eta_orc_exergy", 0) if orc_ok else 0
 
     # --- 联合循环性能计算 ---
-    print("\n\n--- 联合循环总性能 ---")
+    log("\n\n--- 联合循环总性能 ---")
     W_net_combined_MW = W_net_scbc_MW_final + W_net_orc_MW
-    print(f"SCBC净输出功: {W_net_scbc_MW_final:.2f} MW")
-    print(f"ORC净输出功: {W_net_orc_MW:.2f} MW")
-    print(f"联合循环总净输出功: {W_net_combined_MW:.2f} MW")
+    log(f"SCBC净输出功: {W_net_scbc_MW_final:.2f} MW")
+    log(f"ORC净输出功: {W_net_orc_MW:.2f} MW")
+    log(f"联合循环总净输出功: {W_net_combined_MW:.2f} MW")
 
     # 在 simulate_scbc_orc_cycle 函数末尾，联合循环性能计算部分
-    print(f"DEBUG: Q_in_scbc_MW_final = {Q_in_scbc_MW_final}")
-    print(f"DEBUG: W_net_combined_MW = {W_net_combined_MW}")
-    print(f"DEBUG: T_er_source_K for exergy calc = {T_er_source_K}")
+    log(f"DEBUG: Q_in_scbc_MW_final = {Q_in_scbc_MW_final}")
+    log(f"DEBUG: W_net_combined_MW = {W_net_combined_MW}")
+    log(f"DEBUG: T_er_source_K for exergy calc = {T_er_source_K}")
 
+    eta_combined_thermal = None
+    eta_combined_exergy = None
     if Q_in_scbc_MW_final is not None and Q_in_scbc_MW_final > 1e-6 and W_net_combined_MW is not None and T_er_source_K is not None:
         eta_combined_thermal = W_net_combined_MW / Q_in_scbc_MW_final
-        print(f"联合循环总热效率: {eta_combined_thermal * 100:.2f}%")  # 确保这行打印
+        log(f"联合循环总热效率: {eta_combined_thermal * 100:.2f}%")  # 确保这行打印
 
         W_net_combined_J_s = W_net_combined_MW * 1e6
         Q_er_calc_J_s_for_exergy = Q_in_scbc_MW_final * 1e6  # 确保使用正确的Q输入
         eta_combined_exergy = calculate_exergy_efficiency(Q_er_calc_J_s_for_exergy, T_er_source_K, W_net_combined_J_s)
-        print(f"联合循环总㶲效率: {eta_combined_exergy * 100:.2f}%")  # 确保这行打印
+        log(f"联合循环总㶲效率: {eta_combined_exergy * 100:.2f}%")  # 确保这行打印
         # ...
     else:
-        print("DEBUG: 无法计算效率，因为一个或多个关键输入为 None 或无效。")
-        print(f"联合循环总热效率: N/A %")  # 明确打印N/A
-        print(f"联合循环总㶲效率: N/A %")  # 明确打印N/A
+        log("DEBUG: 无法计算效率，因为一个或多个关键输入为 None 或无效。")
+        log(f"联合循环总热效率: N/A %")  # 明确打印N/A
+        log(f"联合循环总㶲效率: N/A %")  # 明确打印N/A
+
+    tear_variables = _tear_variables_from_states(
+        final_scbc_states, orc_results.get("m_dot_orc_kg_s") if orc_ok else None)
+    if WARM_START_CACHE_ENABLED:
+        _store_warm_start(params, tear_variables)
+    return CycleSimulationResult(
+        W_net_scbc_MW=W_net_scbc_MW_final,
+        W_net_orc_MW=W_net_orc_MW,
+        W_net_combined_MW=W_net_combined_MW,
+        Q_er_MW=Q_in_scbc_MW_final,
+        eta_scbc_thermal=scbc_result.eta_scbc_thermal,
+        eta_scbc_exergy=scbc_result.eta_scbc_exergy,
+        eta_orc_thermal=eta_orc_thermal,
+        eta_orc_exergy=eta_orc_exergy,
+        eta_combined_thermal=eta_combined_thermal,
+        eta_combined_exergy=eta_combined_exergy,
+        carnot_efficiency=scbc_result.carnot_efficiency,
+        m_dot_total_kg_s=final_scbc_states["P5_ER_Out_Turbine_In"].m_dot,
+        m_dot_mc_branch_kg_s=final_scbc_states["P1_MC_In"].m_dot,
+        m_dot_rc_kg_s=final_scbc_states["P3'_RC_Out"].m_dot,
+        m_dot_orc_kg_s=orc_results.get("m_dot_orc_kg_s") if orc_ok else None,
+        Q_go_MW=scbc_result.Q_go_J_s / 1e6 if scbc_result.Q_go_J_s is not None else None,
+        mflow_iterations=scbc_result.mflow_iterations,
+        regen_iterations=scbc_result.regen_iterations,
+        orc_mdot_iterations=orc_results.get("orc_mdot_iterations") if orc_ok else None,
+        scbc_states=dict(final_scbc_states),  # 副本: 缓存中的 SCBC 结果不受调用方修改影响
+        orc_states=orc_results.get("orc_states", {}) if orc_ok else {},
+        eo_nfev=scbc_result.eo_nfev,
+        regen_residual_history=scbc_result.regen_residual_history,
+        tear_variables=tear_variables
+    )
 
 
 # (simulate_orc_standalone function remains largely the same as your provided version,
 # ensure it correctly uses intermediate_scbc_data for Q_GO_to_ORC_J_s, T8_GO_HotIn_K, T9_GO_HotOut_K)
 
-def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
+def solve_orc_mdot_bracketed(orc_fluid, P_eva_Pa, h_o2_J_kg, Q_J_s, T_target_K, m_dot_min_kg_s, m_dot_max_kg_s):
+    """
+    用 brentq 求 ORC 流量，使蒸发器出口温度 T(P_eva, h_o2 + Q/m) 等于目标温度。
+    出口温度随流量单调下降，区间两端误差异号时才求解。
+    返回 (蒸发器出口状态点, 物性计算次数)；无法求解时状态点为 None。
+    """
+    n_evaluations = [0]
+
+    def outlet_state(m_dot_kg_s):
+        n_evaluations[0] += 1
+        state = StatePoint(orc_fluid, "ORC_P_o3_Bracketed")
+        state.props_from_PH(P_eva_Pa, h_o2_J_kg + Q_J_s / m_dot_kg_s)
+        state.m_dot = m_dot_kg_s
+        return state
+
+    def temperature_error(m_dot_kg_s):
+        state = outlet_state(m_dot_kg_s)
+        if state.T is None:
+            raise ValueError("ORC蒸发器出口物性计算失败")
+        return state.T - T_target_K
+
+    # 流量下限取出口比目标温度高 50 K 时的流量，避免过小流量下出口焓超出物性范围
+    state_hot = StatePoint(orc_fluid, "ORC_P_o3_BracketHot").props_from_PT(P_eva_Pa, T_target_K + 50.0)
+    if state_hot.h is not None and state_hot.h > h_o2_J_kg:
+        m_dot_min_kg_s = max(m_dot_min_kg_s, Q_J_s / (state_hot.h - h_o2_J_kg))
+    if m_dot_min_kg_s >= m_dot_max_kg_s:
+        return None, n_evaluations[0]
+    try:
+        error_low, error_high = temperature_error(m_dot_min_kg_s), temperature_error(m_dot_max_kg_s)
+        if error_low * error_high > 0:
+            return None, n_evaluations[0]
+        m_dot_kg_s = scipy.optimize.brentq(temperature_error, m_dot_min_kg_s, m_dot_max_kg_s, xtol=1e-6)
+    except ValueError:
+        return None, n_evaluations[0]
+    return outlet_state(m_dot_kg_s), n_evaluations[0]
+
+
+def orc_evaporator_outlet_target_K(T_sat_eva_K, delta_T_superheat_K, T_go_hot_in_K, approach_temp_K):
+    """
+    ORC蒸发器出口 (透平进口) 的目标温度: 饱和温度 + 过热度，但不超过 SCBC 侧 GO 热源进口温度减去最小温差。
+    限制后不再过热时优先保证过热度，仍违反温差约束时取上限，并至少保留 0.1 K 过热。
+    """
+    T_o3_target_superheated_K = T_sat_eva_K + delta_T_superheat_K
+    T_o3_limit_from_source_K = T_go_hot_in_K - approach_temp_K
+    T_o3_final_target_K = min(T_o3_target_superheated_K, T_o3_limit_from_source_K)
+    # Ensure it's still superheated after limit
+    if T_o3_final_target_K < T_sat_eva_K + 0.1:  # Small margin for superheat
+        T_o3_final_target_K = T_sat_eva_K + delta_T_superheat_K  # Prioritize superheat
+        if T_o3_final_target_K >= T_go_hot_in_K - approach_temp_K:
+            T_o3_final_target_K = T_go_hot_in_K - approach_temp_K
+            if T_o3_final_target_K <= T_sat_eva_K:
+                T_o3_final_target_K = T_sat_eva_K + 0.1  # Force minimal superheat
+    return T_o3_final_target_K
+
+
+def solve_cycle_equation_oriented(params, state1_base, mc_branch_to_total_ratio, Q_ER_target_J_s, solver_stats=None,
+                                  warm_start=None):
+    """
+    联立求解方式: 把撕裂变量 (h6, h7, m_dot_total, m_dot_orc) 和对应残差
+    (回热器 h6/h7 的一次代换差、Q_ER 相对误差、ORC 蒸发器出口焓与目标温度对应焓之差) 组成一个非线性方程组，
+    用 scipy.optimize.root (hybr, 有限差分雅可比) 一次求解，代替质量流量和回热两层循环。
+    SCBC 的三个残差与 m_dot_orc 无关，雅可比为块下三角: ORC 流量由 SCBC 的解唯一确定，联立求解只是省去了
+    单独的 ORC 流量求解，simulate_orc_stage 直接用这里解出的 m_dot_orc 计算 ORC 状态点。
+    返回值与 calculate_scbc_high_temp_loop 相同 (Q_er_calc_J_s, W_net_scbc_J_s, scbc_states)，失败时为 None。
+    solver_stats 中记录 eo_converged、eo_nfev、eo_residual (最终残差)、eo_m_dot_orc_kg_s。
+    warm_start 为撕裂变量字典 (见 CycleSimulationResult.tear_variables) 时用作初值。
+    """
+    scbc_params = params.get("scbc_parameters", {})
+    orc_params = params.get("orc_parameters", {})
+    scbc_fluid = params.get("fluids", {}).get("scbc", "CO2")
+    orc_fluid = params.get("fluids", {}).get("orc", "R245fa")
+    P_low_cycle_Pa = state1_base.P
+
+    # 与撕裂变量无关的部分只算一次: MC 出口 (单位流量)、ORC 泵出口焓和蒸发饱和温度
+    state2_per_kg, W_mc_J_kg = model_compressor_MC(state1_base.with_flow(1.0), state1_base.P *
+                                                   scbc_params.get('PR_main_cycle_pressure_ratio'),
+                                                   scbc_params.get('eta_C_compressor'))
+    P_eva_Pa = to_pascal(orc_params.get('P_eva_kPa_orc'), 'kpa')
+    P_cond_Pa = P_eva_Pa / orc_params.get('target_pr_orc_expansion_ratio')
+    state_o1 = StatePoint(orc_fluid, "ORC_P_o1_PumpIn").props_from_PQ(P_cond_Pa, 0)
+    state_o1.m_dot = 1.0
+    state_o2, _ = model_pump_ORC(state_o1, P_eva_Pa, orc_params.get('eta_PO_pump', 0.75))
+    state_sat_eva = StatePoint(orc_fluid, "_temp_sat_eva_orc_calc").props_from_PQ(P_eva_Pa, 1.0)
+    if not state2_per_kg or not state_o2 or state_sat_eva.T is None:
+        return None, None, None
+    delta_T_superheat_K = to_kelvin(orc_params.get('target_theta_w_orc_turbine_inlet_C')) - state_sat_eva.T
+    approach_temp_K = params.get("heat_exchangers_common", {}).get('approach_temp_eva_K_orc', 10.0)
+    T9_target_K = to_kelvin(scbc_params.get('T9_precooler_outlet_C', 84.26))
+
+    # 初值: 与顺序求解相同的猜测值；变量按量级缩放
+    state6_guess = StatePoint(scbc_fluid).props_from_PT(
+        P_low_cycle_Pa, to_kelvin(scbc_params.get('T6_HTR_hot_in_C_guess', 455.03)))
+    state7_guess = StatePoint(scbc_fluid).props_from_PT(
+        P_low_cycle_Pa, to_kelvin(scbc_params.get('T7_LTR_hot_in_C_guess', 306.16)))
+    if state6_guess.h is None or state7_guess.h is None:
+        return None, None, None
+    scale = np.array([1e5, 1e5, 1e3, 1e2])
+    x0 = np.array([state6_guess.h, state7_guess.h,
+                   scbc_params.get("m_dot_total_main_flow_kg_s", 2600.0),
+                   orc_params.get('m_dot_orc_initial_guess_kg_s', 100.0)])
+    if warm_start:
+        x0 = np.array([warm_start.get(key) or x0[i] for i, key in
+                       enumerate(("h6_J_kg", "h7_J_kg", "m_dot_total_kg_s", "m_dot_orc_kg_s"))], dtype=float)
+    x0 = x0 / scale
+    failed_residual = np.full(4, 1e3)
+    last_evaluation = {}
+
+    def residuals(z):
+        h6, h7, m_dot_total, m_dot_orc = (float(v) for v in z * scale)
+        if m_dot_total <= 0 or m_dot_orc <= 0:
+            return failed_residual
+        m_dot_mc_branch = m_dot_total * mc_branch_to_total_ratio
+        state6_in = StatePoint(scbc_fluid, "P6_Iter_HTR_HotIn_EO").props_from_PH(P_low_cycle_Pa, h6)
+        state7_in = StatePoint(scbc_fluid, "P7_Iter_LTR_HotIn_EO").props_from_PH(P_low_cycle_Pa, h7)
+        if state6_in.T is None or state7_in.T is None:
+            return failed_residual
+        state6_in.m_dot = state7_in.m_dot = m_dot_total
+        regen_pass = scbc_regen_pass(params, state2_per_kg.with_flow(m_dot_mc_branch), state6_in, state7_in,
+                                     m_dot_total, m_dot_mc_branch, pass_number="EO")
+        if regen_pass is None:
+            return failed_residual
+        pass_states = regen_pass["states"]
+        # ORC: GO 热侧放热 -> 蒸发器出口焓 -> 与目标出口温度的偏差
+        state8_go_in = pass_states["P8_LTR_HotOut_Total"].with_flow(m_dot_mc_branch)
+        state9_go_out, Q_go_J_s = model_cooler_set_T_out(state8_go_in, T9_target_K, name_suffix="GO_SCBC_HotSide_EO")
+        if not state9_go_out or Q_go_J_s is None:
+            return failed_residual
+        # ORC 残差用焓差表示 (目标出口温度对应的焓 - 能量平衡给出的焓)，避免流量偏小时 PH 闪蒸超出物性范围
+        T_o3_target_K = orc_evaporator_outlet_target_K(state_sat_eva.T, delta_T_superheat_K,
+                                                       state8_go_in.T, approach_temp_K)
+        state_o3_target = StatePoint(orc_fluid, "ORC_P_o3_EO").props_from_PT(P_eva_Pa, T_o3_target_K)
+        if state_o3_target.h is None:
+            return failed_residual
+        last_evaluation["regen_pass"] = regen_pass
+        return np.array([
+            (pass_states["P6_Turbine_Out_HTR_HotIn"].h - h6) / 1e3,  # kJ/kg
+            (pass_states["P7_HTR_HotOut_LTR_HotIn"].h - h7) / 1e3,  # kJ/kg
+            (regen_pass["Q_er_calc_J_s"] - Q_ER_target_J_s) / Q_ER_target_J_s * 100,  # %
+            (state_o2.h + abs(Q_go_J_s) / m_dot_orc - state_o3_target.h) / 1e3  # kJ/kg
+        ])
+
+    solution = scipy.optimize.root(residuals, x0, method="hybr", options={"eps": 1e-7})
+    final_residual = residuals(solution.x)
+    tol_h_kJ_kg = scbc_params.get("tol_scbc_h_kJ_kg", 0.1)
+    converged = bool(np.all(np.abs(final_residual[:2]) < tol_h_kJ_kg) and abs(final_residual[2]) < 0.1 and
+                     abs(final_residual[3]) < tol_h_kJ_kg)
+    h6, h7, m_dot_total, m_dot_orc = solution.x * scale
+    if solver_stats is not None:
+        solver_stats["eo_converged"] = converged
+        solver_stats["eo_nfev"] = solution.nfev + 1
+        solver_stats["eo_residual"] = final_residual.tolist()
+        solver_stats["eo_m_dot_orc_kg_s"] = float(m_dot_orc)
+        solver_stats["regen_converged"] = converged
+    if not converged:
+        print(f"  警告: 联立求解未收敛 ({solution.message})，残差 = {np.round(final_residual, 4).tolist()}")
+        return None, None, None
+
+    regen_pass = last_evaluation["regen_pass"]
+    pass_states = regen_pass["states"]
+    m_dot_mc_branch = float(m_dot_total * mc_branch_to_total_ratio)
+    state1 = state1_base.with_flow(m_dot_mc_branch, name="P1_MC_In_MFLOW_ITER")
+    state2 = state2_per_kg.with_flow(m_dot_mc_branch)
+    W_net_scbc_J_s = regen_pass["W_t_J_kg"] * pass_states["P5_ER_Out_Turbine_In"].m_dot - \
+                     W_mc_J_kg * m_dot_mc_branch - regen_pass["W_rc_J_kg"] * pass_states["P3'_RC_Out"].m_dot
+    scbc_states = {"P1_MC_In": state1, "P2_MC_Out": state2}
+    scbc_states.update(pass_states)
+    return regen_pass["Q_er_calc_J_s"], W_net_scbc_J_s, scbc_states
+
+
+def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data, verbose=True):
     """
     模拟独立的ORC循环。
     接收来自SCBC的热量进行蒸发。
+    verbose=False 时不打印过程信息。
     """
+    log = print if verbose else _no_log
     orc_fluid = common_params.get("fluids", {}).get("orc", "R245fa")  # Changed default to R245fa
-    print(f"ORC工质: {orc_fluid}")
+    log(f"ORC工质: {orc_fluid}")
 
     Q_from_scbc_J_s = intermediate_scbc_data.get("Q_GO_to_ORC_J_s")
     T_scbc_go_hot_in_K = intermediate_scbc_data.get("T8_GO_HotIn_K")
@@ -495,8 +1219,8 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
         print("错误: ORC仿真缺少来自SCBC的关键换热数据 (热量或温度)。")
         return None
 
-    print(f"接收来自SCBC的热量 Q_eva_orc: {Q_from_scbc_J_s / 1e6:.2f} MW")
-    print(
+    log(f"接收来自SCBC的热量 Q_eva_orc: {Q_from_scbc_J_s / 1e6:.2f} MW")
+    log(
         f"SCBC侧GO热源温度范围: {T_scbc_go_hot_in_K - 273.15:.2f}°C (进口) to {T_scbc_go_hot_out_K - 273.15:.2f}°C (出口)")
 
     # ORC参数提取 from orc_params (passed into this function)
@@ -530,17 +1254,17 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
 
     if any(v is None for v in [P_eva_orc_kPa, P_cond_kPa_orc, T_pump_in_C_orc, delta_T_superheat_orc_K]):
         print("错误: ORC 的一个或多个关键参数 (P_eva, P_cond, T_pump_in, delta_T_superheat) 未在参数中定义。")
-        print(
+        log(
             f"  P_eva: {P_eva_orc_kPa}, P_cond: {P_cond_kPa_orc}, T_pump_in: {T_pump_in_C_orc}, dT_superheat: {delta_T_superheat_orc_K}")
         return None
 
-    print(f"\nORC主要参数 (从参数文件中读取或计算):")
-    print(f"  蒸发压力 P_eva: {P_eva_orc_kPa:.2f} kPa")
-    print(f"  冷凝压力 P_cond: {P_cond_kPa_orc:.2f} kPa")
-    print(f"  泵进口温度 T_pump_in: {T_pump_in_C_orc:.2f} °C")
-    print(f"  目标过热度 delta_T_superheat: {delta_T_superheat_orc_K:.2f} K")
-    print(f"  泵效率 η_PO_pump: {eta_P_orc}")
-    print(f"  透平效率 η_TO_turbine: {eta_T_orc}")
+    log(f"\nORC主要参数 (从参数文件中读取或计算):")
+    log(f"  蒸发压力 P_eva: {P_eva_orc_kPa:.2f} kPa")
+    log(f"  冷凝压力 P_cond: {P_cond_kPa_orc:.2f} kPa")
+    log(f"  泵进口温度 T_pump_in: {T_pump_in_C_orc:.2f} °C")
+    log(f"  目标过热度 delta_T_superheat: {delta_T_superheat_orc_K:.2f} K")
+    log(f"  泵效率 η_PO_pump: {eta_P_orc}")
+    log(f"  透平效率 η_TO_turbine: {eta_T_orc}")
     # ... (rest of ORC simulation logic using these parameters - largely unchanged from your provided script) ...
     # Make sure point names are unique, e.g., by prefixing with "ORC_"
     orc_states = {}
@@ -551,7 +1275,7 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
     # T_o1_K_param = to_kelvin(T_pump_in_C_orc) # This is the target from modify_params
 
     # Set pump inlet to saturated liquid at P_cond_kPa_orc, T_pump_in_C_orc should match this.
-    print(f"信息: 将ORC泵进口 (点o1) 设置为在压力 {P_cond_kPa_orc:.2f} kPa下的饱和液体状态 (Q=0)。")
+    log(f"信息: 将ORC泵进口 (点o1) 设置为在压力 {P_cond_kPa_orc:.2f} kPa下的饱和液体状态 (Q=0)。")
     state_o1_pump_in.props_from_PQ(P_o1_Pa, 0)
 
     if state_o1_pump_in.T is not None:
@@ -580,23 +1304,14 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
     #   It calculates state_o3_eva_out and updated W_p_orc_total_MW
     #   Important: T_o3_final_target_K must be calculated based on delta_T_superheat_orc_K and P_eva_orc_kPa's Tsat
     # Calculate Tsat at P_eva for ORC
-    _temp_sat_eva_orc = StatePoint(orc_fluid, "_temp_sat_eva_orc_calc")
-    _temp_sat_eva_orc.props_from_PQ(P_o2_pump_out_Pa, 1.0)  # Q=1 for saturated vapor temp
+    # 与 _temp_sat_eva_orc_for_dT 为同一饱和状态 (P_eva, Q=1)，不再重复计算
+    _temp_sat_eva_orc = _temp_sat_eva_orc_for_dT.clone(name="_temp_sat_eva_orc_calc")
     T_sat_orc_eva_K = _temp_sat_eva_orc.T
     if T_sat_orc_eva_K is None: print("错误: ORC无法获取蒸发饱和温度。"); return None
 
-    T_o3_target_superheated_K = T_sat_orc_eva_K + delta_T_superheat_orc_K
-    T_o3_limit_from_source_K = T_scbc_go_hot_in_K - approach_temp_eva_K_orc
-    T_o3_final_target_K = min(T_o3_target_superheated_K, T_o3_limit_from_source_K)
-    # Ensure it's still superheated after limit
-    if T_o3_final_target_K < T_sat_orc_eva_K + 0.1:  # Small margin for superheat
-        T_o3_final_target_K = T_sat_orc_eva_K + delta_T_superheat_orc_K  # Prioritize superheat
-        if T_o3_final_target_K >= T_scbc_go_hot_in_K - approach_temp_eva_K_orc:
-            T_o3_final_target_K = T_scbc_go_hot_in_K - approach_temp_eva_K_orc
-            # print(f"  ORC警告: 过热目标可能导致违反与热源的最小温差，目标温度被限制为 {T_o3_final_target_K-273.15:.2f}°C")
-            if T_o3_final_target_K <= T_sat_orc_eva_K:
-                T_o3_final_target_K = T_sat_orc_eva_K + 0.1  # Force minimal superheat
-                # print(f"  ORC错误: 限制后的ORC出口温度不高于饱和温度。强制微小过热。")
+    T_o3_final_target_K = orc_evaporator_outlet_target_K(
+        T_sat_orc_eva_K, delta_T_superheat_orc_K, T_scbc_go_hot_in_K, approach_temp_eva_K_orc
+    )
 
     # print(f"  ORC蒸发器 (GO) 计算 - 目标出口温度: {T_o3_final_target_K-273.15:.2f}°C")
     # Iteration for m_dot_orc_current_kg_s to achieve T_o3_final_target_K with Q_from_scbc_J_s
@@ -624,40 +1339,71 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
 
     state_o3_eva_out = None
     converged_orc_mdot = False
-    for i_mdot_orc in range(max_iter_orc_mdot):
-        h_o3_calc_J_kg = state_o2_pump_out.h + Q_from_scbc_J_s / m_dot_orc_current_kg_s
-        _temp_state_o3 = StatePoint(orc_fluid, f"ORC_P_o3_Iter{i_mdot_orc + 1}")
-        _temp_state_o3.props_from_PH(state_o2_pump_out.P, h_o3_calc_J_kg)
-        _temp_state_o3.m_dot = m_dot_orc_current_kg_s
-
-        if not (_temp_state_o3.h and _temp_state_o3.T):
-            # print(f"  ORC警告: 蒸发器出口状态计算失败 (Iter {i_mdot_orc+1}). 尝试调整流量。")
-            m_dot_orc_current_kg_s *= (
-                m_dot_adj_factor_high if error_T_K < 0 else m_dot_adj_factor_low)  # Heuristic adjustment
-            m_dot_orc_current_kg_s = max(m_dot_min_kg_s, min(m_dot_max_kg_s, m_dot_orc_current_kg_s))
-            continue
-
-        T_o3_current_K = _temp_state_o3.T
-        error_T_K = T_o3_current_K - T_o3_final_target_K
-
-        is_proper_outlet_state = (_temp_state_o3.q is None or _temp_state_o3.q < 0 or _temp_state_o3.q >= 1.0) and \
-                                 (
-                                             T_sat_orc_eva_K is None or T_o3_current_K > T_sat_orc_eva_K - 0.01)  # Allow slight undershoot from sat if target is sat
-
-        # print(f"  ORC Iter {i_mdot_orc+1}: m={m_dot_orc_current_kg_s:.2f}, T={T_o3_current_K-273.15:.2f}C (Tar:{T_o3_final_target_K-273.15:.2f}C), Err={error_T_K:.2f}K, Q={_temp_state_o3.q:.2f if _temp_state_o3.q is not None else 'N/A'}")
-
-        if abs(error_T_K) < tol_orc_T_approach and is_proper_outlet_state:
-            state_o3_eva_out = _temp_state_o3
-            converged_orc_mdot = True
-            # print(f"  ORC流量迭代收敛。")
-            break
+    orc_mdot_solve_mode = orc_params.get("orc_mdot_solve_mode", "direct")
+    m_dot_orc_given_kg_s = intermediate_scbc_data.get("m_dot_orc_kg_s")
+    if m_dot_orc_given_kg_s:
+        # 联立求解 (equation_oriented) 已给出 ORC 流量: 蒸发器出口焓由能量平衡直接得到
+        orc_mdot_iterations = 0
+        state_o3_eva_out = StatePoint(orc_fluid, "ORC_P_o3_EO").props_from_PH(
+            state_o2_pump_out.P, state_o2_pump_out.h + Q_from_scbc_J_s / m_dot_orc_given_kg_s)
+        state_o3_eva_out.m_dot = m_dot_orc_given_kg_s
+        converged_orc_mdot = state_o3_eva_out.T is not None
+    elif orc_mdot_solve_mode == "direct":
+        # 蒸发器出口压力和目标温度已知，直接 m = Q / (h(P_eva, T_o3) - h_o2)；
+        # 泵出口焓只取决于压力 (与流量无关)，所以不需要迭代
+        orc_mdot_iterations = 1
+        # 直接公式要求出口为过热蒸汽: 目标温度须高于蒸发压力下的饱和温度 (泵出口压力即蒸发压力)。
+        # 目标温度等于饱和温度时出口落在两相区，焓不由 (P, T) 决定 (props_from_PT 不给出干度)
+        is_superheated_target = _state_o3_guess.h is not None and T_o3_final_target_K > T_sat_orc_eva_K
+        if is_superheated_target and (_state_o3_guess.h - state_o2_pump_out.h) > 1e3:
+            m_dot_direct_kg_s = Q_from_scbc_J_s / (_state_o3_guess.h - state_o2_pump_out.h)
+            if m_dot_min_kg_s <= m_dot_direct_kg_s <= m_dot_max_kg_s:
+                state_o3_eva_out = _state_o3_guess.with_flow(m_dot_direct_kg_s, name="ORC_P_o3_Direct")
+                converged_orc_mdot = True
+        if not converged_orc_mdot:
+            # 两相/过冷目标或边界情况: 在 [m_min, m_max] 区间内对出口温度误差做有界求根
+            state_o3_eva_out, n_evaluations = solve_orc_mdot_bracketed(
+                orc_fluid, state_o2_pump_out.P, state_o2_pump_out.h, Q_from_scbc_J_s,
+                T_o3_final_target_K, m_dot_min_kg_s, m_dot_max_kg_s
+            )
+            orc_mdot_iterations += n_evaluations
+            converged_orc_mdot = state_o3_eva_out is not None
+    else:
+        for i_mdot_orc in range(max_iter_orc_mdot):
+            h_o3_calc_J_kg = state_o2_pump_out.h + Q_from_scbc_J_s / m_dot_orc_current_kg_s
+            _temp_state_o3 = StatePoint(orc_fluid, "ORC_P_o3_Iter{}", name_args=(i_mdot_orc + 1,))
+            _temp_state_o3.props_from_PH(state_o2_pump_out.P, h_o3_calc_J_kg)
+            _temp_state_o3.m_dot = m_dot_orc_current_kg_s
+
+            if not (_temp_state_o3.h and _temp_state_o3.T):
+                # print(f"  ORC警告: 蒸发器出口状态计算失败 (Iter {i_mdot_orc+1}). 尝试调整流量。")
+                m_dot_orc_current_kg_s *= (
+                    m_dot_adj_factor_high if error_T_K < 0 else m_dot_adj_factor_low)  # Heuristic adjustment
+                m_dot_orc_current_kg_s = max(m_dot_min_kg_s, min(m_dot_max_kg_s, m_dot_orc_current_kg_s))
+                continue
+
+            T_o3_current_K = _temp_state_o3.T
+            error_T_K = T_o3_current_K - T_o3_final_target_K
+
+            is_proper_outlet_state = (_temp_state_o3.q is None or _temp_state_o3.q < 0 or _temp_state_o3.q >= 1.0) and \
+                                     (
+                                                 T_sat_orc_eva_K is None or T_o3_current_K > T_sat_orc_eva_K - 0.01)  # Allow slight undershoot from sat if target is sat
+
+            # print(f"  ORC Iter {i_mdot_orc+1}: m={m_dot_orc_current_kg_s:.2f}, T={T_o3_current_K-273.15:.2f}C (Tar:{T_o3_final_target_K-273.15:.2f}C), Err={error_T_K:.2f}K, Q={_temp_state_o3.q:.2f if _temp_state_o3.q is not None else 'N/A'}")
+
+            if abs(error_T_K) < tol_orc_T_approach and is_proper_outlet_state:
+                state_o3_eva_out = _temp_state_o3
+                converged_orc_mdot = True
+                # print(f"  ORC流量迭代收敛。")
+                break
 
-        if error_T_K > 0:
-            m_dot_orc_current_kg_s *= m_dot_adj_factor_high
-        else:
-            m_dot_orc_current_kg_s *= m_dot_adj_factor_low
-        m_dot_orc_current_kg_s = max(m_dot_min_kg_s, min(m_dot_max_kg_s, m_dot_orc_current_kg_s))
-        state_o3_eva_out = _temp_state_o3  # Store last attempt
+            if error_T_K > 0:
+                m_dot_orc_current_kg_s *= m_dot_adj_factor_high
+            else:
+                m_dot_orc_current_kg_s *= m_dot_adj_factor_low
+            m_dot_orc_current_kg_s = max(m_dot_min_kg_s, min(m_dot_max_kg_s, m_dot_orc_current_kg_s))
+            state_o3_eva_out = _temp_state_o3  # Store last attempt
+        orc_mdot_iterations = i_mdot_orc + 1
 
     if not converged_orc_mdot: print(f"  警告: ORC流量迭代未收敛。使用最后计算值。")
     if not state_o3_eva_out or not state_o3_eva_out.h: print(f"错误: ORC蒸发器出口最终无效。"); return None
@@ -684,9 +1430,8 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
     orc_states["ORC_P_o4_TurbineOut_CondIn"] = state_o4_turbine_out
     W_t_orc_total_MW = (W_t_orc_J_kg * state_o3_eva_out.m_dot) / 1e6 if state_o3_eva_out.m_dot else 0
 
-    _final_o1_cond_out = StatePoint(orc_fluid, "ORC_P_o1_CondOut_Final")  # Renamed from _final_o1
-    _final_o1_cond_out.props_from_PQ(P_o1_Pa, 0)
-    _final_o1_cond_out.m_dot = state_o4_turbine_out.m_dot
+    # 冷凝器出口与泵进口为同一饱和液体状态 (P_cond, Q=0)
+    _final_o1_cond_out = state_o1_pump_in.with_flow(state_o4_turbine_out.m_dot, name="ORC_P_o1_CondOut_Final")
     orc_states["ORC_P_o1_CondOut_Calc"] = _final_o1_cond_out
 
     Q_cond_orc_J_s_recalc = (
@@ -705,10 +1450,235 @@ def simulate_orc_standalone(orc_params, common_params, intermediate_scbc_data):
         "W_net_orc_MW": W_net_orc_MW_val,
         "eta_orc_thermal": eta_orc_thermal_val,
         "eta_orc_exergy": eta_orc_exergy,
-        "Q_cond_orc_MW": abs(Q_cond_orc_J_s_recalc / 1e6) if Q_cond_orc_J_s_recalc else None
+        "Q_cond_orc_MW": abs(Q_cond_orc_J_s_recalc / 1e6) if Q_cond_orc_J_s_recalc else None,
+        "m_dot_orc_kg_s": state_o3_eva_out.m_dot,
+        "orc_mdot_iterations": orc_mdot_iterations
+    }
+
+
+def _params_array(params_list, section, key, default=np.nan):
+    """从每个设计点的参数字典中取出同一参数，组成数组 (缺失或参数生成失败时为 default / NaN)"""
+    values = []
+    for params in params_list:
+        value = params.get(section, {}).get(key, default) if params else np.nan
+        values.append(np.nan if value is None else value)
+    return np.array(values, dtype=float)
+
+
+def _scbc_regen_pass_batch(scbc_fluid, state2, P_low_cycle_Pa, h6, h7, mc_branch_to_total_ratio,
+                           eta_L, eta_H, eta_C, eta_T, T5_K):
+    """
+    scbc_regen_pass 的批量版本 (按 1 kg/s 总流量): 对每个设计点给定点6/点7的焓，
+    依次计算 LTR -> RC -> 混合点3 -> HTR -> ER -> 透平，每个部件一次批量物性计算。
+    返回各数组组成的字典，valid 为 False 的设计点本次计算失败。
+    """
+    state6_in = StateBatch(scbc_fluid).props_from_PH(P_low_cycle_Pa, h6)
+    state7_in = StateBatch(scbc_fluid).props_from_PH(P_low_cycle_Pa, h7)
+    # LTR 热侧为总流量，冷侧为主压缩机支路
+    state8, state_ltr_cold_out, _ = model_heat_exchanger_effectiveness_batch(
+        state7_in, state2, eta_L, flow_ratio_hot_to_cold=1.0 / mc_branch_to_total_ratio)
+    state_rc_out, W_rc_J_kg = model_compressor_batch(state8, state2.P, eta_C)
+    h3_mixed_J_kg = mc_branch_to_total_ratio * state_ltr_cold_out.h + (1 - mc_branch_to_total_ratio) * state_rc_out.h
+    state3 = StateBatch(scbc_fluid).props_from_PH(state2.P, h3_mixed_J_kg)
+    state7_out, state4, _ = model_heat_exchanger_effectiveness_batch(state6_in, state3, eta_H)
+    state5, Q_er_J_kg = model_heater_set_T_out_batch(state4, T5_K)
+    state6_out, W_t_J_kg = model_turbine_batch(state5, P_low_cycle_Pa, eta_T)
+    valid = (state6_in.valid & state7_in.valid & state8.valid & state_ltr_cold_out.valid & state_rc_out.valid &
+             state3.valid & state7_out.valid & state4.valid & state5.valid & state6_out.valid)
+    return {
+        "h6_out": state6_out.h, "h7_out": state7_out.h, "h8": state8.h, "T8": state8.T, "T5": state5.T,
+        "Q_er_J_kg": Q_er_J_kg, "W_t_J_kg": W_t_J_kg, "W_rc_J_kg": W_rc_J_kg, "valid": valid
     }
 
 
+def simulate_many(designs, params_list=None, verbose=False):
+    """
+    同时计算 N 个设计点的 SCBC/ORC 联合循环 (lockstep): 每个部件对所有设计点只做一次批量物性计算，
+    回热迭代用收敛掩码只继续计算尚未收敛的设计点。
+    designs 为 [N, 4] 数组，列依次为 (θ5 °C, PR_SCBC, θw °C, PR_ORC)；params_list 不为 None 时直接使用
+    给定的各设计点参数字典 (如修改了效率/效能)，否则由 modify_cycle_parameters.generate_cycle_parameters 生成。
+    求解方式固定为 per_kg (SCBC) + direct (ORC)，回热加速为逐分量 Wegstein (regen_accelerator 为
+    "substitution" 时用逐次代换)；ORC 直接解不适用的设计点逐个退回有界求根。参数字典要求其他求解方式/加速方法，
+    或各设计点的 regen_accelerator/工质不一致，或热启动缓存已开启时抛出 ValueError (这些情况请逐个调用
+    simulate_scbc_orc_cycle 或按设置分组调用)。
+    返回字典，键与 CycleSimulationResult 的数值字段相同，值为长度 N 的数组 (失败的设计点为 NaN)，
+    另有 valid (SCBC 计算成功)、regen_iterations、regen_converged。
+    """
+    log = print if verbose else _no_log
+    designs = np.atleast_2d(np.asarray(designs, dtype=float))
+    n_designs = len(designs)
+    if params_list is None:
+        params_list = [modify_cycle_parameters.generate_cycle_parameters(t5_c, pr_scbc, pr_orc, theta_w_c)
+                       for t5_c, pr_scbc, theta_w_c, pr_orc in designs]
+    if WARM_START_CACHE_ENABLED:
+        raise ValueError("simulate_many 不支持热启动，请先 disable_warm_start_cache() 或逐个调用 simulate_scbc_orc_cycle")
+    batch_settings = set()  # 批量计算中所有设计点共用的设置: (回热加速方法, SCBC 工质, ORC 工质)
+    for params in params_list:
+        if not params:
+            continue
+        scbc_params, orc_params = params.get("scbc_parameters", {}), params.get("orc_parameters", {})
+        mass_flow_solve_mode = scbc_params.get("mass_flow_solve_mode", "per_kg")
+        orc_mdot_solve_mode = orc_params.get("orc_mdot_solve_mode", "direct")
+        regen_accelerator = scbc_params.get("regen_accelerator", "wegstein")
+        if mass_flow_solve_mode != "per_kg" or orc_mdot_solve_mode != "direct" or \
+                regen_accelerator not in ("wegstein", "substitution"):
+            raise ValueError(f"simulate_many 只支持 mass_flow_solve_mode='per_kg'、orc_mdot_solve_mode='direct' 和 "
+                             f"regen_accelerator 为 'wegstein'/'substitution'，收到 {mass_flow_solve_mode!r}, "
+                             f"{orc_mdot_solve_mode!r}, {regen_accelerator!r}")
+        batch_settings.add((regen_accelerator, params.get("fluids", {}).get("scbc", "CO2"),
+                            params.get("fluids", {}).get("orc", "R245fa")))
+    if len(batch_settings) > 1:
+        raise ValueError(f"simulate_many 要求所有设计点的 regen_accelerator 和工质相同，收到 {sorted(batch_settings)}，"
+                         f"请按设置分组调用")
+    regen_accelerator, scbc_fluid, orc_fluid = batch_settings.pop() if batch_settings else ("wegstein", "CO2", "R245fa")
+
+    # --- 各设计点的参数数组 ---
+    scbc, orc = "scbc_parameters", "orc_parameters"
+    P1_Pa = to_pascal(_params_array(params_list, scbc, 'p1_compressor_inlet_kPa'), 'kpa')
+    T1_K = to_kelvin(_params_array(params_list, scbc, 'T1_compressor_inlet_C'))
+    T5_K = to_kelvin(_params_array(params_list, scbc, 'T5_turbine_inlet_C'))
+    PR_scbc = _params_array(params_list, scbc, 'PR_main_cycle_pressure_ratio')
+    T9_K = to_kelvin(_params_array(params_list, scbc, 'T9_precooler_outlet_C', 84.26))
+    m_dot_total_param = _params_array(params_list, scbc, 'm_dot_total_main_flow_kg_s', 2600.0)
+    mc_branch_to_total_ratio = _params_array(params_list, scbc, 'm_dot_mc_branch_kg_s', 1900.0) / m_dot_total_param
+    eta_T = _params_array(params_list, scbc, 'eta_T_turbine')
+    eta_C = _params_array(params_list, scbc, 'eta_C_compressor')
+    eta_H = _params_array(params_list, scbc, 'eta_H_HTR_effectiveness')
+    eta_L = _params_array(params_list, scbc, 'eta_L_LTR_effectiveness')
+    tol_h_kJ_kg = _params_array(params_list, scbc, 'tol_scbc_h_kJ_kg', 0.1)
+    max_iter_regen = int(np.nanmax(_params_array(params_list, scbc, 'max_iter_scbc_main_loop', 20)))
+    Q_ER_target_J_s = _params_array(params_list, "notes", 'phi_ER_MW_heat_input', 600.0) * 1e6
+
+    # --- 主压缩机 (按单位质量流量，与流量无关) ---
+    state1 = StateBatch(scbc_fluid, "P1_MC_In").props_from_PT(P1_Pa, T1_K)
+    state2, W_mc_J_kg = model_compressor_batch(state1, P1_Pa * PR_scbc, np.where(np.isfinite(eta_C), eta_C, 1.0))
+
+    # --- 回热迭代 (撕裂流 h6/h7)，只对尚未收敛且未失败的设计点继续计算 ---
+    h6 = StateBatch(scbc_fluid).props_from_PT(
+        P1_Pa, to_kelvin(_params_array(params_list, scbc, 'T6_HTR_hot_in_C_guess', 455.03))).h
+    h7 = StateBatch(scbc_fluid).props_from_PT(
+        P1_Pa, to_kelvin(_params_array(params_list, scbc, 'T7_LTR_hot_in_C_guess', 306.16))).h
+    valid = state2.valid & np.isfinite(h6) & np.isfinite(h7) & np.isfinite(eta_T + eta_C + eta_H + eta_L + T5_K)
+    converged = np.zeros(n_designs, dtype=bool)
+    regen_iterations = np.zeros(n_designs, dtype=int)
+    x_prev, g_prev = np.full((2, n_designs), np.nan), np.full((2, n_designs), np.nan)
+    last_pass = {key: np.full(n_designs, np.nan) for key in
+                 ("h6_out", "h7_out", "h8", "T8", "T5", "Q_er_J_kg", "W_t_J_kg", "W_rc_J_kg")}
+    for i_regen in range(max_iter_regen):
+        active = np.flatnonzero(valid & ~converged)
+        if active.size == 0:
+            break
+        regen_pass = _scbc_regen_pass_batch(
+            scbc_fluid, state2.subset(active), P1_Pa[active], h6[active], h7[active],
+            mc_branch_to_total_ratio[active], eta_L[active], eta_H[active], eta_C[active], eta_T[active], T5_K[active])
+        for key in last_pass:
+            last_pass[key][active] = regen_pass[key]
+        regen_iterations[active] = i_regen + 1
+        failed = ~regen_pass["valid"]
+        valid[active[failed]] = False
+
+        g_k = np.vstack([regen_pass["h6_out"], regen_pass["h7_out"]])
+        x_k = np.vstack([h6[active], h7[active]])
+        done = ~failed & np.all(np.abs(g_k - x_k) / 1000 < tol_h_kJ_kg[active], axis=0)
+        converged[active[done]] = True
+        pending = ~done & ~failed
+        next_x = g_k[:, pending]
+        has_history = np.isfinite(x_prev[0, active[pending]])
+        if regen_accelerator == "wegstein" and has_history.any():
+            history = active[pending][has_history]
+            next_x[:, has_history] = _next_regen_guess(
+                "wegstein", [x_prev[:, history], x_k[:, pending][:, has_history]],
+                [g_prev[:, history], g_k[:, pending][:, has_history]])
+        x_prev[:, active[pending]], g_prev[:, active[pending]] = x_k[:, pending], g_k[:, pending]
+        h6[active[pending]], h7[active[pending]] = next_x
+    log(f"批量回热迭代: {n_designs} 个设计点, 收敛 {int(converged.sum())} 个, 失败 {int((~valid).sum())} 个, "
+        f"最多迭代 {int(regen_iterations.max()) if n_designs else 0} 次")
+    if np.any(valid & ~converged):
+        print(f"  警告: {int(np.sum(valid & ~converged))} 个设计点的SCBC回热器在 {max_iter_regen} 次迭代后未收敛。")
+
+    # --- 按目标吸热量缩放流量 ---
+    valid &= last_pass["Q_er_J_kg"] > 0
+    m_dot_total_kg_s = np.where(valid, Q_ER_target_J_s / np.where(valid, last_pass["Q_er_J_kg"], 1.0), np.nan)
+    m_dot_mc_branch_kg_s = m_dot_total_kg_s * mc_branch_to_total_ratio
+    m_dot_rc_kg_s = m_dot_total_kg_s - m_dot_mc_branch_kg_s
+    W_net_scbc_J_s = last_pass["W_t_J_kg"] * m_dot_total_kg_s - W_mc_J_kg * m_dot_mc_branch_kg_s - \
+                     last_pass["W_rc_J_kg"] * m_dot_rc_kg_s
+    Q_er_J_s = last_pass["Q_er_J_kg"] * m_dot_total_kg_s
+
+    # --- GO 热侧 (点8 -> 点9) ---
+    state8_go_in = StateBatch(scbc_fluid).props_from_PH(P1_Pa, last_pass["h8"])
+    state9_go_out, q_go_J_kg = model_cooler_set_T_out_batch(state8_go_in, T9_K)
+    Q_go_J_s = np.abs(q_go_J_kg * m_dot_mc_branch_kg_s)
+
+    # --- ORC (直接由目标出口状态计算流量) ---
+    P_eva_Pa = to_pascal(_params_array(params_list, orc, 'P_eva_kPa_orc'), 'kpa')
+    P_cond_Pa = P_eva_Pa / _params_array(params_list, orc, 'target_pr_orc_expansion_ratio')
+    eta_PO = _params_array(params_list, orc, 'eta_PO_pump', 0.75)
+    eta_TO = _params_array(params_list, orc, 'eta_TO_turbine', 0.8)
+    state_o1 = StateBatch(orc_fluid, "ORC_P_o1_PumpIn").props_from_PQ(P_cond_Pa, 0)
+    state_o2, W_p_orc_J_kg = model_pump_batch(state_o1, P_eva_Pa, np.where(np.isfinite(eta_PO), eta_PO, 1.0))
+    state_sat_eva = StateBatch(orc_fluid).props_from_PQ(P_eva_Pa, 1.0)
+    delta_T_superheat_K = to_kelvin(_params_array(params_list, orc, 'target_theta_w_orc_turbine_inlet_C')) - \
+                          state_sat_eva.T
+    approach_temp_K = _params_array(params_list, "heat_exchangers_common", 'approach_temp_eva_K_orc', 10.0)
+    T_o3_target_K = np.array([
+        orc_evaporator_outlet_target_K(*args) if np.all(np.isfinite(args)) else np.nan
+        for args in zip(state_sat_eva.T, delta_T_superheat_K, state8_go_in.T, approach_temp_K)
+    ])
+    state_o3 = StateBatch(orc_fluid, "ORC_P_o3_EvaOut_TurbineIn").props_from_PT(P_eva_Pa, T_o3_target_K)
+    dh_eva_J_kg = state_o3.h - state_o2.h
+    m_dot_orc_kg_s = Q_go_J_s / np.where(dh_eva_J_kg > 1e3, dh_eva_J_kg, np.nan)
+    m_dot_orc_min_kg_s = _params_array(params_list, orc, 'm_dot_orc_min_kg_s', 1.0)
+    m_dot_orc_max_kg_s = _params_array(params_list, orc, 'm_dot_orc_max_kg_s', np.nan)
+    m_dot_orc_max_kg_s = np.where(np.isfinite(m_dot_orc_max_kg_s), m_dot_orc_max_kg_s, Q_go_J_s / 10e3)
+    orc_ok = valid & state_o2.valid & state_o3.valid & ((state_o3.q < 0) | (state_o3.q >= 1.0)) & \
+             (m_dot_orc_kg_s >= m_dot_orc_min_kg_s) & (m_dot_orc_kg_s <= m_dot_orc_max_kg_s)
+    # 两相/边界情况: 与 simulate_orc_standalone 相同，逐个做有界求根
+    for i in np.flatnonzero(valid & ~orc_ok & state_o2.valid & np.isfinite(T_o3_target_K) & (Q_go_J_s > 1e-6)):
+        state_o3_i, _ = solve_orc_mdot_bracketed(orc_fluid, P_eva_Pa[i], state_o2.h[i], Q_go_J_s[i], T_o3_target_K[i],
+                                                 m_dot_orc_min_kg_s[i], m_dot_orc_max_kg_s[i])
+        if state_o3_i is not None:
+            for attr in ("P", "T", "h", "s", "d", "e", "q"):
+                getattr(state_o3, attr)[i] = getattr(state_o3_i, attr) if getattr(state_o3_i, attr) is not None \
+                    else -1.0
+            state_o3.valid[i] = True
+            m_dot_orc_kg_s[i] = state_o3_i.m_dot
+            orc_ok[i] = True
+    state_o4, W_t_orc_J_kg = model_turbine_batch(state_o3, P_cond_Pa, np.where(np.isfinite(eta_TO), eta_TO, 1.0))
+    orc_ok &= state_o4.valid
+    W_net_orc_J_s = np.where(orc_ok, m_dot_orc_kg_s * (W_t_orc_J_kg - W_p_orc_J_kg), 0.0)
+    log(f"批量ORC计算: 成功 {int(orc_ok.sum())} 个")
+
+    # --- 效率 ---
+    T0_K, _ = get_reference_state()
+    T_er_source_K = last_pass["T5"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carnot_efficiency = 1 - T0_K / T_er_source_K
+        W_net_combined_J_s = W_net_scbc_J_s + W_net_orc_J_s
+        results = {
+            "W_net_scbc_MW": W_net_scbc_J_s / 1e6,
+            "W_net_orc_MW": np.where(valid, W_net_orc_J_s / 1e6, np.nan),
+            "W_net_combined_MW": W_net_combined_J_s / 1e6,
+            "Q_er_MW": Q_er_J_s / 1e6,
+            "eta_scbc_thermal": W_net_scbc_J_s / Q_er_J_s,
+            "eta_scbc_exergy": W_net_scbc_J_s / (Q_er_J_s * carnot_efficiency),
+            "eta_orc_thermal": np.where(orc_ok, W_net_orc_J_s / Q_go_J_s, 0.0),
+            "eta_orc_exergy": np.where(orc_ok, W_net_orc_J_s / (Q_go_J_s * (1 - T0_K / state8_go_in.T)), 0.0),
+            "eta_combined_thermal": W_net_combined_J_s / Q_er_J_s,
+            "eta_combined_exergy": W_net_combined_J_s / (Q_er_J_s * carnot_efficiency),
+            "carnot_efficiency": carnot_efficiency,
+            "m_dot_total_kg_s": m_dot_total_kg_s,
+            "m_dot_mc_branch_kg_s": m_dot_mc_branch_kg_s,
+            "m_dot_rc_kg_s": m_dot_rc_kg_s,
+            "m_dot_orc_kg_s": np.where(orc_ok, m_dot_orc_kg_s, np.nan),
+            "Q_go_MW": Q_go_J_s / 1e6,
+        }
+    for key, values in results.items():
+        results[key] = np.where(valid, values, np.nan)
+    results.update(valid=valid, regen_iterations=regen_iterations, regen_converged=converged)
+    return results
+
+
 # output_to_file and main remain the same
 import sys
 
@@ -1,6 +1,6 @@
 import json
 import os
-from state_point_calculator import StatePoint, to_kelvin, to_pascal, T0_K
+from state_point_calculator import StatePoint, to_kelvin, to_pascal, get_reference_state
 
 def calculate_orc_parameters(scbc_states):
     """
@@ -59,6 +59,7 @@ def calculate_orc_parameters(scbc_states):
         "eta_PO_pump": 0.75,    # 泵效率
         "max_iter_orc_mdot": 40,  # 最大迭代次数
         "tol_orc_T_approach_K": 0.1,  # 温度收敛容差
+        "orc_mdot_solve_mode": "direct",  # 流量求解方式 ("direct" 或 "search")
         "m_dot_orc_initial_guess_kg_s": 100.0  # 初始质量流量猜测值
     }
 
@@ -105,7 +106,9 @@ def calculate_scbc_parameters(scbc_states):
         "eta_H_HTR_effectiveness": 0.86,  # 高温换热器效率
         "eta_L_LTR_effectiveness": 0.86,  # 低温换热器效率
         "max_iter_scbc_main_loop": 20,  # 最大迭代次数
-        "tol_scbc_h_kJ_kg": 0.1  # 焓收敛容差
+        "tol_scbc_h_kJ_kg": 0.1,  # 焓收敛容差
+        "mass_flow_solve_mode": "per_kg",  # 质量流量求解方式 ("per_kg"、"iterative" 或 "equation_oriented")
+        "regen_accelerator": "wegstein"  # 回热迭代加速方法 (见 full_cycle_simulator.REGEN_ACCELERATORS)
     }
 
 def calculate_parameters_from_key_variables(new_t5_c, new_pr_scbc, new_pr_orc, new_theta_w_orc_c):
@@ -165,7 +168,7 @@ def calculate_parameters_from_key_variables(new_t5_c, new_pr_scbc, new_pr_orc, n
             "orc": "R245fa"
         },
         "reference_conditions": {
-            "T0_C": T0_K - 273.15,
+            "T0_C": get_reference_state()[0] - 273.15,
             "P0_kPa": 101.325
         },
         "scbc_parameters": {
@@ -181,7 +184,9 @@ def calculate_parameters_from_key_variables(new_t5_c, new_pr_scbc, new_pr_orc, n
             "eta_H_HTR_effectiveness": 0.86,
             "eta_L_LTR_effectiveness": 0.86,
             "max_iter_scbc_main_loop": 20,
-            "tol_scbc_h_kJ_kg": 0.1
+            "tol_scbc_h_kJ_kg": 0.1,
+            "mass_flow_solve_mode": "per_kg",
+            "regen_accelerator": "wegstein"
         },
         "orc_parameters": {
             "P_eva_kPa_orc": P_eva_orc_kPa,
@@ -192,6 +197,7 @@ def calculate_parameters_from_key_variables(new_t5_c, new_pr_scbc, new_pr_orc, n
             "eta_PO_pump": 0.75,
             "max_iter_orc_mdot": 40,
             "tol_orc_T_approach_K": 0.1,
+            "orc_mdot_solve_mode": "direct",
             "m_dot_orc_initial_guess_kg_s": 100.0
         },
         "heat_exchangers_common": {
@@ -238,7 +244,7 @@ def generate_cycle_parameters(scbc_states=None, key_variables=None):
                     "orc": "R245fa"
                 },
                 "reference_conditions": {
-                    "T0_C": T0_K - 273.15,
+                    "T0_C": get_reference_state()[0] - 273.15,
                     "P0_kPa": 101.325
                 },
                 "scbc_parameters": scbc_params,
@@ -4,10 +4,26 @@ import subprocess
 import re
 import json
 import os
+import io
+import math
+import signal
+import contextlib
+import multiprocessing
+import pickle
+import argparse
+import queue
+import itertools
+import hashlib
 import numpy as np
+from scipy.interpolate import RBFInterpolator
+from scipy.spatial import cKDTree
 import time
 import csv  # 确保导入csv模块
 
+import modify_cycle_parameters
+import full_cycle_simulator
+import state_point_calculator
+
 # --- Configuration ---
 # GA Parameters
 POPULATION_SIZE = 50
@@ -25,15 +41,77 @@ VAR_BOUNDS = {
 }
 VAR_NAMES = ["theta_5_c", "pr_scbc", "theta_w_c", "pr_orc"]
 
+# Fitness evaluation backend:
+#   "inprocess"  - 在当前进程中直接调用参数生成函数和模拟器，读取返回的指标 (默认，速度快)
+#   "subprocess" - 原始方式，依次启动 modify_cycle_parameters.py 和 full_cycle_simulator.py 并解析其输出
+#   "batch"      - 每代用 full_cycle_simulator.simulate_many 同时计算整个种群 (每个部件一次批量物性计算)
+FITNESS_BACKEND = "inprocess"
+FITNESS_BACKENDS = ("inprocess", "subprocess", "batch")
+
+# 进程内物性缓存 (只对 "inprocess" 后端有效): 各个体共用的状态点 (如 SCBC 点1) 和迭代中重复的闪蒸直接复用
+USE_PROPERTY_CACHE = True
+PROPERTY_CACHE_SIZE = 200000
+
+# 热启动 (只对 "inprocess" 后端的串行评估有效): 以已评估的相邻个体的收敛解作为回热器/流量迭代的初值。
+# 进程池的工作进程不开启热启动: 各进程缓存的内容取决于调度，同一基因的适应度会随之变化 (约 1e-4)
+USE_WARM_START = True
+WARM_START_CACHE_SIZE = 5000
+# SCBC 子循环缓存 (只对 "inprocess" 后端有效): SCBC 参数 (θ5, PR_SCBC) 与已评估个体相同时只重算 ORC
+USE_SCBC_STAGE_CACHE = True
+SCBC_STAGE_CACHE_SIZE = 1000
+
+# 进程池并行评估 (只对 "inprocess" 后端有效): 每代把种群分块派发给工作进程，结果按个体顺序写入日志
+PARALLEL_WORKERS = None  # None: 按 CPU 亲和性掩码取可用核数; 1: 串行评估
+PARALLEL_CHUNK_SIZE = None  # None: 每个工作进程约分到 4 块
+EVAL_TIMEOUT_S = 300  # 单个个体评估超时 (秒)，超时的个体记为无效; None 表示不限时
+
+# 适应度缓存: 以量化后的基因为键缓存模拟指标，精英个体、未交叉/变异的后代和相同的子代不再重复模拟
+# 缓存文件与 ga_optimization_log.csv 放在一起，跨运行复用。文件第一行记录模型指纹 (model_fingerprint)，
+# 修改循环模型、固定参数、物性后端或求解设置后指纹改变，旧的缓存文件被丢弃
+USE_FITNESS_CACHE = True
+FITNESS_CACHE_QUANTUM = {  # 各基因的量化步长，落在同一格内的基因视为相同
+    "theta_5_c": 0.01,
+    "pr_scbc": 1e-4,
+    "theta_w_c": 0.01,
+    "pr_orc": 1e-4
+}
+
+# 代理模型预筛选: 用上次运行的日志和本次已模拟的个体训练 RBF 代理模型 (预测适应度)，
+# 每代只对预测最好的和最不确定的 (离已评估点最远的) 部分后代做真实模拟，其余后代用预测值参与选择
+USE_SURROGATE = False
+SURROGATE_KERNEL = "thin_plate_spline"  # scipy.interpolate.RBFInterpolator 的核函数
+SURROGATE_SMOOTHING = 1e-3  # 平滑系数，吸收求解器容差和日志舍入带来的噪声
+SURROGATE_NEIGHBOURS = 64  # 每次预测只用最近的若干训练点 (局部 RBF)，训练点很多时保持拟合速度
+SURROGATE_MIN_TRAINING_POINTS = 20  # 训练点少于此数时不筛选，全部真实模拟
+SURROGATE_SIMULATE_FRACTION = 0.3  # 每代需要模拟的新个体中，真实模拟的比例
+SURROGATE_EXPLORE_FRACTION = 0.3  # 真实模拟的个体中，按不确定度 (而非预测值) 挑选的比例
+
+# 检查点: 每隔若干代把完整的 GA 状态 (种群、随机数状态、历史最优、适应度缓存等) 原子地写入二进制文件，
+# 用 --resume 从最后一个完成的代继续 (串行评估时结果与不中断运行逐位一致)
+USE_CHECKPOINT = True
+CHECKPOINT_INTERVAL = 1  # 每隔多少代写一次检查点
+CHECKPOINT_VERSION = 3
+
+# 异步稳态 GA (run_steady_state_ga): 没有代际同步，任一评估完成就从当前档案中锦标赛选择出新后代补上
+STEADY_STATE_TASKS_PER_WORKER = 2  # 每个工作进程的在途任务数，>1 时工作进程不必等待主进程派发
+
 # Paths to your existing scripts
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MODIFY_PARAMS_SCRIPT = os.path.join(SCRIPT_DIR, "modify_cycle_parameters.py")
 SIMULATOR_SCRIPT = os.path.join(SCRIPT_DIR, "full_cycle_simulator.py")
+# 模型指纹包含的源文件: 修改其中任何一个，已缓存的模拟指标都视为过期
+MODEL_SOURCE_FILES = ("modify_cycle_parameters.py", "full_cycle_simulator.py", "cycle_components.py",
+                      "state_point_calculator.py")
+FINGERPRINT_PREFIX = "# model_fingerprint: "
 
 # 获取项目根目录和output文件夹路径
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 PARAMS_JSON_FILE = os.path.join(OUTPUT_DIR, "cycle_setup_parameters.json")
+FITNESS_CACHE_FILE = os.path.join(OUTPUT_DIR, "ga_fitness_cache.csv")
+SURROGATE_LOG_FILE = os.path.join(OUTPUT_DIR, "ga_surrogate_log.csv")
+CHECKPOINT_FILE = os.path.join(OUTPUT_DIR, "ga_checkpoint.pkl")
+STEADY_STATE_TIMING_FILE = os.path.join(OUTPUT_DIR, "ga_steady_state_timing.csv")
 
 # 如果output文件夹不存在，则尝试使用当前目录中的文件
 if not os.path.exists(OUTPUT_DIR):
@@ -58,6 +136,18 @@ if abs((ALPHA + BETA) - 1.0) > 1e-6 and GAMMA == 0.0 and (ALPHA > 0 or BETA > 0)
 
 
 # --- Helper Functions ---
+class EvaluationTimeout(BaseException):
+    """单个个体评估超时。继承 BaseException，避免被模拟器内部的 except Exception 吞掉。"""
+
+
+def default_worker_count():
+    """返回 CPU 亲和性掩码允许的核数 (不支持 sched_getaffinity 的平台退回 os.cpu_count())。"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 def check_scripts_exist():
     """Checks if the required Python scripts exist."""
     if not os.path.exists(MODIFY_PARAMS_SCRIPT):
@@ -139,22 +229,39 @@ def create_individual():
     return individual
 
 
-def initialize_population():
-    """Initializes the population with random individuals."""
-    return [create_individual() for _ in range(POPULATION_SIZE)]
+def gene_bounds():
+    """返回按 VAR_NAMES 顺序排列的基因下界、上界数组。"""
+    return (np.array([VAR_BOUNDS[var_name][0] for var_name in VAR_NAMES]),
+            np.array([VAR_BOUNDS[var_name][1] for var_name in VAR_NAMES]))
 
 
-def calculate_fitness(individual, generation_num, individual_num):
+def genes_to_dict(genes_row):
+    """把种群矩阵中的一行基因转换为 {变量名: 值} 字典 (模拟后端和日志使用的格式)。"""
+    return {var_name: float(genes_row[j]) for j, var_name in enumerate(VAR_NAMES)}
+
+
+def individual_from_row(genes_row, fitness, metrics_row):
+    """由种群矩阵中的一行构造个体字典 (与 create_individual() 的格式相同，指标中的 NaN 转为 None)。"""
+    return {
+        "genes": genes_to_dict(genes_row),
+        "fitness": float(fitness),
+        "metrics": {metric: (float(value) if np.isfinite(value) else None)
+                    for metric, value in zip(("eta_t", "eta_e", "cost_c"), metrics_row)}
+    }
+
+
+def initialize_population(rng):
+    """Initializes the population matrix [POPULATION_SIZE, 4] (columns in VAR_NAMES order) with random genes."""
+    lower, upper = gene_bounds()
+    return rng.uniform(lower, upper, size=(POPULATION_SIZE, len(VAR_NAMES)))
+
+
+def run_simulation_subprocess(genes):
     """
-    Calculates the fitness of an individual by running the simulation.
-    Now returns a tuple: (fitness, eta_t, eta_e, cost_c)
+    Fallback backend: runs modify_cycle_parameters.py and full_cycle_simulator.py as subprocesses
+    and parses the simulator's stdout.
+    Returns a dictionary like parse_simulator_output(), or None if a subprocess failed.
     """
-    genes = individual["genes"]
-    # ... (print statement for evaluating individual - unchanged) ...
-    print(f"  Gen {generation_num}, Ind {individual_num}: 评估个体 - "
-          f"θ5={genes[VAR_NAMES[0]]:.2f}°C, PR_scbc={genes[VAR_NAMES[1]]:.2f}, "
-          f"θw={genes[VAR_NAMES[2]]:.2f}°C, PR_orc={genes[VAR_NAMES[3]]:.2f}")
-
     # 1. Modify cycle parameters
     cmd_modify = [
         "python", MODIFY_PARAMS_SCRIPT,
@@ -170,17 +277,17 @@ def calculate_fitness(individual, generation_num, individual_num):
         stderr_str = decode_subprocess_output(e.stderr)
         print(
             f"    错误: 执行 '{MODIFY_PARAMS_SCRIPT}' 失败. 返回码: {e.returncode}\n    stdout: {stdout_str}\n    stderr: {stderr_str}")
-        return -float('inf'), None, None, None
+        return None
     # ... (other exception handling for modify_proc - unchanged) ...
     except subprocess.TimeoutExpired:
         print(f"    错误: 执行 '{MODIFY_PARAMS_SCRIPT}' 超时。")
-        return -float('inf'), None, None, None
+        return None
     except FileNotFoundError:
         print(f"    错误: 脚本 '{MODIFY_PARAMS_SCRIPT}' 或 python 解释器未找到。")
-        return -float('inf'), None, None, None
+        return None
     except Exception as e:
         print(f"    运行 '{MODIFY_PARAMS_SCRIPT}' 时发生意外的子流程错误: {e}")
-        return -float('inf'), None, None, None
+        return None
 
     # 2. Run full cycle simulator
     cmd_simulate = ["python", SIMULATOR_SCRIPT]
@@ -195,16 +302,446 @@ def calculate_fitness(individual, generation_num, individual_num):
     # ... (other exception handling for simulate_proc - unchanged) ...
     except subprocess.TimeoutExpired:
         print(f"    错误: 执行 '{SIMULATOR_SCRIPT}' 超时。")
-        return -float('inf'), None, None, None
+        return None
     except FileNotFoundError:
         print(f"    错误: 脚本 '{SIMULATOR_SCRIPT}' 或 python 解释器未找到。")
-        return -float('inf'), None, None, None
+        return None
     except Exception as e:
         print(f"    运行 '{SIMULATOR_SCRIPT}' 时发生意外的子流程错误: {e}")
-        return -float('inf'), None, None, None
+        return None
+
+    # 3. Parse output
+    return parse_simulator_output(output_text)
+
+
+def run_simulation_inprocess(genes, param_overrides=None):
+    """
+    Default backend: generates the cycle parameters and runs the simulator in the current process.
+    No interpreter start-up, no CoolProp reloading, no JSON round-trip and no stdout parsing;
+    metrics are read directly from the simulator's CycleSimulationResult.
+    param_overrides ({节: {参数: 值}}, 如 {"scbc_parameters": {"tol_scbc_h_kJ_kg": 1e-4}}) 覆盖生成的参数。
+    Returns a dictionary like parse_simulator_output(), or None if the simulation failed.
+    """
+    try:
+        params = modify_cycle_parameters.generate_cycle_parameters(
+            genes[VAR_NAMES[0]], genes[VAR_NAMES[1]], genes[VAR_NAMES[3]], genes[VAR_NAMES[2]]
+        )
+        if not params:
+            print("    错误: 进程内参数生成失败。")
+            return None
+        for section, values in (param_overrides or {}).items():
+            params.setdefault(section, {}).update(values)
+        # verbose=False: 跳过模拟器所有过程信息的格式化，直接返回结构化结果
+        sim_result = full_cycle_simulator.simulate_scbc_orc_cycle(params, verbose=False)
+    except Exception as e:
+        print(f"    进程内模拟时发生错误: {e}")
+        return None
+
+    if sim_result is None:
+        return {"thermal_efficiency": None, "exergy_efficiency": None, "cost": None}
+    return {
+        "thermal_efficiency": sim_result.eta_combined_thermal,
+        "exergy_efficiency": sim_result.eta_combined_exergy,
+        "cost": None  # Placeholder for cost if ever implemented
+    }
+
+
+def run_simulation_batch(population):
+    """
+    Batch backend: evaluates the whole population with full_cycle_simulator.simulate_many.
+    Returns (list of dictionaries like parse_simulator_output(), one per individual, batch time in seconds).
+    """
+    designs = np.array([[ind["genes"][var_name] for var_name in VAR_NAMES] for ind in population])
+    batch_start_time = time.perf_counter()
+    try:
+        batch_results = full_cycle_simulator.simulate_many(designs)
+    except Exception as e:
+        print(f"    批量模拟时发生错误: {e}")
+        return [None] * len(population), time.perf_counter() - batch_start_time
+    batch_time_s = time.perf_counter() - batch_start_time
+
+    sim_results = []
+    for i in range(len(population)):
+        valid = bool(batch_results["valid"][i])
+        sim_results.append({
+            "thermal_efficiency": float(batch_results["eta_combined_thermal"][i]) if valid else None,
+            "exergy_efficiency": float(batch_results["eta_combined_exergy"][i]) if valid else None,
+            "cost": None  # Placeholder for cost if ever implemented
+        })
+    return sim_results, batch_time_s
+
+
+def _evaluation_alarm_handler(signum, frame):
+    raise EvaluationTimeout()
+
+
+def _init_pool_worker(property_cache_size, scbc_stage_cache_size=0):
+    """
+    工作进程初始化: 在每个工作进程中开启物性缓存和 SCBC 子循环缓存，并注册超时信号。
+    两种缓存只复用与调度无关的确定结果; 热启动不开启，保证同一基因的评估结果与它落在哪个进程、排在谁之后无关。
+    """
+    if property_cache_size:
+        state_point_calculator.enable_property_cache(property_cache_size)
+    if scbc_stage_cache_size:
+        full_cycle_simulator.enable_scbc_stage_cache(scbc_stage_cache_size)
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _evaluation_alarm_handler)
+
+
+def _worker_cache_stats():
+    """返回 (进程号, 物性缓存统计, 热启动统计)，未开启的缓存为 None。"""
+    return (os.getpid(),
+            state_point_calculator.get_property_cache_stats() if state_point_calculator.PROPERTY_CACHE_ENABLED else None,
+            full_cycle_simulator.get_warm_start_cache_stats() if full_cycle_simulator.WARM_START_CACHE_ENABLED else None)
+
+
+def _evaluate_chunk(genes_list, timeout_s, param_overrides=None):
+    """
+    在工作进程中依次评估一块个体。
+    每个个体的控制台输出被截获后随结果返回，由主进程按个体顺序打印。
+    支持 SIGALRM 的平台上单个个体超过 timeout_s 秒即中止并记为无效，工作进程继续评估下一个。
+    Returns ([(sim_results, eval_time_s, output_text), ...], _worker_cache_stats())
+    """
+    use_alarm = bool(timeout_s) and hasattr(signal, "SIGALRM")
+    chunk_results = []
+    for genes in genes_list:
+        output = io.StringIO()
+        eval_start_time = time.perf_counter()
+        with contextlib.redirect_stdout(output):
+            try:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, timeout_s)
+                sim_results = run_simulation_inprocess(genes, param_overrides)
+            except EvaluationTimeout:
+                print(f"    错误: 个体评估超过 {timeout_s} 秒，已中止。")
+                sim_results = None
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        chunk_results.append((sim_results, time.perf_counter() - eval_start_time, output.getvalue()))
+    return chunk_results, _worker_cache_stats()
+
+
+def create_worker_pool(n_workers):
+    """创建评估用的进程池，工作进程按 USE_PROPERTY_CACHE/USE_SCBC_STAGE_CACHE 开启各自的缓存 (不开启热启动)。"""
+    return multiprocessing.Pool(
+        n_workers, initializer=_init_pool_worker,
+        initargs=(PROPERTY_CACHE_SIZE if USE_PROPERTY_CACHE else 0,
+                  SCBC_STAGE_CACHE_SIZE if USE_SCBC_STAGE_CACHE else 0))
+
+
+def evaluate_population_parallel(population, pool, n_workers, chunk_size=None, timeout_s=None, param_overrides=None):
+    """
+    用进程池评估整个种群 (只跑模拟，不计算适应度)。
+    种群按顺序切成连续的块 (相邻个体落在同一工作进程，物性缓存更容易命中)，按派发顺序收集结果，
+    因此返回列表与 population 一一对应，与完成先后无关。
+    每块还有 timeout_s * (块大小 + 1) 的总超时作为兜底 (应对卡在 C 扩展内、信号无法打断的情况)，
+    兜底超时的块整体记为无效，并返回 pool_broken=True 提示调用方重建进程池。
+    Returns (results, worker_cache_stats, pool_broken)
+        results: [(sim_results, eval_time_s, output_text), ...]
+        worker_cache_stats: {进程号: (物性缓存统计, 热启动统计)}
+    """
+    genes_list = [ind["genes"] for ind in population]
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(len(genes_list) / (n_workers * 4)))
+    pending = []
+    for start in range(0, len(genes_list), chunk_size):
+        chunk = genes_list[start:start + chunk_size]
+        pending.append((chunk, pool.apply_async(_evaluate_chunk, (chunk, timeout_s, param_overrides))))
+
+    results, worker_cache_stats, pool_broken = [], {}, False
+    for chunk, async_result in pending:
+        # 按派发顺序等待: 等到第 k 块时前面的块都已完成，第 k 块必然已开始运行，兜底超时从此刻计时即可
+        wait_start_time = time.perf_counter()
+        try:
+            chunk_results, (pid, property_stats, warm_start_stats) = async_result.get(
+                timeout=timeout_s * (len(chunk) + 1) if timeout_s else None)
+        except multiprocessing.TimeoutError:
+            pool_broken = True
+            waited_s = time.perf_counter() - wait_start_time
+            message = f"    错误: 工作进程评估 {len(chunk)} 个个体超时 ({waited_s:.0f} 秒)，该块记为无效。\n"
+            chunk_results = [(None, waited_s / len(chunk), message)] * len(chunk)
+        except Exception as e:
+            message = f"    工作进程评估时发生错误: {e}\n"
+            chunk_results = [(None, 0.0, message)] * len(chunk)
+        else:
+            worker_cache_stats[pid] = (property_stats, warm_start_stats)
+        results.extend(chunk_results)
+    return results, worker_cache_stats, pool_broken
+
+
+def sum_worker_cache_stats(worker_cache_stats):
+    """把各工作进程最近一次上报的缓存统计相加，返回 (物性缓存统计, 热启动统计)，没有数据的一项为 None。"""
+    property_stats, warm_start_stats = None, None
+    for worker_property_stats, worker_warm_start_stats in worker_cache_stats.values():
+        if worker_property_stats is not None:
+            if property_stats is None:
+                property_stats = {"hits": 0, "misses": 0, "evictions": 0}
+            for key in property_stats:
+                property_stats[key] += worker_property_stats[key]
+        if worker_warm_start_stats is not None:
+            if warm_start_stats is None:
+                warm_start_stats = {"hits": 0, "misses": 0}
+            for key in warm_start_stats:
+                warm_start_stats[key] += worker_warm_start_stats[key]
+    if property_stats is not None:
+        lookups = property_stats["hits"] + property_stats["misses"]
+        property_stats["hit_rate"] = property_stats["hits"] / lookups if lookups else 0.0
+    return property_stats, warm_start_stats
+
+
+def fitness_cache_key(genes):
+    """按 FITNESS_CACHE_QUANTUM 量化基因，返回整数元组作为适应度缓存的键。"""
+    return tuple(int(round(genes[var_name] / FITNESS_CACHE_QUANTUM[var_name])) for var_name in VAR_NAMES)
+
+
+def fitness_cache_keys(genes_matrix):
+    """fitness_cache_key() 的矩阵版本: 对 [N, 4] 基因矩阵逐行返回缓存键列表。"""
+    quantum = np.array([FITNESS_CACHE_QUANTUM[var_name] for var_name in VAR_NAMES])
+    return [tuple(row) for row in np.rint(np.asarray(genes_matrix) / quantum).astype(np.int64).tolist()]
+
+
+def model_fingerprint(backend=None):
+    """
+    模拟模型的指纹 (16 位十六进制串): 由参考设计点 (各基因取范围中点) 生成的完整参数字典
+    (固定参数、部件效率、求解方式和容差)、物性后端、适应度计算后端和 MODEL_SOURCE_FILES 的内容一起求哈希。
+    持久化的模拟结果 (适应度缓存、代理模型使用的上一次日志) 只在指纹相同时复用。
+    """
+    lower, upper = gene_bounds()
+    reference = genes_to_dict((lower + upper) / 2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        params = modify_cycle_parameters.generate_cycle_parameters(
+            reference[VAR_NAMES[0]], reference[VAR_NAMES[1]], reference[VAR_NAMES[3]], reference[VAR_NAMES[2]])
+    digest = hashlib.sha256(json.dumps([params, state_point_calculator.PROPERTY_BACKEND, backend or FITNESS_BACKEND],
+                                       sort_keys=True).encode('utf-8'))
+    for source_file in MODEL_SOURCE_FILES:
+        with open(os.path.join(SCRIPT_DIR, source_file), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def write_fitness_cache_header(cache_writer, fingerprint):
+    """新建的缓存文件先写模型指纹行，再写表头。"""
+    cache_writer.writerow([FINGERPRINT_PREFIX + fingerprint])
+    cache_writer.writerow(VAR_NAMES + ["ThermalEfficiency", "ExergyEfficiency", "Cost"])
+
+
+def load_fitness_cache(cache_filename, fingerprint):
+    """
+    读取适应度缓存文件，返回 {键: 模拟指标字典 (格式同 parse_simulator_output())}。
+    文件不存在时返回空字典; 文件的模型指纹与 fingerprint 不同 (或没有指纹行) 时删除该文件并返回空字典。
+    """
+    fitness_cache = {}
+    if not os.path.exists(cache_filename):
+        return fitness_cache
+
+    def parse_metric(value):
+        return float(value) if value not in ("", "N/A") else None
+
+    with open(cache_filename, 'r', encoding='utf-8', newline='') as cache_file:
+        if cache_file.readline().strip() != FINGERPRINT_PREFIX + fingerprint:
+            stale = True
+        else:
+            stale = False
+            rows = list(csv.DictReader(cache_file))
+    if stale:
+        print(f"警告: 适应度缓存 {cache_filename} 的模型指纹与当前模型 ({fingerprint}) 不符，丢弃该文件。")
+        os.remove(cache_filename)
+        return fitness_cache
+    for row in rows:
+        try:
+            genes = {var_name: float(row[var_name]) for var_name in VAR_NAMES}
+            fitness_cache[fitness_cache_key(genes)] = {
+                "thermal_efficiency": parse_metric(row["ThermalEfficiency"]),
+                "exergy_efficiency": parse_metric(row["ExergyEfficiency"]),
+                "cost": parse_metric(row["Cost"])
+            }
+        except (KeyError, ValueError, TypeError):
+            continue  # 跳过不完整的行 (如上次运行中断时写了一半)
+    return fitness_cache
+
+
+def append_fitness_cache(cache_writer, key, sim_results):
+    """把一条新的缓存记录写入缓存文件 (基因写量化后的值)。"""
+    cache_writer.writerow(
+        [f"{key[i] * FITNESS_CACHE_QUANTUM[var_name]:.10g}" for i, var_name in enumerate(VAR_NAMES)] +
+        [repr(sim_results[metric]) if sim_results[metric] is not None else "N/A"
+         for metric in ("thermal_efficiency", "exergy_efficiency", "cost")])
+
+
+def save_checkpoint(checkpoint_filename, state):
+    """
+    把 GA 状态字典用 pickle 写入检查点文件。
+    先写临时文件并 fsync，再用 os.replace 原子替换，写到一半被中断也不会损坏已有的检查点。
+    """
+    temp_filename = checkpoint_filename + ".tmp"
+    with open(temp_filename, 'wb') as checkpoint_file:
+        pickle.dump(state, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(temp_filename, checkpoint_filename)
+
+
+def load_checkpoint(checkpoint_filename):
+    """读取检查点，文件不存在或版本不符时返回 None。"""
+    if not os.path.exists(checkpoint_filename):
+        return None
+    with open(checkpoint_filename, 'rb') as checkpoint_file:
+        state = pickle.load(checkpoint_file)
+    if state.get("version") != CHECKPOINT_VERSION:
+        print(f"警告: 检查点版本 {state.get('version')} 与当前版本 {CHECKPOINT_VERSION} 不符，忽略。")
+        return None
+    return state
+
+
+def truncate_csv_to_generation(csv_filename, last_generation):
+    """
+    续算前删除 CSV 日志中第 last_generation 代之后的行 (中断的那一代写了一半的记录)。
+    第一列为代数; 文件不存在时什么也不做。
+    """
+    if not os.path.exists(csv_filename):
+        return
+    with open(csv_filename, 'r', encoding='utf-8', newline='') as csv_file:
+        rows = list(csv.reader(csv_file))
+    kept_rows = rows[:1] + [row for row in rows[1:] if row and row[0].isdigit() and int(row[0]) <= last_generation]
+    temp_filename = csv_filename + ".tmp"
+    with open(temp_filename, 'w', encoding='utf-8', newline='') as csv_file:
+        csv.writer(csv_file).writerows(kept_rows)
+    os.replace(temp_filename, csv_filename)
+
+
+def fitness_from_metrics(sim_results):
+    """按 ALPHA/BETA/GAMMA 由模拟指标算出适应度 (代理模型的训练目标，也供 hybrid_optimizer 使用); 所需指标缺失时返回 None。"""
+    eta_t, eta_e, cost_c = (sim_results["thermal_efficiency"], sim_results["exergy_efficiency"],
+                            sim_results["cost"])
+    if (ALPHA > 0 and eta_t is None) or (BETA > 0 and eta_e is None) or (GAMMA > 0 and cost_c is None):
+        return None
+    return (ALPHA * eta_t if ALPHA > 0 else 0.0) + (BETA * eta_e if BETA > 0 else 0.0) - \
+        (GAMMA * cost_c if GAMMA > 0 else 0.0)
+
+
+def log_fingerprint_filename(log_filename):
+    """日志的模型指纹写在旁边的 <日志文件名>.fingerprint 中 (日志本身的 CSV 格式保持不变，供绘图等脚本读取)。"""
+    return log_filename + ".fingerprint"
 
-    # 3. Parse output and calculate fitness
-    sim_results = parse_simulator_output(output_text)
+
+def write_log_fingerprint(log_filename, fingerprint):
+    with open(log_fingerprint_filename(log_filename), 'w', encoding='utf-8') as fingerprint_file:
+        fingerprint_file.write(fingerprint + "\n")
+
+
+def load_surrogate_training_data(log_filename, fingerprint):
+    """
+    从上一次运行的 ga_optimization_log.csv 读取已真实模拟的个体，返回 {缓存键: 模拟指标字典}。
+    代理模型预测的行 (Backend 为 surrogate) 和失败的评估被跳过。
+    文件不存在、或日志的模型指纹与 fingerprint 不同 (包括没有指纹文件) 时返回空字典。
+    """
+    training_data = {}
+    if not os.path.exists(log_filename):
+        return training_data
+    fingerprint_filename = log_fingerprint_filename(log_filename)
+    previous_fingerprint = None
+    if os.path.exists(fingerprint_filename):
+        with open(fingerprint_filename, 'r', encoding='utf-8') as fingerprint_file:
+            previous_fingerprint = fingerprint_file.read().strip()
+    if previous_fingerprint != fingerprint:
+        print(f"警告: 上一次运行的日志 {log_filename} 的模型指纹与当前模型 ({fingerprint}) 不符，不用作代理模型训练数据。")
+        return training_data
+    with open(log_filename, 'r', encoding='utf-8', newline='') as log_file:
+        for row in csv.DictReader(log_file):
+            if row.get("Backend") == "surrogate":
+                continue
+            try:
+                genes = {var_name: float(row[var_name]) for var_name in VAR_NAMES}
+                sim_results = {
+                    "thermal_efficiency": float(row["ThermalEfficiency"]),
+                    "exergy_efficiency": float(row["ExergyEfficiency"]),
+                    "cost": float(row["Cost"]) if row.get("Cost") not in (None, "", "N/A") else None
+                }
+            except (KeyError, ValueError):
+                continue
+            training_data[fitness_cache_key(genes)] = sim_results
+    return training_data
+
+
+def _scaled_genes(genes_matrix):
+    """把 [N, 4] 基因矩阵按 VAR_BOUNDS 缩放到 [0, 1]。"""
+    lower, upper = gene_bounds()
+    return (np.asarray(genes_matrix) - lower) / (upper - lower)
+
+
+def fit_surrogate(training_data):
+    """
+    用 {缓存键: 模拟指标字典} 训练 RBF 代理模型。
+    返回 (RBFInterpolator, 训练点 KD 树)；有效训练点少于 SURROGATE_MIN_TRAINING_POINTS 时返回 None。
+    """
+    keys, targets = [], []
+    for key, sim_results in training_data.items():
+        target = fitness_from_metrics(sim_results)
+        if target is None:
+            continue
+        keys.append(key)
+        targets.append(target)
+    if len(targets) < SURROGATE_MIN_TRAINING_POINTS:
+        return None
+    points = _scaled_genes(np.array(keys) * np.array([FITNESS_CACHE_QUANTUM[var_name] for var_name in VAR_NAMES]))
+    model = RBFInterpolator(points, np.array(targets), kernel=SURROGATE_KERNEL, smoothing=SURROGATE_SMOOTHING,
+                            neighbors=min(SURROGATE_NEIGHBOURS, len(targets)))
+    return model, cKDTree(points)
+
+
+def predict_surrogate(surrogate, genes_matrix):
+    """对 [N, 4] 基因矩阵返回 (预测适应度数组, 到最近训练点的缩放距离数组)，距离作为预测不确定度的度量。"""
+    model, tree = surrogate
+    points = _scaled_genes(genes_matrix)
+    return model(points), tree.query(points)[0]
+
+
+def select_for_simulation(predicted, distance, n_simulate):
+    """
+    在候选个体中挑选 n_simulate 个做真实模拟: 先按不确定度取 SURROGATE_EXPLORE_FRACTION 的名额，
+    其余名额给预测适应度最高的个体。返回候选个体的下标列表 (升序)。
+    """
+    n_explore = int(round(n_simulate * SURROGATE_EXPLORE_FRACTION))
+    chosen = [int(j) for j in np.argsort(-distance)[:n_explore]]
+    for j in np.argsort(-predicted):
+        if len(chosen) >= n_simulate:
+            break
+        if int(j) not in chosen:
+            chosen.append(int(j))
+    return sorted(chosen)
+
+
+def calculate_fitness(individual, generation_num, individual_num, backend=None, sim_results=None, eval_time_s=None):
+    """
+    Calculates the fitness of an individual by running the simulation.
+    backend selects "inprocess", "subprocess" or "batch" (defaults to FITNESS_BACKEND).
+    If eval_time_s is given, sim_results were computed beforehand (batch backend or worker pool) and no simulation is run.
+    Now returns a tuple: (fitness, eta_t, eta_e, cost_c, eval_time_s)
+    """
+    genes = individual["genes"]
+    backend = backend or FITNESS_BACKEND
+    # ... (print statement for evaluating individual - unchanged) ...
+    print(f"  Gen {generation_num}, Ind {individual_num}: 评估个体 - "
+          f"θ5={genes[VAR_NAMES[0]]:.2f}°C, PR_scbc={genes[VAR_NAMES[1]]:.2f}, "
+          f"θw={genes[VAR_NAMES[2]]:.2f}°C, PR_orc={genes[VAR_NAMES[3]]:.2f}")
+
+    if backend not in FITNESS_BACKENDS:
+        raise ValueError(f"未知的适应度计算后端: {backend} (可选: {FITNESS_BACKENDS})")
+    if eval_time_s is None:
+        eval_start_time = time.perf_counter()
+        if backend == "subprocess":
+            sim_results = run_simulation_subprocess(genes)
+        elif backend == "inprocess":
+            sim_results = run_simulation_inprocess(genes)
+        else:
+            sim_results = run_simulation_batch([individual])[0][0]
+        eval_time_s = time.perf_counter() - eval_start_time
+
+    if sim_results is None:
+        return -float('inf'), None, None, None, eval_time_s
+
+    # Calculate fitness
     eta_t = sim_results["thermal_efficiency"]
     eta_e = sim_results["exergy_efficiency"]
     cost_c = sim_results["cost"]  # Remains None if not parsed
@@ -246,9 +783,10 @@ def calculate_fitness(individual, generation_num, individual_num):
     eta_t_str = f"{eta_t * 100:.2f}%" if eta_t is not None else "N/A"
     eta_e_str = f"{eta_e * 100:.2f}%" if eta_e is not None else "N/A"
     cost_c_str = f"{cost_c:.2f}" if cost_c is not None else "N/A"
-    print(f"    模拟结果: η_t={eta_t_str}, η_e={eta_e_str}, C={cost_c_str}. Fitness={current_fitness:.4f}")
+    print(f"    模拟结果: η_t={eta_t_str}, η_e={eta_e_str}, C={cost_c_str}. Fitness={current_fitness:.4f} "
+          f"({backend}, {eval_time_s:.2f} 秒)")
 
-    return current_fitness, eta_t, eta_e, cost_c
+    return current_fitness, eta_t, eta_e, cost_c, eval_time_s
 
 
 # ... (tournament_selection, crossover, mutate functions remain unchanged) ...
@@ -296,53 +834,283 @@ def mutate(individual):
     return {"genes": mutated_genes, "fitness": -float('inf'), "metrics": {"eta_t": None, "eta_e": None, "cost_c": None}}
 
 
-# --- Main GA Loop ---
-def run_genetic_algorithm():
-    if not check_scripts_exist(): return None
-    start_time = time.time()
-    population = initialize_population()
-    best_overall_individual = None
+# --- 种群矩阵上的向量化算子 (代际 GA 使用; 上面的单个体版本供异步稳态 GA 使用) ---
+def tournament_selection_matrix(fitness, n_selections, rng):
+    """
+    一次完成 n_selections 次锦标赛选择，返回胜者在种群中的下标数组。
+    每次锦标赛有放回地抽 TOURNAMENT_SIZE 个参赛者 (单个体版本为无放回抽样)，种群很大时二者没有实际差别。
+    """
+    contestants = rng.integers(0, len(fitness), size=(n_selections, TOURNAMENT_SIZE))
+    return contestants[np.arange(n_selections), np.argmax(fitness[contestants], axis=1)]
+
+
+def crossover_matrix(parents1, parents2, rng):
+    """对成对的父代矩阵按 CROSSOVER_PROBABILITY 做算术交叉 (与 crossover() 相同)，未交叉的行保持父代基因。"""
+    alpha_blend = 0.5  # Blend factor, can be tuned
+    lower, upper = gene_bounds()
+    do_crossover = (rng.random(len(parents1)) < CROSSOVER_PROBABILITY)[:, None]
+    children1 = np.where(do_crossover, alpha_blend * parents1 + (1 - alpha_blend) * parents2, parents1)
+    children2 = np.where(do_crossover, (1 - alpha_blend) * parents1 + alpha_blend * parents2, parents2)
+    return np.clip(children1, lower, upper), np.clip(children2, lower, upper)
+
+
+def mutate_matrix(genes, rng):
+    """对基因矩阵逐元素以 MUTATION_PROBABILITY 加高斯扰动 (标准差为变量范围的 10%)，与 mutate() 相同。"""
+    lower, upper = gene_bounds()
+    mutation_mask = rng.random(genes.shape) < MUTATION_PROBABILITY
+    perturbation = rng.normal(0.0, (upper - lower) * 0.1, size=genes.shape)
+    return np.clip(genes + mutation_mask * perturbation, lower, upper)
+
+
+def elite_index(fitness, simulated=None):
+    """适应度最高的行号; simulated 中有 True 时只在这些行中选取。"""
+    if simulated is None or not np.any(simulated):
+        return int(np.argmax(fitness))
+    return int(np.flatnonzero(simulated)[np.argmax(fitness[simulated])])
+
 
+def breed_next_population(genes, fitness, rng, simulated=None):
+    """
+    由当前种群矩阵生成下一代: 第 0 行为适应度最高的个体 (精英)，其余由锦标赛选择、交叉和变异产生，
+    子代按 (child1, child2, child1, ...) 的顺序排列，与逐个体循环的顺序一致。
+    simulated 为 [N] 布尔数组时精英只从为 True 的行 (有真实模拟结果的个体) 中选取，代理模型的预测值只参与锦标赛。
+    """
+    n_children = len(genes) - 1
+    n_pairs = (n_children + 1) // 2
+    parents1 = genes[tournament_selection_matrix(fitness, n_pairs, rng)]
+    parents2 = genes[tournament_selection_matrix(fitness, n_pairs, rng)]
+    children1, children2 = crossover_matrix(parents1, parents2, rng)
+    children = np.empty((2 * n_pairs, genes.shape[1]))
+    children[0::2], children[1::2] = children1, children2
+    return np.vstack([genes[elite_index(fitness, simulated)], mutate_matrix(children[:n_children], rng)])
+
+
+# --- Main GA Loop ---
+def run_genetic_algorithm(backend=None, n_workers=None, resume=False):
+    """
+    运行遗传算法，返回找到的最优个体。
+    种群以矩阵形式保存: population_genes [N, 4] (列按 VAR_NAMES 排列)、population_fitness [N]、
+    population_metrics [N, 3] (η_t, η_e, C; 缺失为 NaN)，选择、交叉、变异和排序都在整个矩阵上向量化完成。
+    随机数由 numpy Generator 产生，其种子取自 random 模块，因此 random.seed() 仍可复现整个运行。
+    resume=True 时从 CHECKPOINT_FILE 中最后一个完成的代继续: 恢复种群、随机数状态、历史最优、适应度缓存、
+    代理模型训练数据和热启动缓存，并截掉日志中中断那一代的记录。没有检查点时从头开始。
+    """
+    backend = backend or FITNESS_BACKEND
+    if backend == "subprocess" and not check_scripts_exist(): return None
+    if n_workers is None:
+        n_workers = PARALLEL_WORKERS or default_worker_count()
+    # subprocess 后端共用同一个参数 JSON 文件，batch 后端本身整体计算，二者都不使用进程池
+    pool = create_worker_pool(n_workers) if backend == "inprocess" and n_workers > 1 else None
+    worker_cache_stats = {}
     # 设置日志文件路径到output文件夹
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     log_filename = os.path.join(OUTPUT_DIR, "ga_optimization_log.csv")
-    
-    with open(log_filename, 'w', encoding='utf-8', newline='') as log_file:
+    fingerprint = model_fingerprint(backend)
+
+    checkpoint = load_checkpoint(CHECKPOINT_FILE) if resume else None
+    if resume and checkpoint is None:
+        print(f"未找到可用的检查点 {CHECKPOINT_FILE}，从头开始。")
+    if checkpoint is not None:
+        # 续算: 检查点中的适应度缓存就是中断前内存中的缓存，直接复用而不再读缓存文件
+        start_generation = checkpoint["generation"]
+        population_genes = checkpoint["population_genes"]
+        best_overall_individual = checkpoint["best_overall_individual"]
+        random.setstate(checkpoint["random_state"])
+        rng = np.random.default_rng()
+        rng.bit_generator.state = checkpoint["rng_state"]
+        fitness_cache = checkpoint["fitness_cache"]
+        surrogate_data = checkpoint["surrogate_data"]
+        n_simulated, n_cache_saved, n_surrogate_screened = checkpoint["counters"]
+        worker_cache_stats = checkpoint["worker_cache_stats"]
+        start_time = time.time() - checkpoint["elapsed_s"]
+        if checkpoint["settings"] != {"population_size": POPULATION_SIZE, "backend": backend,
+                                      "model_fingerprint": fingerprint}:
+            print(f"警告: 检查点的设置 {checkpoint['settings']} 与当前设置不同，续算结果将与不中断的运行不一致。")
+        truncate_csv_to_generation(log_filename, start_generation)
+        truncate_csv_to_generation(SURROGATE_LOG_FILE, start_generation)
+        print(f"从检查点续算: 已完成 {start_generation} 代 ({CHECKPOINT_FILE})")
+    else:
+        start_generation = 0
+        fitness_cache = load_fitness_cache(FITNESS_CACHE_FILE, fingerprint) if USE_FITNESS_CACHE else {}
+        n_simulated, n_cache_saved, n_surrogate_screened = 0, 0, 0
+        start_time = time.time()
+        rng = np.random.default_rng(random.getrandbits(64))
+        population_genes = initialize_population(rng)
+        best_overall_individual = None
+        # 代理模型训练数据: 上一次运行的日志 (在被本次运行覆盖之前读取)、适应度缓存和本次的模拟结果
+        surrogate_data = {}
+        if USE_SURROGATE:
+            surrogate_data.update(load_surrogate_training_data(log_filename, fingerprint))
+            surrogate_data.update(fitness_cache)
+
+    log_mode = 'a' if checkpoint is not None else 'w'
+    if log_mode == 'w':
+        write_log_fingerprint(log_filename, fingerprint)
+    with open(log_filename, log_mode, encoding='utf-8', newline='') as log_file, \
+            (open(FITNESS_CACHE_FILE, 'a', encoding='utf-8', newline='') if USE_FITNESS_CACHE
+             else contextlib.nullcontext()) as cache_file, \
+            (open(SURROGATE_LOG_FILE, log_mode, encoding='utf-8', newline='') if USE_SURROGATE
+             else contextlib.nullcontext()) as surrogate_log_file:
         log_writer = csv.writer(log_file)
-        log_writer.writerow(["Generation", "Individual", "theta_5_c", "pr_scbc", "theta_w_c", "pr_orc",
-                             "Fitness", "ThermalEfficiency", "ExergyEfficiency", "Cost"])
+        cache_writer = csv.writer(cache_file) if cache_file is not None else None
+        if cache_writer is not None and cache_file.tell() == 0:
+            write_fitness_cache_header(cache_writer, fingerprint)
+        surrogate_log_writer = csv.writer(surrogate_log_file) if surrogate_log_file is not None else None
+        if surrogate_log_writer is not None and surrogate_log_file.tell() == 0:
+            surrogate_log_writer.writerow(["Generation", "TrainingPoints", "Candidates", "Simulated", "Screened",
+                                           "MeanAbsError", "MaxAbsError"])
+        if log_file.tell() == 0:
+            log_writer.writerow(["Generation", "Individual", "theta_5_c", "pr_scbc", "theta_w_c", "pr_orc",
+                                 "Fitness", "ThermalEfficiency", "ExergyEfficiency", "Cost",
+                                 "Backend", "EvalTime_s"])
 
         print(f"遗传算法开始。种群大小: {POPULATION_SIZE}, 最大代数: {MAX_GENERATIONS}")
         print(f"决策变量: {VAR_NAMES}, 边界: {VAR_BOUNDS}")
         print(f"适应度权重: α(η_t)={ALPHA}, β(η_e)={BETA}, γ(C)={GAMMA}")
+        print(f"适应度计算后端: {backend}")
+        if pool is not None:
+            print(f"并行评估: {n_workers} 个工作进程 (物性缓存在各工作进程中分别开启，不使用热启动)")
+        elif backend in ("inprocess", "batch") and USE_PROPERTY_CACHE:
+            state_point_calculator.enable_property_cache(PROPERTY_CACHE_SIZE)
+            print(f"物性缓存已开启，容量: {PROPERTY_CACHE_SIZE}")
+        if pool is None and backend == "inprocess" and USE_WARM_START:
+            full_cycle_simulator.enable_warm_start_cache(WARM_START_CACHE_SIZE)
+            print(f"热启动已开启，缓存容量: {WARM_START_CACHE_SIZE}")
+            if checkpoint is not None and checkpoint["warm_start_cache"] is not None:
+                full_cycle_simulator.import_warm_start_cache(*checkpoint["warm_start_cache"])
+        if pool is None and backend == "inprocess" and USE_SCBC_STAGE_CACHE:
+            full_cycle_simulator.enable_scbc_stage_cache(SCBC_STAGE_CACHE_SIZE)
+            print(f"SCBC子循环缓存已开启，容量: {SCBC_STAGE_CACHE_SIZE}")
+            if checkpoint is not None and checkpoint["scbc_stage_cache"] is not None:
+                full_cycle_simulator.import_scbc_stage_cache(*checkpoint["scbc_stage_cache"])
+        if USE_FITNESS_CACHE:
+            print(f"适应度缓存: {FITNESS_CACHE_FILE} (已有 {len(fitness_cache)} 条)")
+        if USE_SURROGATE:
+            print(f"代理模型预筛选已开启: 初始训练点 {len(surrogate_data)} 个, "
+                  f"每代真实模拟比例 {SURROGATE_SIMULATE_FRACTION}, 误差日志: {SURROGATE_LOG_FILE}")
         print(f"详细日志将保存在: {log_filename}")
 
-        for generation in range(MAX_GENERATIONS):
+        for generation in range(start_generation, MAX_GENERATIONS):
             print(f"\n--- 第 {generation + 1} 代 ---")
             gen_start_time = time.time()
-
-            for i, ind in enumerate(population):
-                # calculate_fitness now returns (fitness, eta_t, eta_e, cost_c)
-                fitness_val, eta_t_val, eta_e_val, cost_c_val = calculate_fitness(ind, generation + 1, i + 1)
-                ind["fitness"] = fitness_val
-                ind["metrics"]["eta_t"] = eta_t_val
-                ind["metrics"]["eta_e"] = eta_e_val
-                ind["metrics"]["cost_c"] = cost_c_val
+            population_size = len(population_genes)
+            population_fitness = np.full(population_size, -np.inf)
+            population_metrics = np.full((population_size, 3), np.nan)
+            population_simulated = np.ones(population_size, dtype=bool)  # False: 适应度为代理模型预测值
+            # 只模拟缓存中没有、且在本代中第一次出现的基因; 其余个体直接复用已有结果
+            cache_keys = fitness_cache_keys(population_genes)
+            to_simulate, first_seen = [], set()
+            for i, key in enumerate(cache_keys):
+                if not USE_FITNESS_CACHE or (key not in fitness_cache and key not in first_seen):
+                    first_seen.add(key)
+                    to_simulate.append(i)
+            if USE_FITNESS_CACHE:
+                print(f"  适应度缓存: {population_size - len(to_simulate)} 个个体无需重新模拟")
+
+            # 代理模型预筛选: 只真实模拟一部分新个体，其余个体以预测适应度参与本代选择
+            surrogate_predictions, screened_out = {}, set()
+            surrogate = fit_surrogate(surrogate_data) if USE_SURROGATE and to_simulate else None
+            if surrogate is not None:
+                n_candidates = len(to_simulate)
+                predicted, distance = predict_surrogate(surrogate, population_genes[to_simulate])
+                surrogate_predictions = {i: float(predicted[j]) for j, i in enumerate(to_simulate)}
+                chosen = select_for_simulation(
+                    predicted, distance, max(1, math.ceil(SURROGATE_SIMULATE_FRACTION * n_candidates)))
+                screened_out = set(to_simulate) - {to_simulate[j] for j in chosen}
+                to_simulate = [to_simulate[j] for j in chosen]
+                print(f"  代理模型 ({len(surrogate_data)} 个训练点): {n_candidates} 个新个体中真实模拟 "
+                      f"{len(to_simulate)} 个，其余 {len(screened_out)} 个使用预测值")
+
+            # 预先计算的模拟结果 (batch 后端或进程池); 为 None 的个体在 calculate_fitness 中逐个计算
+            precomputed_results = [None] * population_size
+            precomputed_times = [None] * population_size
+            worker_outputs = [""] * population_size
+            individuals_to_simulate = [{"genes": genes_to_dict(population_genes[i])} for i in to_simulate]
+            if backend == "batch" and individuals_to_simulate:
+                batch_results, batch_time_s = run_simulation_batch(individuals_to_simulate)
+                for i, sim_results in zip(to_simulate, batch_results):
+                    precomputed_results[i] = sim_results
+                    precomputed_times[i] = batch_time_s / len(to_simulate)
+                print(f"  批量计算 {len(to_simulate)} 个个体耗时 {batch_time_s:.2f} 秒")
+            elif pool is not None and individuals_to_simulate:
+                parallel_start_time = time.perf_counter()
+                parallel_results, generation_cache_stats, pool_broken = evaluate_population_parallel(
+                    individuals_to_simulate, pool, n_workers, PARALLEL_CHUNK_SIZE, EVAL_TIMEOUT_S)
+                worker_cache_stats.update(generation_cache_stats)
+                for i, (sim_results, eval_time_s, output_text) in zip(to_simulate, parallel_results):
+                    precomputed_results[i], precomputed_times[i], worker_outputs[i] = sim_results, eval_time_s, output_text
+                print(f"  {n_workers} 个工作进程并行计算 {len(to_simulate)} 个个体耗时 "
+                      f"{time.perf_counter() - parallel_start_time:.2f} 秒")
+                if pool_broken:
+                    print("  警告: 有工作进程超时未返回，重建进程池。")
+                    pool.terminate()
+                    pool = create_worker_pool(n_workers)
+
+            generation_results = {}  # 本代已计算的基因 -> calculate_fitness 的返回值和来源 (含失败的评估)
+            surrogate_errors = []  # 本代真实模拟值与代理模型预测值之差
+            for i in range(population_size):
+                key = cache_keys[i]
+                ind = {"genes": genes_to_dict(population_genes[i])}
+                if worker_outputs[i]:
+                    print(worker_outputs[i], end="")
+                eval_source = backend
+                if USE_FITNESS_CACHE and key in generation_results:
+                    # 本代中重复的基因 (如相同的两个子代): 直接复用，不再打印评估信息
+                    fitness_val, eta_t_val, eta_e_val, cost_c_val, _, eval_source = generation_results[key]
+                    eval_source = "surrogate" if eval_source == "surrogate" else "cache"
+                    eval_time_s = 0.0
+                elif i in screened_out:
+                    fitness_val, eta_t_val, eta_e_val, cost_c_val = surrogate_predictions[i], None, None, None
+                    eval_time_s, eval_source = 0.0, "surrogate"
+                    print(f"  Gen {generation + 1}, Ind {i + 1}: 代理模型预测 Fitness={fitness_val:.4f} (未模拟)")
+                elif key in fitness_cache:
+                    fitness_val, eta_t_val, eta_e_val, cost_c_val, _ = calculate_fitness(
+                        ind, generation + 1, i + 1, backend=backend, sim_results=fitness_cache[key], eval_time_s=0.0)
+                    eval_time_s, eval_source = 0.0, "cache"
+                else:
+                    # calculate_fitness now returns (fitness, eta_t, eta_e, cost_c, eval_time_s)
+                    fitness_val, eta_t_val, eta_e_val, cost_c_val, eval_time_s = calculate_fitness(
+                        ind, generation + 1, i + 1, backend=backend, sim_results=precomputed_results[i],
+                        eval_time_s=precomputed_times[i])
+                    n_simulated += 1
+                    sim_metrics = {"thermal_efficiency": eta_t_val, "exergy_efficiency": eta_e_val, "cost": cost_c_val}
+                    if i in surrogate_predictions and fitness_val > -float('inf'):
+                        surrogate_errors.append(fitness_val - surrogate_predictions[i])
+                    if USE_SURROGATE and fitness_from_metrics(sim_metrics) is not None:
+                        surrogate_data[key] = sim_metrics
+                    # 失败的评估不写入缓存 (可能是超时等偶发原因)，下次出现时重新模拟
+                    if USE_FITNESS_CACHE and (eta_t_val is not None or eta_e_val is not None):
+                        fitness_cache[key] = sim_metrics
+                        append_fitness_cache(cache_writer, key, fitness_cache[key])
+                        cache_file.flush()
+                if eval_source == "cache":
+                    n_cache_saved += 1
+                elif eval_source == "surrogate":
+                    n_surrogate_screened += 1
+                generation_results[key] = (fitness_val, eta_t_val, eta_e_val, cost_c_val, eval_time_s, eval_source)
+                population_fitness[i] = fitness_val
+                population_simulated[i] = eval_source != "surrogate"
+                population_metrics[i] = [value if value is not None else np.nan
+                                         for value in (eta_t_val, eta_e_val, cost_c_val)]
 
                 genes = ind["genes"]
                 log_writer.writerow([
                     generation + 1, i + 1,
                     f"{genes[VAR_NAMES[0]]:.4f}", f"{genes[VAR_NAMES[1]]:.4f}",
                     f"{genes[VAR_NAMES[2]]:.4f}", f"{genes[VAR_NAMES[3]]:.4f}",
-                    f"{ind['fitness']:.6f}",
-                    f"{ind['metrics']['eta_t']:.6f}" if ind['metrics']['eta_t'] is not None else "N/A",
-                    f"{ind['metrics']['eta_e']:.6f}" if ind['metrics']['eta_e'] is not None else "N/A",
-                    f"{ind['metrics']['cost_c']:.4f}" if ind['metrics']['cost_c'] is not None else "N/A"
+                    f"{fitness_val:.6f}",
+                    f"{eta_t_val:.6f}" if eta_t_val is not None else "N/A",
+                    f"{eta_e_val:.6f}" if eta_e_val is not None else "N/A",
+                    f"{cost_c_val:.4f}" if cost_c_val is not None else "N/A",
+                    eval_source, f"{eval_time_s:.3f}"
                 ])
                 log_file.flush()
 
-                if best_overall_individual is None or ind["fitness"] > best_overall_individual["fitness"]:
-                    best_overall_individual = ind.copy()  # Deep copy
+                # 代理模型的预测值只参与选择，不能成为历史最优
+                if eval_source != "surrogate" and (
+                        best_overall_individual is None or fitness_val > best_overall_individual["fitness"]):
+                    best_overall_individual = individual_from_row(
+                        population_genes[i], fitness_val, population_metrics[i])
                     print(
                         f"  ** 新的最优个体 (第 {generation + 1} 代, 个体 {i + 1}): Fitness = {best_overall_individual['fitness']:.4f} **")
                     print(f"     基因: {best_overall_individual['genes']}")
@@ -352,11 +1120,27 @@ def run_genetic_algorithm():
                     best_overall_individual['metrics']['eta_e'] is not None else "N/A"
                     print(f"     对应指标: η_t={eta_t_disp}, η_e={eta_e_disp}")
 
-            population.sort(key=lambda ind: ind["fitness"], reverse=True)
-            if not population: print("错误: 种群为空!"); break
-
-            current_best_in_gen = population[0]
-            print(f"第 {generation + 1} 代最优: Fitness = {current_best_in_gen['fitness']:.4f}")
+            if surrogate is not None:
+                abs_errors = np.abs(surrogate_errors)
+                mean_abs_error = float(abs_errors.mean()) if len(abs_errors) else float('nan')
+                max_abs_error = float(abs_errors.max()) if len(abs_errors) else float('nan')
+                print(f"  代理模型误差: 平均 {mean_abs_error:.5f}, 最大 {max_abs_error:.5f} "
+                      f"(基于 {len(abs_errors)} 个真实模拟)")
+                surrogate_log_writer.writerow([generation + 1, surrogate[1].n,
+                                               len(surrogate_predictions), len(to_simulate), len(screened_out),
+                                               f"{mean_abs_error:.6f}", f"{max_abs_error:.6f}"])
+                surrogate_log_file.flush()
+
+            # 按适应度降序排列 (稳定排序，与 list.sort(reverse=True) 的并列次序一致)
+            order = np.argsort(-population_fitness, kind="stable")
+            population_genes, population_fitness, population_metrics, population_simulated = (
+                population_genes[order], population_fitness[order], population_metrics[order],
+                population_simulated[order])
+            if population_size == 0: print("错误: 种群为空!"); break
+
+            # 本代最优和精英只取有真实模拟结果的个体
+            print(f"第 {generation + 1} 代最优: Fitness = "
+                  f"{population_fitness[elite_index(population_fitness, population_simulated)]:.4f}")
             # ... (rest of generation summary prints unchanged) ...
             if best_overall_individual:
                 print(f"历史最优: Fitness = {best_overall_individual['fitness']:.4f}")
@@ -368,26 +1152,61 @@ def run_genetic_algorithm():
                 best_overall_individual['metrics']['eta_e'] is not None else "N/A"
                 print(f"  对应指标: η_t={best_eta_t_str}, η_e={best_eta_e_str}")
 
-            next_population = [population[0].copy()] if population else []  # Elitism
-
-            while len(next_population) < POPULATION_SIZE:
-                parent1 = tournament_selection(population)
-                parent2 = tournament_selection(population)
-                child1, child2 = parent1.copy(), parent2.copy()
-                if random.random() < CROSSOVER_PROBABILITY:
-                    child1_co, child2_co = crossover(parent1, parent2)
-                    child1, child2 = child1_co, child2_co
-                next_population.append(mutate(child1))
-                if len(next_population) < POPULATION_SIZE:
-                    next_population.append(mutate(child2))
-            population = next_population
+            # Elitism + 向量化的锦标赛选择、交叉、变异
+            population_genes = breed_next_population(population_genes, population_fitness, rng, population_simulated)
             gen_end_time = time.time()
             print(f"第 {generation + 1} 代耗时: {gen_end_time - gen_start_time:.2f} 秒")
 
+            if USE_CHECKPOINT and ((generation + 1) % CHECKPOINT_INTERVAL == 0 or generation + 1 == MAX_GENERATIONS):
+                # 此时日志已写完本代，population_genes 是下一代待评估的种群，随机数状态与之对应
+                save_checkpoint(CHECKPOINT_FILE, {
+                    "version": CHECKPOINT_VERSION,
+                    "generation": generation + 1,
+                    "population_genes": population_genes,
+                    "best_overall_individual": best_overall_individual,
+                    "random_state": random.getstate(),
+                    "rng_state": rng.bit_generator.state,
+                    "fitness_cache": fitness_cache,
+                    "surrogate_data": surrogate_data,
+                    "counters": (n_simulated, n_cache_saved, n_surrogate_screened),
+                    "worker_cache_stats": worker_cache_stats,
+                    "warm_start_cache": full_cycle_simulator.export_warm_start_cache()
+                    if full_cycle_simulator.WARM_START_CACHE_ENABLED else None,
+                    "scbc_stage_cache": full_cycle_simulator.export_scbc_stage_cache()
+                    if full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED else None,
+                    "elapsed_s": time.time() - start_time,
+                    "settings": {"population_size": POPULATION_SIZE, "backend": backend,
+                                 "model_fingerprint": fingerprint}
+                })
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+
     # ... (Final print section for best_overall_individual - unchanged, but will now benefit from metrics stored in best_overall_individual) ...
     total_end_time = time.time()
     print("\n--- 遗传算法结束 ---")
     print(f"总耗时: {total_end_time - start_time:.2f} 秒")
+    if pool is not None:
+        cache_stats, warm_start_stats = sum_worker_cache_stats(worker_cache_stats)
+    else:
+        cache_stats = state_point_calculator.get_property_cache_stats() \
+            if state_point_calculator.PROPERTY_CACHE_ENABLED else None
+        warm_start_stats = full_cycle_simulator.get_warm_start_cache_stats() \
+            if full_cycle_simulator.WARM_START_CACHE_ENABLED else None
+    if cache_stats is not None:
+        print(f"物性缓存: 命中 {cache_stats['hits']} 次, 未命中 {cache_stats['misses']} 次, "
+              f"命中率 {cache_stats['hit_rate'] * 100:.1f}%, 淘汰 {cache_stats['evictions']} 条")
+    if warm_start_stats is not None:
+        print(f"热启动: 命中 {warm_start_stats['hits']} 次, 未命中 {warm_start_stats['misses']} 次")
+    if pool is None and full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED:
+        scbc_stage_stats = full_cycle_simulator.get_scbc_stage_cache_stats()
+        print(f"SCBC子循环缓存: 命中 {scbc_stage_stats['hits']} 次, 未命中 {scbc_stage_stats['misses']} 次")
+    if USE_SURROGATE:
+        print(f"代理模型: {n_surrogate_screened} 个个体仅用预测值, 未做真实模拟")
+    if USE_FITNESS_CACHE:
+        print(f"适应度缓存: 实际模拟 {n_simulated} 次, 节省 {n_cache_saved} 次评估 "
+              f"({n_cache_saved / max(1, n_simulated + n_cache_saved) * 100:.1f}%)")
 
     if best_overall_individual:
         print("\n找到的最优个体:")
@@ -422,6 +1241,249 @@ def run_genetic_algorithm():
     return best_overall_individual
 
 
+def run_steady_state_ga(n_workers=None, max_evaluations=None, backend=None):
+    """
+    异步稳态遗传算法: 在途任务始终保持 n_workers * STEADY_STATE_TASKS_PER_WORKER 个，
+    任一评估完成就把结果并入档案 (档案未满时直接加入，满后替换更差的最差个体)，
+    并立即从档案中锦标赛选择、交叉、变异出一个新后代派发，慢个体不会拖住其他工作进程。
+    前 POPULATION_SIZE 个候选为随机个体; 总评估次数默认与代际 GA 相同 (POPULATION_SIZE * MAX_GENERATIONS)。
+    日志按完成顺序写入 ga_optimization_log.csv (Generation 为按评估次数折算的等效代数)，
+    每 POPULATION_SIZE 次评估在 STEADY_STATE_TIMING_FILE 中记录一次工作进程忙碌时间占比 (CPU 利用率)。
+    与 evaluate_population_parallel 一样，派发后超过 EVAL_TIMEOUT_S * (STEADY_STATE_TASKS_PER_WORKER + 1) 秒
+    仍未返回的任务 (卡在 C 扩展内、SIGALRM 无法打断) 记为无效，重建进程池并重新派发其余在途任务。
+    n_workers == 1 时不建进程池，在主进程中逐个评估 (在途任务上限为 1，物性缓存和 SCBC 子循环缓存在主进程中开启，
+    结束后关闭由这里开启的缓存; 不使用兜底超时)。
+    只支持 "inprocess" 后端 (subprocess/batch 后端无法逐个异步派发)，其他后端抛出 ValueError。
+    使用适应度缓存; 代理模型和检查点只在代际 GA (run_genetic_algorithm) 中支持。
+    """
+    backend = backend or FITNESS_BACKEND
+    if backend != "inprocess":
+        raise ValueError(f"异步稳态 GA 只支持 inprocess 后端 (当前: {backend})")
+    if n_workers is None:
+        n_workers = PARALLEL_WORKERS or default_worker_count()
+    if max_evaluations is None:
+        max_evaluations = POPULATION_SIZE * MAX_GENERATIONS
+    serial = n_workers == 1
+    max_in_flight = 1 if serial else n_workers * STEADY_STATE_TASKS_PER_WORKER
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    log_filename = os.path.join(OUTPUT_DIR, "ga_optimization_log.csv")
+    fingerprint = model_fingerprint(backend)
+    fitness_cache = load_fitness_cache(FITNESS_CACHE_FILE, fingerprint) if USE_FITNESS_CACHE else {}
+    archive = []
+    best_overall_individual = None
+    worker_cache_stats = {}
+    n_submitted, n_completed, n_cache_saved = 0, 0, 0
+    busy_time_s = 0.0
+    completed_tasks = queue.Queue()  # 工作进程结果回调把 (任务号, 结果或异常) 放入此队列
+    in_flight = {}  # 任务号 -> (个体, 兜底超时时刻)
+    task_ids = itertools.count(1)
+    # 在途任务可能排在同一工作进程的其他任务之后，兜底超时按排队的任务数放宽
+    task_timeout_s = EVAL_TIMEOUT_S * (STEADY_STATE_TASKS_PER_WORKER + 1) if EVAL_TIMEOUT_S and not serial else None
+    disable_on_exit = []  # 串行评估时由这里开启、结束后关闭的缓存
+
+    print(f"异步稳态遗传算法开始。档案大小: {POPULATION_SIZE}, 总评估次数: {max_evaluations}")
+    print(f"决策变量: {VAR_NAMES}, 边界: {VAR_BOUNDS}")
+    print(f"适应度权重: α(η_t)={ALPHA}, β(η_e)={BETA}, γ(C)={GAMMA}")
+    print(f"适应度计算后端: {backend}")
+    if serial:
+        print("串行评估: 在主进程中逐个评估")
+        if USE_PROPERTY_CACHE and not state_point_calculator.PROPERTY_CACHE_ENABLED:
+            state_point_calculator.enable_property_cache(PROPERTY_CACHE_SIZE)
+            disable_on_exit.append(state_point_calculator.disable_property_cache)
+        if USE_SCBC_STAGE_CACHE and not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED:
+            full_cycle_simulator.enable_scbc_stage_cache(SCBC_STAGE_CACHE_SIZE)
+            disable_on_exit.append(full_cycle_simulator.disable_scbc_stage_cache)
+    else:
+        print(f"并行评估: {n_workers} 个工作进程, 在途任务上限 {max_in_flight}")
+    print(f"详细日志将保存在: {log_filename}, 计时日志: {STEADY_STATE_TIMING_FILE}")
+
+    pool = None if serial else create_worker_pool(n_workers)
+    start_time = time.perf_counter()
+    write_log_fingerprint(log_filename, fingerprint)
+    last_report_time, last_report_busy_s = start_time, 0.0
+
+    with open(log_filename, 'w', encoding='utf-8', newline='') as log_file, \
+            open(STEADY_STATE_TIMING_FILE, 'w', encoding='utf-8', newline='') as timing_file, \
+            (open(FITNESS_CACHE_FILE, 'a', encoding='utf-8', newline='') if USE_FITNESS_CACHE
+             else contextlib.nullcontext()) as cache_file:
+        log_writer = csv.writer(log_file)
+        log_writer.writerow(["Generation", "Individual", "theta_5_c", "pr_scbc", "theta_w_c", "pr_orc",
+                             "Fitness", "ThermalEfficiency", "ExergyEfficiency", "Cost",
+                             "Backend", "EvalTime_s"])
+        timing_writer = csv.writer(timing_file)
+        timing_writer.writerow(["Evaluations", "Elapsed_s", "WorkerBusy_s", "Utilization", "WindowUtilization",
+                                "BestFitness"])
+        cache_writer = csv.writer(cache_file) if cache_file is not None else None
+        if cache_writer is not None and cache_file.tell() == 0:
+            write_fitness_cache_header(cache_writer, fingerprint)
+
+        def submit(ind):
+            """把个体派发给进程池，结果由回调放入 completed_tasks; 串行评估时当场评估并放入结果。"""
+            task_id = next(task_ids)
+            in_flight[task_id] = (ind, time.perf_counter() + task_timeout_s if task_timeout_s else None)
+            if pool is None:
+                output = io.StringIO()
+                eval_start_time = time.perf_counter()
+                with contextlib.redirect_stdout(output):
+                    sim_results = run_simulation_inprocess(ind["genes"])
+                completed_tasks.put((task_id, ([(sim_results, time.perf_counter() - eval_start_time,
+                                                 output.getvalue())], _worker_cache_stats())))
+                return
+            pool.apply_async(_evaluate_chunk, ([ind["genes"]], EVAL_TIMEOUT_S),
+                             callback=lambda result, task_id=task_id: completed_tasks.put((task_id, result)),
+                             error_callback=lambda error, task_id=task_id: completed_tasks.put((task_id, error)))
+
+        def record_result(ind, sim_results, eval_time_s, eval_source):
+            """计算适应度、并入档案、写日志，并更新历史最优。"""
+            nonlocal best_overall_individual, n_completed
+            generation_num, individual_num = n_completed // POPULATION_SIZE + 1, n_completed % POPULATION_SIZE + 1
+            fitness_val, eta_t_val, eta_e_val, cost_c_val, eval_time_s = calculate_fitness(
+                ind, generation_num, individual_num, sim_results=sim_results, eval_time_s=eval_time_s)
+            n_completed += 1
+            ind["fitness"] = fitness_val
+            ind["metrics"] = {"eta_t": eta_t_val, "eta_e": eta_e_val, "cost_c": cost_c_val}
+
+            if len(archive) < POPULATION_SIZE:
+                archive.append(ind)
+            else:
+                worst_index = min(range(len(archive)), key=lambda j: archive[j]["fitness"])
+                if fitness_val > archive[worst_index]["fitness"]:
+                    archive[worst_index] = ind
+
+            genes = ind["genes"]
+            log_writer.writerow([
+                generation_num, individual_num,
+                f"{genes[VAR_NAMES[0]]:.4f}", f"{genes[VAR_NAMES[1]]:.4f}",
+                f"{genes[VAR_NAMES[2]]:.4f}", f"{genes[VAR_NAMES[3]]:.4f}",
+                f"{fitness_val:.6f}",
+                f"{eta_t_val:.6f}" if eta_t_val is not None else "N/A",
+                f"{eta_e_val:.6f}" if eta_e_val is not None else "N/A",
+                f"{cost_c_val:.4f}" if cost_c_val is not None else "N/A",
+                eval_source, f"{eval_time_s:.3f}"
+            ])
+            log_file.flush()
+
+            if best_overall_individual is None or fitness_val > best_overall_individual["fitness"]:
+                best_overall_individual = ind
+                print(f"  ** 新的最优个体 (第 {n_completed} 次评估): Fitness = {fitness_val:.4f} **")
+                print(f"     基因: {genes}")
+
+        while n_completed < max_evaluations:
+            # 补满在途任务; 缓存命中的候选直接记录，不占用工作进程
+            while len(in_flight) < max_in_flight and n_submitted < max_evaluations:
+                if n_submitted < POPULATION_SIZE or len(archive) < TOURNAMENT_SIZE:
+                    ind = create_individual()
+                else:
+                    parent1 = tournament_selection(archive)
+                    parent2 = tournament_selection(archive)
+                    child = parent1.copy()
+                    if random.random() < CROSSOVER_PROBABILITY:
+                        child = crossover(parent1, parent2)[0]
+                    ind = mutate(child)
+                n_submitted += 1
+                key = fitness_cache_key(ind["genes"])
+                if USE_FITNESS_CACHE and key in fitness_cache:
+                    record_result(ind, fitness_cache[key], 0.0, "cache")
+                    n_cache_saved += 1
+                    continue
+                submit(ind)
+            if not in_flight:
+                break
+
+            deadlines = [deadline for _, deadline in in_flight.values() if deadline is not None]
+            try:
+                task_id, outcome = completed_tasks.get(
+                    timeout=max(0.0, min(deadlines) - time.perf_counter()) if deadlines else None)
+            except queue.Empty:
+                # 兜底超时: 超时的任务记为无效; 终止进程池 (也会中止其他在途任务)，重建后重新派发未超时的任务
+                now = time.perf_counter()
+                overdue = [task_id for task_id, (_, deadline) in in_flight.items()
+                           if deadline is not None and deadline <= now]
+                print(f"  警告: {len(overdue)} 个任务超时未返回 (超过 {task_timeout_s:.0f} 秒)，重建进程池。")
+                pool.terminate()
+                pool = create_worker_pool(n_workers)
+                unfinished = [ind for task_id, (ind, _) in in_flight.items() if task_id not in overdue]
+                for task_id in overdue:
+                    ind, _ = in_flight.pop(task_id)
+                    print("    错误: 工作进程评估超时，该个体记为无效。")
+                    busy_time_s += task_timeout_s
+                    record_result(ind, None, task_timeout_s, backend)
+                in_flight.clear()  # 旧进程池中的任务不会再返回; 之后收到的旧任务号直接忽略
+                for ind in unfinished:
+                    submit(ind)
+                continue
+            if task_id not in in_flight:
+                continue  # 重建进程池之前派发的任务
+            ind, _ = in_flight.pop(task_id)
+            if isinstance(outcome, BaseException):
+                sim_results, eval_time_s, output_text = None, 0.0, f"    工作进程评估时发生错误: {outcome}\n"
+            else:
+                chunk_results, (pid, property_stats, warm_start_stats) = outcome
+                sim_results, eval_time_s, output_text = chunk_results[0]
+                worker_cache_stats[pid] = (property_stats, warm_start_stats)
+            busy_time_s += eval_time_s
+            if output_text:
+                print(output_text, end="")
+            record_result(ind, sim_results, eval_time_s, backend)
+            # 失败的评估不写入缓存 (可能是超时等偶发原因)
+            if USE_FITNESS_CACHE and (ind["metrics"]["eta_t"] is not None or ind["metrics"]["eta_e"] is not None):
+                key = fitness_cache_key(ind["genes"])
+                fitness_cache[key] = {"thermal_efficiency": ind["metrics"]["eta_t"],
+                                      "exergy_efficiency": ind["metrics"]["eta_e"], "cost": ind["metrics"]["cost_c"]}
+                if cache_writer is not None:
+                    append_fitness_cache(cache_writer, key, fitness_cache[key])
+                    cache_file.flush()
+
+            if n_completed % POPULATION_SIZE == 0:
+                now = time.perf_counter()
+                utilization = busy_time_s / max(1e-9, (now - start_time) * n_workers)
+                window_utilization = (busy_time_s - last_report_busy_s) / max(1e-9, (now - last_report_time) * n_workers)
+                last_report_time, last_report_busy_s = now, busy_time_s
+                best_fitness = max(archive_ind["fitness"] for archive_ind in archive)
+                timing_writer.writerow([n_completed, f"{now - start_time:.3f}", f"{busy_time_s:.3f}",
+                                        f"{utilization:.4f}", f"{window_utilization:.4f}", f"{best_fitness:.6f}"])
+                timing_file.flush()
+                print(f"--- 已完成 {n_completed}/{max_evaluations} 次评估, 档案最优 Fitness = {best_fitness:.4f}, "
+                      f"CPU 利用率 {window_utilization * 100:.1f}% (累计 {utilization * 100:.1f}%) ---")
+
+    if pool is not None:
+        pool.close()
+        pool.join()
+    for disable_cache in disable_on_exit:
+        disable_cache()
+
+    total_time_s = time.perf_counter() - start_time
+    print("\n--- 异步稳态遗传算法结束 ---")
+    print(f"总耗时: {total_time_s:.2f} 秒, 工作进程忙碌时间占比 "
+          f"{busy_time_s / max(1e-9, total_time_s * n_workers) * 100:.1f}%")
+    cache_stats, warm_start_stats = sum_worker_cache_stats(worker_cache_stats)
+    if cache_stats is not None:
+        print(f"物性缓存: 命中 {cache_stats['hits']} 次, 未命中 {cache_stats['misses']} 次, "
+              f"命中率 {cache_stats['hit_rate'] * 100:.1f}%, 淘汰 {cache_stats['evictions']} 条")
+    if warm_start_stats is not None:
+        print(f"热启动: 命中 {warm_start_stats['hits']} 次, 未命中 {warm_start_stats['misses']} 次")
+    if USE_FITNESS_CACHE:
+        print(f"适应度缓存: 节省 {n_cache_saved} 次评估")
+
+    if best_overall_individual:
+        print("\n找到的最优个体:")
+        for var_name, value in best_overall_individual["genes"].items():
+            print(f"    {var_name}: {value:.4f}")
+        print(f"  适应度值: {best_overall_individual['fitness']:.6f}")
+    else:
+        print("未能找到最优个体。")
+    return best_overall_individual
+
+
 if __name__ == "__main__":
-    best_solution = run_genetic_algorithm()
+    parser = argparse.ArgumentParser(description="SCBC/ORC联合循环遗传算法优化。")
+    parser.add_argument("--resume", action="store_true", help=f"从检查点 {CHECKPOINT_FILE} 继续上一次中断的运行")
+    parser.add_argument("--steady-state", action="store_true",
+                        help="使用异步稳态遗传算法 (没有代际同步，适合评估耗时差异大的并行运行)")
+    args = parser.parse_args()
+    if args.steady_state:
+        best_solution = run_steady_state_ga()
+    else:
+        best_solution = run_genetic_algorithm(resume=args.resume)
 
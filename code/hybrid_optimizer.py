@@ -0,0 +1,354 @@
+# hybrid_optimizer.py
+# 混合优化: 遗传算法全局搜索 + 梯度/单纯形局部精修，以及可替代 run_genetic_algorithm 的 CMA-ES 优化器
+import os
+import csv
+import math
+import time
+import argparse
+import numpy as np
+import scipy.optimize
+
+import genetic_algorithm_optimizer as ga
+
+# --- Configuration ---
+# 局部精修
+LOCAL_METHODS = ("L-BFGS-B", "SLSQP", "Nelder-Mead")
+LOCAL_METHOD = "L-BFGS-B"
+LOCAL_MAX_ITERATIONS = 30
+# 精修和 CMA-ES 使用更严的回热迭代容差: 默认的 0.1 kJ/kg 会让适应度随迭代次数跳变约 1e-4，
+# 远大于最优点附近的有限差分增量，梯度会被求解器噪声淹没
+REFINE_PARAM_OVERRIDES = {"scbc_parameters": {"tol_scbc_h_kJ_kg": 1e-4}}
+FD_STEP = 1e-3  # 有限差分步长 (缩放坐标，各变量范围归一化到 [0, 1])
+MEMO_DECIMALS = 12  # DesignEvaluator 记忆化键的舍入位数 (缩放坐标)，只合并浮点误差级别的差异
+FAILED_OBJECTIVE = 0.0  # 模拟失败时的目标函数值 (目标为 -适应度，任何有效设计点都小于 0)
+
+# 混合模式中 GA 阶段的代数 (其余设置沿用 genetic_algorithm_optimizer)
+HYBRID_GA_GENERATIONS = 20
+
+# CMA-ES
+CMA_SIGMA0 = 0.2  # 初始步长 (缩放坐标)
+CMA_POPULATION_SIZE = None  # None: 4 + floor(3 ln n)
+CMA_MAX_EVALUATIONS = 600
+CMA_TOL_X = 1e-4  # 步长 × 最大主轴长度小于此值时停止 (缩放坐标)
+CMA_TOL_FITNESS = 1e-7  # 最近 CMA_STAGNATION_GENERATIONS 代的最优适应度极差小于此值时停止
+CMA_STAGNATION_GENERATIONS = 20
+CMA_BOUND_PENALTY = 1.0  # 越界样本按到边界距离的平方加罚 (样本本身截断到边界上评估)
+
+HYBRID_LOG_FILE = os.path.join(ga.OUTPUT_DIR, "hybrid_optimization_log.csv")
+
+
+def scale_genes(genes_matrix):
+    """物理量基因矩阵 [N, 4] (列按 ga.VAR_NAMES) -> 缩放坐标 [0, 1]。"""
+    lower, upper = ga.gene_bounds()
+    return (np.asarray(genes_matrix, dtype=float) - lower) / (upper - lower)
+
+
+def unscale_genes(x_scaled):
+    """缩放坐标 -> 物理量基因矩阵。"""
+    lower, upper = ga.gene_bounds()
+    return lower + np.asarray(x_scaled, dtype=float) * (upper - lower)
+
+
+class DesignEvaluator:
+    """
+    设计点评估器: 把缩放坐标下的一批设计点映射为适应度。
+    - 按缩放坐标 (舍入到 MEMO_DECIMALS 位小数) 记忆化，同一设计点只模拟一次。不使用 ga.fitness_cache_key 的量化:
+      其温度步长 0.01 °C 与有限差分扰动 (FD_STEP 对应约 0.03 °C) 同一量级，会把扰动点并到相邻网格上
+    - n_workers > 1 时每批设计点用 ga 的进程池并行计算 (有限差分的各个扰动点、CMA-ES 的一代样本)
+    - 每次真实模拟都写入评估日志，n_simulations 记录真实模拟次数
+    """
+
+    def __init__(self, n_workers=None, param_overrides=None, log_writer=None, stage=""):
+        self.n_workers = n_workers if n_workers is not None else (ga.PARALLEL_WORKERS or ga.default_worker_count())
+        self.param_overrides = param_overrides
+        self.log_writer = log_writer
+        self.stage = stage
+        self.memo = {}  # 记忆化键 (memo_keys) -> (适应度, 模拟指标字典)
+        self.n_simulations = 0
+        self.pool = ga.create_worker_pool(self.n_workers) if self.n_workers > 1 else None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    @staticmethod
+    def memo_keys(x_scaled):
+        """每个设计点的记忆化键: 截断到 [0, 1] 并舍入后的缩放坐标元组。"""
+        x_scaled = np.round(np.clip(np.atleast_2d(x_scaled), 0.0, 1.0), MEMO_DECIMALS)
+        return [tuple(row) for row in x_scaled.tolist()]
+
+    def evaluate(self, x_scaled):
+        """返回 [N] 适应度数组 (失败为 -inf)。"""
+        genes_matrix = unscale_genes(np.clip(np.atleast_2d(x_scaled), 0.0, 1.0))
+        keys = self.memo_keys(x_scaled)
+        new_rows, seen = [], set()
+        for i, key in enumerate(keys):
+            if key not in self.memo and key not in seen:
+                seen.add(key)
+                new_rows.append(i)
+
+        individuals = [{"genes": ga.genes_to_dict(genes_matrix[i])} for i in new_rows]
+        if self.pool is not None and len(individuals) > 1:
+            parallel_results, _, pool_broken = ga.evaluate_population_parallel(
+                individuals, self.pool, self.n_workers, chunk_size=1, timeout_s=ga.EVAL_TIMEOUT_S,
+                param_overrides=self.param_overrides)
+            if pool_broken:
+                self.pool.terminate()
+                self.pool = ga.create_worker_pool(self.n_workers)
+            evaluations = [(sim_results, eval_time_s) for sim_results, eval_time_s, _ in parallel_results]
+        else:
+            evaluations = []
+            for ind in individuals:
+                eval_start_time = time.perf_counter()
+                sim_results = ga.run_simulation_inprocess(ind["genes"], self.param_overrides)
+                evaluations.append((sim_results, time.perf_counter() - eval_start_time))
+
+        for i, (sim_results, eval_time_s) in zip(new_rows, evaluations):
+            fitness = ga.fitness_from_metrics(sim_results) if sim_results is not None else None
+            fitness = fitness if fitness is not None else -float('inf')
+            self.memo[keys[i]] = (fitness, sim_results)
+            self.n_simulations += 1
+            if self.log_writer is not None:
+                self.log_writer.writerow(
+                    [self.stage, self.n_simulations] + [f"{v:.6f}" for v in genes_matrix[i]] +
+                    [f"{fitness:.8f}"] +
+                    [f"{sim_results[metric]:.8f}" if sim_results and sim_results[metric] is not None else "N/A"
+                     for metric in ("thermal_efficiency", "exergy_efficiency")] +
+                    [f"{eval_time_s:.3f}"])
+        return np.array([self.memo[key][0] for key in keys])
+
+    def objective(self, x_scaled):
+        """最小化用的目标函数 -适应度 (失败时为 FAILED_OBJECTIVE)。"""
+        fitness = self.evaluate(x_scaled)[0]
+        return -fitness if np.isfinite(fitness) else FAILED_OBJECTIVE
+
+    def objective_and_gradient(self, x_scaled):
+        """
+        目标函数和前向差分梯度: 中心点与 4 个扰动点作为一批并行计算。
+        扰动会越过上界的分量改用后向差分 (最优点常落在边界上)。
+        """
+        x_scaled = np.clip(np.asarray(x_scaled, dtype=float), 0.0, 1.0)
+        steps = np.where(x_scaled + FD_STEP > 1.0, -FD_STEP, FD_STEP)
+        points = np.vstack([x_scaled, x_scaled + np.diag(steps)])
+        fitness = self.evaluate(points)
+        objective = np.where(np.isfinite(fitness), -fitness, FAILED_OBJECTIVE)
+        return objective[0], (objective[1:] - objective[0]) / steps
+
+    def simulation_results(self, x_scaled):
+        """返回每个设计点的模拟指标字典列表 (模拟失败为 None)，未评估过的点先评估。"""
+        self.evaluate(x_scaled)
+        return [self.memo[key][1] for key in self.memo_keys(x_scaled)]
+
+    def result(self, x_scaled):
+        """返回与 ga.run_genetic_algorithm 相同格式的个体字典。"""
+        self.evaluate(x_scaled)
+        genes_matrix = unscale_genes(np.clip(np.atleast_2d(x_scaled), 0.0, 1.0))
+        fitness, sim_results = self.memo[self.memo_keys(x_scaled)[0]]
+        sim_results = sim_results or {}
+        return {
+            "genes": ga.genes_to_dict(genes_matrix[0]),
+            "fitness": fitness,
+            "metrics": {"eta_t": sim_results.get("thermal_efficiency"),
+                        "eta_e": sim_results.get("exergy_efficiency"),
+                        "cost_c": sim_results.get("cost")}
+        }
+
+
+def open_evaluation_log(log_filename, mode='w'):
+    """打开 (或追加) 逐次模拟的评估日志，新文件先写表头; 返回 (文件对象, csv.writer)。"""
+    log_file = open(log_filename, mode, encoding='utf-8', newline='')
+    log_writer = csv.writer(log_file)
+    if log_file.tell() == 0:
+        log_writer.writerow(["Stage", "Simulation"] + ga.VAR_NAMES +
+                            ["Fitness", "ThermalEfficiency", "ExergyEfficiency", "EvalTime_s"])
+    return log_file, log_writer
+
+
+def _print_result(title, best, n_simulations):
+    print(f"\n{title}: Fitness = {best['fitness']:.6f}, 真实模拟 {n_simulations} 次")
+    for var_name, value in best["genes"].items():
+        print(f"    {var_name}: {value:.4f}")
+    eta_t, eta_e = best["metrics"]["eta_t"], best["metrics"]["eta_e"]
+    print(f"  总热效率 η_t: {eta_t * 100:.3f}%" if eta_t is not None else "  总热效率 η_t: N/A")
+    print(f"  总㶲效率 η_e: {eta_e * 100:.3f}%" if eta_e is not None else "  总㶲效率 η_e: N/A")
+
+
+def refine_solution(start_genes, method=None, n_workers=None, max_iterations=None, log_filename=None):
+    """
+    从 start_genes ({变量名: 值}) 出发做带边界约束的局部精修。
+    method 为 "L-BFGS-B"、"SLSQP" (梯度由 DesignEvaluator 并行前向差分给出) 或 "Nelder-Mead" (无梯度)。
+    模拟使用 REFINE_PARAM_OVERRIDES 收紧的容差，起点也按该容差重新评估，
+    因此返回的适应度与 GA 日志中默认容差下的值可能略有差别。
+    返回个体字典 (格式同 ga.run_genetic_algorithm)，另含 n_simulations、method、start_fitness 和 message。
+    """
+    method = method or LOCAL_METHOD
+    if method not in LOCAL_METHODS:
+        raise ValueError(f"未知的局部优化方法: {method} (可选: {LOCAL_METHODS})")
+    max_iterations = max_iterations or LOCAL_MAX_ITERATIONS
+    log_file, log_writer = open_evaluation_log(log_filename or HYBRID_LOG_FILE, 'a')
+    evaluator = DesignEvaluator(n_workers, REFINE_PARAM_OVERRIDES, log_writer, stage=f"refine:{method}")
+    try:
+        x0 = scale_genes([[start_genes[var_name] for var_name in ga.VAR_NAMES]])[0]
+        start_fitness = evaluator.evaluate(x0)[0]
+        print(f"局部精修 ({method}) 起点 Fitness = {start_fitness:.6f} (容差 {REFINE_PARAM_OVERRIDES})")
+        bounds = [(0.0, 1.0)] * len(ga.VAR_NAMES)
+        if method == "Nelder-Mead":
+            solution = scipy.optimize.minimize(
+                evaluator.objective, x0, method=method, bounds=bounds,
+                options={"maxiter": max_iterations * len(ga.VAR_NAMES), "xatol": FD_STEP, "fatol": 1e-8,
+                         "initial_simplex": np.vstack([x0, x0 + np.diag(np.where(x0 + 0.05 > 1.0, -0.05, 0.05))])})
+        else:
+            options = {"maxiter": max_iterations}
+            options.update({"ftol": 1e-10, "gtol": 1e-8} if method == "L-BFGS-B" else {"ftol": 1e-10})
+            solution = scipy.optimize.minimize(evaluator.objective_and_gradient, x0, jac=True, method=method,
+                                               bounds=bounds, options=options)
+        best = evaluator.result(solution.x)
+        if best["fitness"] < start_fitness:  # 未找到更好的点时保留起点
+            best = evaluator.result(x0)
+        best.update(n_simulations=evaluator.n_simulations, method=method, start_fitness=start_fitness,
+                    message=str(solution.message))
+    finally:
+        evaluator.close()
+        log_file.close()
+    _print_result(f"局部精修 ({method}) 结果", best, best["n_simulations"])
+    return best
+
+
+def count_ga_simulations(log_filename=None):
+    """统计 GA 日志中真实模拟的行数 (不含缓存命中和代理模型预测)。"""
+    log_filename = log_filename or os.path.join(ga.OUTPUT_DIR, "ga_optimization_log.csv")
+    with open(log_filename, 'r', encoding='utf-8', newline='') as log_file:
+        return sum(1 for row in csv.DictReader(log_file) if row.get("Backend") in ga.FITNESS_BACKENDS)
+
+
+def run_hybrid_optimization(ga_generations=None, method=None, n_workers=None):
+    """
+    先运行 ga_generations 代遗传算法 (全局搜索)，再从 GA 最优个体出发做局部精修。
+    返回精修后的个体字典，n_simulations 为 GA 与精修阶段真实模拟次数之和。
+    """
+    ga_generations = ga_generations or HYBRID_GA_GENERATIONS
+    saved_max_generations = ga.MAX_GENERATIONS
+    ga.MAX_GENERATIONS = ga_generations
+    try:
+        ga_best = ga.run_genetic_algorithm(n_workers=n_workers)
+    finally:
+        ga.MAX_GENERATIONS = saved_max_generations
+    if ga_best is None:
+        print("GA 阶段未找到可行个体，跳过局部精修。")
+        return None
+    n_ga_simulations = count_ga_simulations()
+
+    log_file, _ = open_evaluation_log(HYBRID_LOG_FILE, 'w')  # 新建 (清空) 混合优化日志
+    log_file.close()
+    best = refine_solution(ga_best["genes"], method=method, n_workers=n_workers)
+    best["n_ga_simulations"] = n_ga_simulations
+    best["n_simulations"] += n_ga_simulations
+    print(f"\n混合优化: GA {ga_generations} 代 ({n_ga_simulations} 次模拟) + 局部精修 "
+          f"({best['n_simulations'] - n_ga_simulations} 次模拟), 适应度 {best['start_fitness']:.6f} -> "
+          f"{best['fitness']:.6f}")
+    return best
+
+
+def run_cma_es(n_workers=None, max_evaluations=None, sigma0=None, population_size=None, x0=None, seed=None):
+    """
+    CMA-ES 优化器 (可替代 ga.run_genetic_algorithm)，在缩放坐标 [0, 1]^4 中搜索最大适应度。
+    每代 λ 个样本作为一批并行评估; 越界样本截断到边界上评估，并按越界距离的平方加罚参与排序。
+    x0 为起点基因字典 (默认取范围中点)，seed 为 numpy 随机种子。
+    返回最优个体字典 (格式同 ga.run_genetic_algorithm)，另含 n_simulations。
+    """
+    max_evaluations = max_evaluations or CMA_MAX_EVALUATIONS
+    sigma = sigma0 or CMA_SIGMA0
+    n = len(ga.VAR_NAMES)
+    lam = population_size or CMA_POPULATION_SIZE or 4 + int(3 * math.log(n))
+    mu = lam // 2
+    weights = math.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mueff = 1.0 / np.sum(weights ** 2)
+    # 策略参数 (Hansen, The CMA Evolution Strategy: A Tutorial 中的默认值)
+    cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+    cs = (mueff + 2) / (n + mueff + 5)
+    c1 = 2 / ((n + 1.3) ** 2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+    damps = 1 + 2 * max(0.0, math.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+    chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+    rng = np.random.default_rng(seed)
+    mean = scale_genes([[x0[var_name] for var_name in ga.VAR_NAMES]])[0] if x0 else np.full(n, 0.5)
+    pc, ps = np.zeros(n), np.zeros(n)
+    C = np.eye(n)
+    best_x, best_fitness = mean.copy(), -float('inf')
+    best_history = []
+
+    log_file, log_writer = open_evaluation_log(HYBRID_LOG_FILE, 'w')
+    evaluator = DesignEvaluator(n_workers, REFINE_PARAM_OVERRIDES, log_writer, stage="cma-es")
+    print(f"CMA-ES 开始。λ = {lam}, μ = {mu}, σ0 = {sigma}, 最大模拟次数 {max_evaluations}, "
+          f"工作进程 {evaluator.n_workers}")
+    start_time = time.time()
+    generation = 0
+    try:
+        while evaluator.n_simulations < max_evaluations:
+            generation += 1
+            eigenvalues, B = np.linalg.eigh(C)
+            D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+            z = rng.standard_normal((lam, n))
+            y = z @ (B * D).T
+            x = mean + sigma * y
+            x_clipped = np.clip(x, 0.0, 1.0)
+            fitness = evaluator.evaluate(x_clipped)
+            penalty = CMA_BOUND_PENALTY * np.sum((x - x_clipped) ** 2, axis=1)
+            objective = np.where(np.isfinite(fitness), -fitness, FAILED_OBJECTIVE) + penalty
+            order = np.argsort(objective, kind="stable")
+
+            generation_best = int(np.argmax(fitness))
+            if fitness[generation_best] > best_fitness:
+                best_fitness, best_x = float(fitness[generation_best]), x_clipped[generation_best].copy()
+            best_history.append(best_fitness)
+
+            # 均值、进化路径、协方差和步长更新
+            y_selected = y[order[:mu]]
+            y_weighted = weights @ y_selected
+            mean = mean + sigma * y_weighted
+            C_inv_sqrt = B @ np.diag(1 / D) @ B.T
+            ps = (1 - cs) * ps + math.sqrt(cs * (2 - cs) * mueff) * (C_inv_sqrt @ y_weighted)
+            hsig = np.linalg.norm(ps) / math.sqrt(1 - (1 - cs) ** (2 * generation)) / chi_n < 1.4 + 2 / (n + 1)
+            pc = (1 - cc) * pc + hsig * math.sqrt(cc * (2 - cc) * mueff) * y_weighted
+            C = ((1 - c1 - cmu) * C + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C) +
+                 cmu * (y_selected.T * weights) @ y_selected)
+            C = (C + C.T) / 2
+            sigma *= math.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+
+            print(f"  第 {generation} 代: 本代最优 {fitness[generation_best]:.6f}, 历史最优 {best_fitness:.6f}, "
+                  f"σ = {sigma:.4g}, 累计模拟 {evaluator.n_simulations} 次")
+            if sigma * D.max() < CMA_TOL_X:
+                print("  步长已小于 CMA_TOL_X，停止。")
+                break
+            if len(best_history) > CMA_STAGNATION_GENERATIONS and \
+                    best_history[-1] - best_history[-1 - CMA_STAGNATION_GENERATIONS] < CMA_TOL_FITNESS:
+                print(f"  最近 {CMA_STAGNATION_GENERATIONS} 代最优适应度改善小于 CMA_TOL_FITNESS，停止。")
+                break
+        best = evaluator.result(best_x)
+        best["n_simulations"] = evaluator.n_simulations
+    finally:
+        evaluator.close()
+        log_file.close()
+    print(f"CMA-ES 结束，耗时 {time.time() - start_time:.2f} 秒。")
+    _print_result("CMA-ES 最优个体", best, best["n_simulations"])
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SCBC/ORC联合循环混合优化 (GA + 局部精修) 或 CMA-ES 优化。")
+    parser.add_argument("--mode", choices=("hybrid", "cma-es"), default="hybrid",
+                        help="hybrid: GA 后接局部精修; cma-es: 独立的 CMA-ES 优化")
+    parser.add_argument("--method", choices=LOCAL_METHODS, default=LOCAL_METHOD, help="局部精修方法")
+    parser.add_argument("--ga-generations", type=int, default=HYBRID_GA_GENERATIONS, help="混合模式中 GA 阶段的代数")
+    parser.add_argument("--max-evaluations", type=int, default=CMA_MAX_EVALUATIONS, help="CMA-ES 的最大模拟次数")
+    parser.add_argument("--workers", type=int, default=None, help="并行工作进程数 (默认取 CPU 亲和性掩码)")
+    parser.add_argument("--seed", type=int, default=None, help="CMA-ES 随机种子")
+    args = parser.parse_args()
+    if args.mode == "hybrid":
+        best_solution = run_hybrid_optimization(args.ga_generations, args.method, args.workers)
+    else:
+        best_solution = run_cma_es(args.workers, args.max_evaluations, seed=args.seed)
@@ -1,6 +1,6 @@
 import json
 import os
-from state_point_calculator import StatePoint, to_pascal, to_kelvin, T0_K
+from state_point_calculator import StatePoint, to_pascal, to_kelvin, get_reference_state
 
 def generate_cycle_parameters(new_t5_c, new_pr_scbc, new_pr_orc, new_theta_w_orc_c):
     """
@@ -72,7 +72,7 @@ def generate_cycle_parameters(new_t5_c, new_pr_scbc, new_pr_orc, new_theta_w_orc
             "orc": "R245fa"
         },
         "reference_conditions": {
-            "T0_C": T0_K - 273.15,
+            "T0_C": get_reference_state()[0] - 273.15,
             "P0_kPa": 101.325
         },
         "scbc_parameters": {
@@ -88,7 +88,9 @@ def generate_cycle_parameters(new_t5_c, new_pr_scbc, new_pr_orc, new_theta_w_orc
             "eta_H_HTR_effectiveness": 0.86,
             "eta_L_LTR_effectiveness": 0.86,
             "max_iter_scbc_main_loop": 20,
-            "tol_scbc_h_kJ_kg": 0.1
+            "tol_scbc_h_kJ_kg": 0.1,
+            "mass_flow_solve_mode": "per_kg",
+            "regen_accelerator": "wegstein"
         },
         "orc_parameters": {
             "P_eva_kPa_orc": P_eva_orc_kPa,
@@ -99,6 +101,7 @@ def generate_cycle_parameters(new_t5_c, new_pr_scbc, new_pr_orc, new_theta_w_orc
             "eta_PO_pump": 0.75,
             "max_iter_orc_mdot": 40,
             "tol_orc_T_approach_K": 0.1,
+            "orc_mdot_solve_mode": "direct",
             "m_dot_orc_initial_guess_kg_s": 100.0
         },
         "heat_exchangers_common": {
@@ -0,0 +1,276 @@
+# nsga2_optimizer.py
+# 多目标优化 (NSGA-II): 一次运行得到 η_t / η_e (/成本) 的 Pareto 前沿并存档，
+# 之后任意权重下的最优设计直接从存档中查询，无需重新模拟
+import os
+import csv
+import time
+import argparse
+import numpy as np
+
+import genetic_algorithm_optimizer as ga
+import hybrid_optimizer
+
+# --- Configuration ---
+NSGA2_POPULATION_SIZE = 60
+NSGA2_GENERATIONS = 50
+# 目标: 模拟指标名 -> 方向 (+1 最大化, -1 最小化)。成本模型实现后可把 "cost" 加入 NSGA2_OBJECTIVES
+OBJECTIVE_SENSES = {
+    "thermal_efficiency": 1.0,
+    "exergy_efficiency": 1.0,
+    "cost": -1.0
+}
+NSGA2_OBJECTIVES = ["thermal_efficiency", "exergy_efficiency"]
+PARETO_ARCHIVE_MAX_SIZE = 1000  # 存档超过此规模时按拥挤距离剔除最密集的点
+
+METRIC_COLUMNS = {  # 模拟指标名 -> 存档 CSV 列名 (与 ga_optimization_log.csv 一致)
+    "thermal_efficiency": "ThermalEfficiency",
+    "exergy_efficiency": "ExergyEfficiency",
+    "cost": "Cost"
+}
+PARETO_ARCHIVE_FILE = os.path.join(ga.OUTPUT_DIR, "nsga2_pareto_archive.csv")
+NSGA2_LOG_FILE = os.path.join(ga.OUTPUT_DIR, "nsga2_evaluation_log.csv")
+
+
+def objective_matrix(sim_results_list, objectives=None):
+    """
+    模拟指标字典列表 -> [N, M] 目标矩阵，统一为越大越好 (最小化的目标取负)。
+    模拟失败或所需指标缺失的行为 -inf。
+    """
+    objectives = objectives or NSGA2_OBJECTIVES
+    values = np.full((len(sim_results_list), len(objectives)), -np.inf)
+    for i, sim_results in enumerate(sim_results_list):
+        if sim_results is None or any(sim_results.get(name) is None for name in objectives):
+            continue
+        values[i] = [OBJECTIVE_SENSES[name] * sim_results[name] for name in objectives]
+    return values
+
+
+def fast_non_dominated_sort(values):
+    """
+    快速非支配排序 (向量化): values 为 [N, M] 目标矩阵 (越大越好)，返回每行的前沿序号 (0 为 Pareto 前沿)。
+    支配关系矩阵一次广播算出，之后逐层剥离前沿，每层只做一次按列求和。
+    """
+    dominates = ((values[:, None, :] >= values[None, :, :]).all(axis=2) &
+                 (values[:, None, :] > values[None, :, :]).any(axis=2))
+    domination_count = dominates.sum(axis=0)
+    ranks = np.full(len(values), -1)
+    rank = 0
+    current = domination_count == 0
+    while current.any():
+        ranks[current] = rank
+        domination_count = domination_count - dominates[current].sum(axis=0)
+        domination_count[ranks >= 0] = -1  # 已分层的行不再参与
+        current = domination_count == 0
+        rank += 1
+    return ranks
+
+
+def crowding_distance(values, ranks):
+    """
+    拥挤距离 (向量化): 对每个目标按 (前沿序号, 目标值) 一次排序，各前沿内相邻点的归一化间距累加，
+    前沿两端为 inf。含 -inf 的行 (模拟失败) 拥挤距离为 0。
+    """
+    n_points, n_objectives = values.shape
+    feasible = np.isfinite(values).all(axis=1)
+    values = np.where(feasible[:, None], values, 0.0)
+    distance = np.zeros(n_points)
+    for k in range(n_objectives):
+        order = np.lexsort((values[:, k], ranks))
+        sorted_values, sorted_ranks = values[order, k], ranks[order]
+        front_start = np.r_[True, sorted_ranks[1:] != sorted_ranks[:-1]]
+        front_end = np.r_[sorted_ranks[1:] != sorted_ranks[:-1], True]
+        front_id = np.cumsum(front_start) - 1
+        span = sorted_values[front_end][front_id] - sorted_values[front_start][front_id]
+        span = np.where(span > 0, span, 1.0)
+        gap = (np.r_[sorted_values[1:], 0.0] - np.r_[0.0, sorted_values[:-1]]) / span
+        distance[order] += np.where(front_start | front_end, np.inf, gap)
+    distance[~feasible] = 0.0
+    return distance
+
+
+def rank_and_crowding(values):
+    """返回 (前沿序号, 拥挤距离)。"""
+    ranks = fast_non_dominated_sort(values)
+    return ranks, crowding_distance(values, ranks)
+
+
+def select_survivors(ranks, distance, n_survivors):
+    """按 (前沿序号升序, 拥挤距离降序) 选出 n_survivors 个下标。"""
+    return np.lexsort((-distance, ranks))[:n_survivors]
+
+
+def crowded_tournament_selection(ranks, distance, n_selections, rng):
+    """二元拥挤锦标赛: 前沿序号小者胜，同一前沿中拥挤距离大者胜，返回胜者下标数组。"""
+    a, b = rng.integers(0, len(ranks), size=(2, n_selections))
+    a_wins = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (distance[a] >= distance[b]))
+    return np.where(a_wins, a, b)
+
+
+def breed_offspring(genes, ranks, distance, n_offspring, rng):
+    """拥挤锦标赛选择父代，交叉和变异沿用 GA 的矩阵算子 (ga.crossover_matrix / ga.mutate_matrix)。"""
+    n_pairs = (n_offspring + 1) // 2
+    parents1 = genes[crowded_tournament_selection(ranks, distance, n_pairs, rng)]
+    parents2 = genes[crowded_tournament_selection(ranks, distance, n_pairs, rng)]
+    children1, children2 = ga.crossover_matrix(parents1, parents2, rng)
+    children = np.empty((2 * n_pairs, genes.shape[1]))
+    children[0::2], children[1::2] = children1, children2
+    return ga.mutate_matrix(children[:n_offspring], rng)
+
+
+def update_pareto_archive(archive_genes, archive_values, genes, values):
+    """
+    把新评估的点并入 Pareto 存档: 去掉重复 (按适应度缓存的量化键) 和被支配的点，
+    超过 PARETO_ARCHIVE_MAX_SIZE 时按拥挤距离保留分布最均匀的点。返回新的 (基因矩阵, 目标矩阵)。
+    """
+    genes = np.vstack([archive_genes, genes])
+    values = np.vstack([archive_values, values])
+    feasible = np.isfinite(values).all(axis=1)
+    genes, values = genes[feasible], values[feasible]
+    _, unique_rows = np.unique(np.array(ga.fitness_cache_keys(genes)), axis=0, return_index=True)
+    genes, values = genes[np.sort(unique_rows)], values[np.sort(unique_rows)]
+    on_front = fast_non_dominated_sort(values) == 0
+    genes, values = genes[on_front], values[on_front]
+    if len(genes) > PARETO_ARCHIVE_MAX_SIZE:
+        kept = np.sort(select_survivors(np.zeros(len(genes), dtype=int),
+                                        crowding_distance(values, np.zeros(len(genes), dtype=int)),
+                                        PARETO_ARCHIVE_MAX_SIZE))
+        genes, values = genes[kept], values[kept]
+    return genes, values
+
+
+def save_pareto_archive(archive_filename, archive_genes, archive_metrics):
+    """
+    把 Pareto 存档写入 CSV (先写临时文件再替换)，每行为基因和全部模拟指标 (不只是优化目标)，
+    按热效率升序排列。archive_metrics 为与基因行对应的模拟指标字典列表。
+    """
+    order = np.argsort([metrics["thermal_efficiency"] for metrics in archive_metrics], kind="stable")
+    temp_filename = archive_filename + ".tmp"
+    with open(temp_filename, 'w', encoding='utf-8', newline='') as archive_file:
+        archive_writer = csv.writer(archive_file)
+        archive_writer.writerow(ga.VAR_NAMES + list(METRIC_COLUMNS.values()))
+        for i in order:
+            archive_writer.writerow(
+                [f"{value:.10g}" for value in archive_genes[i]] +
+                [f"{archive_metrics[i][name]:.8f}" if archive_metrics[i].get(name) is not None else "N/A"
+                 for name in METRIC_COLUMNS])
+    os.replace(temp_filename, archive_filename)
+
+
+def load_pareto_archive(archive_filename=None):
+    """读取 Pareto 存档，返回 (基因矩阵 [N, 4], 模拟指标字典列表)。"""
+    archive_filename = archive_filename or PARETO_ARCHIVE_FILE
+    genes, metrics = [], []
+    with open(archive_filename, 'r', encoding='utf-8', newline='') as archive_file:
+        for row in csv.DictReader(archive_file):
+            genes.append([float(row[var_name]) for var_name in ga.VAR_NAMES])
+            metrics.append({name: float(row[column]) if row[column] not in ("", "N/A") else None
+                            for name, column in METRIC_COLUMNS.items()})
+    return np.array(genes).reshape(-1, len(ga.VAR_NAMES)), metrics
+
+
+def best_for_weights(alpha=None, beta=None, gamma=None, archive=None):
+    """
+    从 Pareto 存档中查询 alpha·η_t + beta·η_e − gamma·C 最大的设计 (不做任何模拟)，
+    权重默认取 ga.ALPHA/BETA/GAMMA。archive 为 load_pareto_archive() 的返回值，默认读取 PARETO_ARCHIVE_FILE。
+    返回与 ga.run_genetic_algorithm 相同格式的个体字典; 存档中没有可用点时返回 None。
+    只有 Pareto 前沿凸包上的点能成为某组非负权重的最优解，因此存档已包含所有权重下的答案
+    (精度受存档密度限制)。
+    """
+    alpha = ga.ALPHA if alpha is None else alpha
+    beta = ga.BETA if beta is None else beta
+    gamma = ga.GAMMA if gamma is None else gamma
+    archive_genes, archive_metrics = archive if archive is not None else load_pareto_archive()
+    best = None
+    for genes_row, metrics in zip(archive_genes, archive_metrics):
+        eta_t, eta_e, cost_c = metrics["thermal_efficiency"], metrics["exergy_efficiency"], metrics["cost"]
+        if (alpha > 0 and eta_t is None) or (beta > 0 and eta_e is None) or (gamma > 0 and cost_c is None):
+            continue
+        fitness = (alpha * eta_t if alpha > 0 else 0.0) + (beta * eta_e if beta > 0 else 0.0) - \
+            (gamma * cost_c if gamma > 0 else 0.0)
+        if best is None or fitness > best["fitness"]:
+            best = {"genes": ga.genes_to_dict(genes_row), "fitness": fitness,
+                    "metrics": {"eta_t": eta_t, "eta_e": eta_e, "cost_c": cost_c}}
+    return best
+
+
+def run_nsga2(n_workers=None, population_size=None, generations=None, seed=None):
+    """
+    NSGA-II 主循环: 父代与子代合并后做非支配排序，按前沿序号和拥挤距离选出下一代父代。
+    所有评估过的可行点都并入 Pareto 存档，每代写入 PARETO_ARCHIVE_FILE。
+    模拟使用与 GA 相同的默认求解器设置，同一设计点只模拟一次 (hybrid_optimizer.DesignEvaluator)。
+    返回 (存档基因矩阵, 存档模拟指标字典列表)。
+    """
+    population_size = population_size or NSGA2_POPULATION_SIZE
+    generations = generations or NSGA2_GENERATIONS
+    rng = np.random.default_rng(seed)
+    log_file, log_writer = hybrid_optimizer.open_evaluation_log(NSGA2_LOG_FILE, 'w')
+    evaluator = hybrid_optimizer.DesignEvaluator(n_workers, log_writer=log_writer, stage="nsga2:0")
+    print(f"NSGA-II 开始。种群 {population_size}, {generations} 代, 目标 {NSGA2_OBJECTIVES}, "
+          f"工作进程 {evaluator.n_workers}")
+    start_time = time.time()
+    archive_genes = np.empty((0, len(ga.VAR_NAMES)))
+    archive_values = np.empty((0, len(NSGA2_OBJECTIVES)))
+    try:
+        lower, upper = ga.gene_bounds()
+        genes = rng.uniform(lower, upper, size=(population_size, len(ga.VAR_NAMES)))
+        values = objective_matrix(evaluator.simulation_results(hybrid_optimizer.scale_genes(genes)))
+        archive_genes, archive_values = update_pareto_archive(archive_genes, archive_values, genes, values)
+        ranks, distance = rank_and_crowding(values)
+
+        for generation in range(1, generations + 1):
+            evaluator.stage = f"nsga2:{generation}"
+            offspring = breed_offspring(genes, ranks, distance, population_size, rng)
+            offspring_values = objective_matrix(
+                evaluator.simulation_results(hybrid_optimizer.scale_genes(offspring)))
+            archive_genes, archive_values = update_pareto_archive(archive_genes, archive_values,
+                                                                  offspring, offspring_values)
+            combined_genes = np.vstack([genes, offspring])
+            combined_values = np.vstack([values, offspring_values])
+            combined_ranks, combined_distance = rank_and_crowding(combined_values)
+            survivors = select_survivors(combined_ranks, combined_distance, population_size)
+            genes, values = combined_genes[survivors], combined_values[survivors]
+            ranks, distance = rank_and_crowding(values)
+
+            archive_metrics = evaluator.simulation_results(hybrid_optimizer.scale_genes(archive_genes))  # 均已缓存
+            save_pareto_archive(PARETO_ARCHIVE_FILE, archive_genes, archive_metrics)
+            log_file.flush()
+            extremes = ", ".join(f"{name} 最大 {OBJECTIVE_SENSES[name] * archive_values[:, k].max():.5f}"
+                                 for k, name in enumerate(NSGA2_OBJECTIVES))
+            print(f"  第 {generation} 代: 种群中前沿点 {int(np.sum(ranks == 0))} 个, 存档 {len(archive_genes)} 个 "
+                  f"({extremes}), 累计模拟 {evaluator.n_simulations} 次")
+    finally:
+        evaluator.close()
+        log_file.close()
+    archive_metrics = evaluator.simulation_results(hybrid_optimizer.scale_genes(archive_genes))
+    print(f"NSGA-II 结束，耗时 {time.time() - start_time:.2f} 秒，真实模拟 {evaluator.n_simulations} 次，"
+          f"Pareto 存档 {len(archive_genes)} 个点已保存到 {PARETO_ARCHIVE_FILE}")
+    return archive_genes, archive_metrics
+
+
+def print_weighted_optimum(alpha, beta, gamma):
+    best = best_for_weights(alpha, beta, gamma)
+    if best is None:
+        print("Pareto 存档中没有可用的设计点。")
+        return None
+    print(f"\n权重 α={alpha}, β={beta}, γ={gamma} 下的最优设计 (来自 Pareto 存档): Fitness = {best['fitness']:.6f}")
+    for var_name, value in best["genes"].items():
+        print(f"    {var_name}: {value:.4f}")
+    print(f"  总热效率 η_t: {best['metrics']['eta_t'] * 100:.3f}%")
+    print(f"  总㶲效率 η_e: {best['metrics']['eta_e'] * 100:.3f}%")
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SCBC/ORC联合循环多目标优化 (NSGA-II) 与 Pareto 存档查询。")
+    parser.add_argument("--generations", type=int, default=NSGA2_GENERATIONS, help="进化代数")
+    parser.add_argument("--population", type=int, default=NSGA2_POPULATION_SIZE, help="种群规模")
+    parser.add_argument("--workers", type=int, default=None, help="并行工作进程数 (默认取 CPU 亲和性掩码)")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子")
+    parser.add_argument("--query", nargs=3, type=float, metavar=("ALPHA", "BETA", "GAMMA"),
+                        help="不运行优化，只从已有的 Pareto 存档中查询给定权重下的最优设计")
+    args = parser.parse_args()
+    if args.query:
+        print_weighted_optimum(*args.query)
+    else:
+        run_nsga2(args.workers, args.population, args.generations, args.seed)
+        print_weighted_optimum(ga.ALPHA, ga.BETA, ga.GAMMA)
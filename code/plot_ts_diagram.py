@@ -14,7 +14,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 import os
 from matplotlib import rcParams
-from CoolProp.CoolProp import PropsSI
+from state_point_calculator import get_fluid_constants, StateBatch
 
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']
@@ -116,9 +116,12 @@ def generate_saturation_curve(fluid_name, T_min=None, T_max=None, num_points=100
         tuple: (T_sat, s_liquid, s_vapor) 温度和对应的液相、气相熵值
     """
     try:
-        # 获取临界温度
-        T_crit = PropsSI('Tcrit', fluid_name)
-        T_triple = PropsSI('Ttriple', fluid_name)
+        # 获取临界温度和三相点温度 (来自共享的工质常数注册表)
+        constants = get_fluid_constants(fluid_name)
+        if constants is None:
+            raise ValueError(f"无法获取工质 {fluid_name} 的常数")
+        T_crit = constants["T_crit"]
+        T_triple = constants["T_triple"]
 
         # 设置温度范围
         if T_min is None:
@@ -129,24 +132,12 @@ def generate_saturation_curve(fluid_name, T_min=None, T_max=None, num_points=100
         # 生成温度数组
         T_sat = np.linspace(T_min, T_max, num_points)
 
-        s_liquid = []
-        s_vapor = []
-        T_valid = []
+        # 一次批量计算饱和液相和气相的熵，跳过计算失败的点
+        liquid = StateBatch(fluid_name).props_from_TQ(T_sat, 0.0)
+        vapor = StateBatch(fluid_name).props_from_TQ(T_sat, 1.0)
+        valid = liquid.valid & vapor.valid
 
-        for T in T_sat:
-            try:
-                # 计算饱和液相和气相的熵
-                s_l = PropsSI('S', 'T', T, 'Q', 0, fluid_name) / 1000  # 转换为kJ/kgK
-                s_v = PropsSI('S', 'T', T, 'Q', 1, fluid_name) / 1000  # 转换为kJ/kgK
-
-                s_liquid.append(s_l)
-                s_vapor.append(s_v)
-                T_valid.append(T - 273.15)  # 转换为摄氏度
-
-            except Exception:
-                continue  # 跳过计算失败的点
-
-        return np.array(T_valid), np.array(s_liquid), np.array(s_vapor)
+        return T_sat[valid] - 273.15, liquid.s[valid] / 1000, vapor.s[valid] / 1000  # 摄氏度, kJ/kgK
 
     except Exception as e:
         print(f"生成{fluid_name}饱和曲线时出错: {e}")
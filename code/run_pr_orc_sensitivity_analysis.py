@@ -1,14 +1,7 @@
-import subprocess
-import csv
-import re
-import numpy
 import os
 import pandas as pd
-import numpy as np
-import json
-import time
 import matplotlib.pyplot as plt
-from full_cycle_simulator import load_cycle_parameters, simulate_scbc_orc_cycle, calculate_theoretical_exergy_efficiency
+from sweep_engine import run_sweep
 
 # 1. 定义固定的核心参数
 T5_C = 599.85  # SCBC透平入口温度 (°C)
@@ -19,57 +12,10 @@ THETA_W_C_RANGE = [110, 120, 130]  # ORC涡轮机入口温度范围 (°C)
 # 从 2.2 到 4.0 (包含边界)，步长为 0.2
 PR_ORC_RANGE = [2.2, 2.4, 2.6, 2.8, 3.0, 3.2, 3.4, 3.6, 3.8, 4.0]  # 使用精确的列表而不是numpy.arange
 
-# 3. 定义结果输出文件名
+# 3. 定义结果输出文件名和输出列
 RESULTS_CSV_FILE = "pr_orc_sensitivity_results.csv"
-
-# 辅助函数：从模拟输出中提取关键数据
-def extract_metrics_from_output(output_text):
-    """
-    从模拟器输出文本中提取关键性能指标
-    """
-    metrics = {
-        'total_thermal_efficiency': None,
-        'total_exergy_efficiency': None,
-        'scbc_net_power': None,
-        'orc_net_power': None,
-        'total_net_power': None,
-        'carnot_efficiency': None
-    }
-    
-    if not output_text:
-        return metrics
-    
-    # 提取热效率
-    thermal_eff_match = re.search(r"联合循环总热效率:\s*([\d\.]+)%", output_text)
-    if thermal_eff_match:
-        metrics['total_thermal_efficiency'] = float(thermal_eff_match.group(1))
-    
-    # 提取㶲效率
-    exergy_eff_match = re.search(r"联合循环总㶲效率:\s*([\d\.]+)%", output_text)
-    if exergy_eff_match:
-        metrics['total_exergy_efficiency'] = float(exergy_eff_match.group(1))
-    
-    # 提取SCBC净功率
-    scbc_power_match = re.search(r"SCBC净输出功:\s*([\d\.]+)\s*MW", output_text)
-    if scbc_power_match:
-        metrics['scbc_net_power'] = float(scbc_power_match.group(1))
-    
-    # 提取ORC净功率
-    orc_power_match = re.search(r"ORC净输出功:\s*([\d\.]+)\s*MW", output_text)
-    if orc_power_match:
-        metrics['orc_net_power'] = float(orc_power_match.group(1))
-    
-    # 提取总净功率
-    total_power_match = re.search(r"联合循环总净输出功:\s*([\d\.]+)\s*MW", output_text)
-    if total_power_match:
-        metrics['total_net_power'] = float(total_power_match.group(1))
-    
-    # 提取理论火用效率（卡诺效率）
-    carnot_match = re.search(r"基于T5温度.*?的理论火用效率:\s*([\d\.]+)%", output_text)
-    if carnot_match:
-        metrics['carnot_efficiency'] = float(carnot_match.group(1))
-    
-    return metrics
+RESULT_METRICS = ["Total_Thermal_Efficiency_percent", "Total_Exergy_Efficiency_percent", "SCBC_Net_Power_MW",
+                  "ORC_Net_Power_MW", "Total_Net_Power_MW", "Carnot_Efficiency_percent"]
 
 def plot_results(results_df):
     """
@@ -174,130 +120,30 @@ def main():
     """
     主函数，执行参数敏感性分析。
     """
-    # 设置输出文件路径
     output_csv_path = get_output_csv_path()
     print(f"开始执行参数敏感性分析，结果将保存到 {output_csv_path}")
 
-    # 检查依赖脚本是否存在
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    required_scripts = ["modify_cycle_parameters.py", "full_cycle_simulator.py"]
-    for script_name in required_scripts:
-        script_path = os.path.join(script_dir, script_name)
-        if not os.path.exists(script_path):
-            print(f"错误：依赖脚本 {script_name} 未找到。")
-            return
-
-    # 确保输出目录存在
-    output_dir = os.path.dirname(output_csv_path)
-    os.makedirs(output_dir, exist_ok=True)
+    # (THETA_W_C, PR_ORC) 网格由 sweep_engine 按蛇形路径热启动计算，结果按原始网格顺序写入 CSV
+    # (n_workers=1: 串行计算的输出与机器核数无关，可逐位复现)
+    results = run_sweep({"theta_w_c": THETA_W_C_RANGE, "pr_orc": PR_ORC_RANGE},
+                        fixed={"theta_5_c": T5_C, "pr_scbc": PR_SCBC},
+                        output_path=output_csv_path, metrics=RESULT_METRICS,
+                        column_names={"theta_w_c": "THETA_W_C", "pr_orc": "PR_ORC"}, n_workers=1)
+    print(f"\n结果已保存到: {output_csv_path}")
 
+    # 绘制结果图表
     try:
-        # 1. 加载基础参数
-        params_path = get_params_path()
-        print(f"从 {params_path} 加载参数...")
-        params = load_cycle_parameters(params_path)
-        if not params:
-            print("无法加载参数文件。")
-            return
-
-        # 2. 创建结果存储结构
-        results = []
-        result_headers = ["THETA_W_C", "PR_ORC", "Total_Thermal_Efficiency_percent", 
-                         "Total_Exergy_Efficiency_percent", "SCBC_Net_Power_MW", 
-                         "ORC_Net_Power_MW", "Total_Net_Power_MW", "Carnot_Efficiency_percent"]
-        
-        # 3. 运行敏感性分析
-        total_cases = len(THETA_W_C_RANGE) * len(PR_ORC_RANGE)
-        current_case = 0
-        
-        for theta_w in THETA_W_C_RANGE:
-            for pr_orc in PR_ORC_RANGE:
-                current_case += 1
-                print(f"\n[{current_case}/{total_cases}] 分析 THETA_W_C = {theta_w}°C, PR_ORC = {pr_orc:.4f}")
-                start_time = time.time()
-                
-                # 运行modify_cycle_parameters.py重新生成参数
-                modify_script_path = os.path.join(script_dir, "modify_cycle_parameters.py")
-                modify_cmd = [
-                    "python", modify_script_path,
-                    "--t5_c", str(T5_C),
-                    "--pr_scbc", str(PR_SCBC),
-                    "--pr_orc", str(pr_orc),
-                    "--theta_w_c", str(theta_w)
-                ]
-                
-                try:
-                    subprocess.run(modify_cmd, check=True, capture_output=True)
-                    
-                    # 运行full_cycle_simulator.py
-                    simulator_script_path = os.path.join(script_dir, "full_cycle_simulator.py")
-                    simulate_cmd = ["python", simulator_script_path]
-                    sim_result = subprocess.run(simulate_cmd, check=True, capture_output=True, text=True, encoding='utf-8')
-                    output_text = sim_result.stdout
-                    
-                    # 从输出文本中提取指标
-                    metrics = extract_metrics_from_output(output_text)
-                    
-                    # 存储结果
-                    results.append([
-                        theta_w,
-                        pr_orc,
-                        metrics['total_thermal_efficiency'],
-                        metrics['total_exergy_efficiency'],
-                        metrics['scbc_net_power'],
-                        metrics['orc_net_power'],
-                        metrics['total_net_power'],
-                        metrics['carnot_efficiency']
-                    ])
-                    
-                    print(f"  成功提取结果:")
-                    print(f"    总热效率: {metrics['total_thermal_efficiency']}%")
-                    print(f"    总㶲效率: {metrics['total_exergy_efficiency']}%")
-                    
-                except subprocess.CalledProcessError as e:
-                    print(f"  错误: 运行命令失败: {e}")
-                    print(f"  错误输出: {e.stderr}")
-                except Exception as e:
-                    print(f"  错误: 模拟失败: {e}")
-                
-                elapsed_time = time.time() - start_time
-                print(f"  耗时: {elapsed_time:.2f} 秒")
-        
-        # 4. 保存结果到CSV
-        if results:
-            try:
-                with open(output_csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(result_headers)
-                    writer.writerows(results)
-                print(f"\n结果已保存到: {output_csv_path}")
-                
-                # 5. 绘制结果图表
-                results_df = pd.DataFrame(results, columns=result_headers)
-                plot_results(results_df)
-                print("已生成敏感性分析图表")
-                
-            except Exception as e:
-                print(f"\n保存结果时发生错误: {e}")
-        else:
-            print("\n没有有效结果可保存，请检查模拟结果")
-
+        plot_results(pd.DataFrame(results))
+        print("已生成敏感性分析图表")
     except Exception as e:
-        print(f"发生意外错误: {e}")
-
-def get_params_path():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    output_dir = os.path.join(project_root, "output")
-    os.makedirs(output_dir, exist_ok=True)
-    return os.path.join(output_dir, "cycle_setup_parameters.json")
+        print(f"\n绘制图表时发生错误: {e}")
 
 def get_output_csv_path():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     output_dir = os.path.join(project_root, "output")
     os.makedirs(output_dir, exist_ok=True)
-    return os.path.join(output_dir, "pr_orc_sensitivity_results.csv")
+    return os.path.join(output_dir, RESULTS_CSV_FILE)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,6 +1,9 @@
 import numpy as np
 from CoolProp.CoolProp import PropsSI
+import CoolProp.CoolProp as CP
 import json
+import os
+from collections import OrderedDict
 import scipy.optimize
 
 # --- 环境参考状态 (用于㶲计算) ---
@@ -25,32 +28,297 @@ def to_pascal(P_bar_or_kpa, unit='kpa'):
         return P_bar_or_kpa * 1e5
     return P_bar_or_kpa
 
+# --- 物性计算后端 ---
+# "HEOS"    : 每个状态点只调用一次 CoolProp AbstractState.update()，所有物性从同一次闪蒸结果中读取 (默认)
+# "PropsSI" : 原始实现，每个物性单独调用一次 PropsSI (每次都重新解析字符串并重复闪蒸)
+# "BICUBIC&HEOS" / "TTSE&HEOS" : CoolProp 插值物性表，只在 TABULATED_RANGES 范围内使用，
+#                               范围外的状态点自动回退到 HEOS (精度见 validate_property_backend)
+PROPERTY_BACKEND = "HEOS"
+PROPERTY_BACKENDS = ("HEOS", "PropsSI", "BICUBIC&HEOS", "TTSE&HEOS")
+TABULATED_BACKENDS = ("BICUBIC&HEOS", "TTSE&HEOS")
+
+# 插值表的适用范围 (本项目的工况范围): 压力 Pa, 温度 K；未列出的量不做限制
+TABULATED_RANGES = {
+    "CO2": {"P": (7.0e6, 30.0e6), "T": (to_kelvin(30.0), to_kelvin(620.0))},
+    "R245fa": {"P": (300.0e3, 2000.0e3)},
+}
+# 范围内仍需回退到 HEOS 的区域: CO2 临界点附近 (物性随温度剧烈变化，(P,T) 插值误差可达 ~50 kJ/kg)
+TABULATED_EXCLUDED_REGIONS = {
+    "CO2": {"P": (7.0e6, 12.0e6), "T": (to_kelvin(30.0), to_kelvin(70.0))},
+}
+# (P,T) 输入离饱和温度小于该值时回退到 HEOS (插值单元跨越饱和线，误差可达 ~100 kJ/kg)
+TABULATED_SATURATION_MARGIN_K = 5.0
+
+# 物性表第一次生成较慢 (CO2 约 15 秒)，生成后保存到该目录，之后的进程直接读取
+PROPERTY_TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                   "output", "property_tables")
+
+_abstract_states = {}  # (后端, 工质) -> AbstractState，每个进程每种工质只创建一次
+
+def set_property_backend(backend, tables_dir=None):
+    """
+    切换 StatePoint 使用的物性计算后端 (见 PROPERTY_BACKENDS)。
+    tables_dir: 插值表的保存目录，默认 PROPERTY_TABLES_DIR，需在第一次创建插值后端之前设置。
+    """
+    global PROPERTY_BACKEND, PROPERTY_TABLES_DIR
+    if backend not in PROPERTY_BACKENDS:
+        raise ValueError(f"未知的物性计算后端: {backend} (可选: {PROPERTY_BACKENDS})")
+    PROPERTY_BACKEND = backend
+    if tables_dir is not None:
+        PROPERTY_TABLES_DIR = tables_dir
+
+def _get_abstract_state(fluid_name, backend=None):
+    """返回 (并缓存) 指定后端 (默认为当前后端) 下工质的 AbstractState 对象"""
+    backend = backend or PROPERTY_BACKEND
+    key = (backend, fluid_name)
+    state = _abstract_states.get(key)
+    if state is None:
+        if backend in TABULATED_BACKENDS:
+            # CoolProp 直接把目录字符串和表名拼接，目录末尾必须带分隔符
+            os.makedirs(PROPERTY_TABLES_DIR, exist_ok=True)
+            CP.set_config_string(CP.ALTERNATIVE_TABLES_DIRECTORY, os.path.join(PROPERTY_TABLES_DIR, ""))
+        state = CP.AbstractState(backend, fluid_name)
+        _abstract_states[key] = state
+    return state
+
+def _in_tabulated_range(fluid_name, P=None, T=None):
+    """检查压力/温度是否在该工质插值表的适用范围内 (传入 None 的量不检查)"""
+    ranges = TABULATED_RANGES.get(fluid_name)
+    if ranges is None:
+        return False
+    for value, key in ((P, "P"), (T, "T")):
+        if value is not None and key in ranges and not (ranges[key][0] <= value <= ranges[key][1]):
+            return False
+    excluded = TABULATED_EXCLUDED_REGIONS.get(fluid_name)
+    if excluded is not None and P is not None and T is not None:
+        if excluded["P"][0] <= P <= excluded["P"][1] and excluded["T"][0] <= T <= excluded["T"][1]:
+            return False
+    return True
+
+def _input_pressure_temperature(input_pair, value1, value2):
+    """从 CoolProp 输入对中取出已知的压力和温度 (未知的返回 None)"""
+    if input_pair == CP.PT_INPUTS:
+        return value1, value2
+    if input_pair == CP.HmassP_INPUTS:
+        return value2, None
+    if input_pair in (CP.PSmass_INPUTS, CP.PQ_INPUTS):
+        return value1, None
+    if input_pair == CP.QT_INPUTS:
+        return None, value2
+    return None, None
+
+def _tabulated_flash(fluid_name, input_pair, value1, value2):
+    """
+    用插值表闪蒸；输入或结果超出 TABULATED_RANGES，或插值表计算失败时返回 None。
+    """
+    P_in, T_in = _input_pressure_temperature(input_pair, value1, value2)
+    if not _in_tabulated_range(fluid_name, P_in, T_in):
+        return None
+    try:
+        state = _get_abstract_state(fluid_name)
+        if input_pair == CP.PT_INPUTS and P_in < get_fluid_constants(fluid_name)["P_crit"]:
+            state.update(CP.PQ_INPUTS, P_in, 0.0)
+            if abs(T_in - state.T()) < TABULATED_SATURATION_MARGIN_K:
+                return None
+        state.update(input_pair, value1, value2)
+        T, P = state.T(), state.p()
+        if not _in_tabulated_range(fluid_name, P, T):
+            return None
+        q = state.Q()
+        # 插值表在单相区返回 -1000，统一为 HEOS/PropsSI 的 -1
+        if not 0.0 <= q <= 1.0:
+            q = -1.0
+        return T, P, state.hmass(), state.smass(), state.rhomass(), q
+    except ValueError:
+        return None
+
+# --- 物性缓存 (可选，默认关闭) ---
+# 同一组 (后端, 工质, 输入对, 输入值) 的闪蒸结果在进程内复用，按最近最少使用 (LRU) 淘汰。
+# 缓存的是闪蒸结果 (T, P, h, s, d, q)，㶲仍按当前参考状态计算，所以修改 T0/P0 不影响缓存。
+# "PropsSI" 后端不经过 _flash，因此也不使用缓存。
+PROPERTY_CACHE_ENABLED = False
+PROPERTY_CACHE_MAXSIZE = 100000
+
+_property_cache = OrderedDict()
+_property_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+def enable_property_cache(maxsize=None):
+    """打开进程内物性缓存 (GA、敏感性分析等批量计算时调用一次即可)"""
+    global PROPERTY_CACHE_ENABLED, PROPERTY_CACHE_MAXSIZE
+    PROPERTY_CACHE_ENABLED = True
+    if maxsize is not None:
+        PROPERTY_CACHE_MAXSIZE = maxsize
+        while len(_property_cache) > PROPERTY_CACHE_MAXSIZE:
+            _property_cache.popitem(last=False)
+            _property_cache_stats["evictions"] += 1
+
+def disable_property_cache(clear=True):
+    """关闭物性缓存，clear=True 时同时清空缓存内容和计数"""
+    global PROPERTY_CACHE_ENABLED
+    PROPERTY_CACHE_ENABLED = False
+    if clear:
+        clear_property_cache()
+
+def clear_property_cache():
+    """清空物性缓存并将命中/未命中计数归零"""
+    _property_cache.clear()
+    for key in _property_cache_stats:
+        _property_cache_stats[key] = 0
+
+def get_property_cache_stats():
+    """返回物性缓存的统计信息: hits, misses, evictions, size, maxsize, hit_rate"""
+    lookups = _property_cache_stats["hits"] + _property_cache_stats["misses"]
+    return dict(_property_cache_stats, size=len(_property_cache), maxsize=PROPERTY_CACHE_MAXSIZE,
+                hit_rate=_property_cache_stats["hits"] / lookups if lookups else 0.0)
+
+def _flash(fluid_name, input_pair, value1, value2):
+    """
+    对给定输入对做一次闪蒸计算。
+    input_pair/value1/value2 按 CoolProp 约定给出 (如 CP.HmassP_INPUTS, h, P)。
+    返回 (T, P, h, s, d, q)，单相区 q 为 -1 (与 PropsSI 一致)。
+    计算失败时抛出 ValueError (失败的输入不缓存)。
+    """
+    if not PROPERTY_CACHE_ENABLED:
+        return _flash_uncached(fluid_name, input_pair, value1, value2)
+    key = (PROPERTY_BACKEND, fluid_name, input_pair, value1, value2)
+    result = _property_cache.get(key)
+    if result is not None:
+        _property_cache.move_to_end(key)
+        _property_cache_stats["hits"] += 1
+        return result
+    _property_cache_stats["misses"] += 1
+    result = _flash_uncached(fluid_name, input_pair, value1, value2)
+    _property_cache[key] = result
+    if len(_property_cache) > PROPERTY_CACHE_MAXSIZE:
+        _property_cache.popitem(last=False)
+        _property_cache_stats["evictions"] += 1
+    return result
+
+def _flash_uncached(fluid_name, input_pair, value1, value2):
+    """_flash 的实际计算部分 (不经过物性缓存)"""
+    if PROPERTY_BACKEND in TABULATED_BACKENDS:
+        result = _tabulated_flash(fluid_name, input_pair, value1, value2)
+        if result is not None:
+            return result
+        state = _get_abstract_state(fluid_name, "HEOS")
+    elif PROPERTY_BACKEND == "PropsSI":
+        # StatePoint 的 PropsSI 后端不走 _flash；StateBatch 等批量调用在此使用同一状态方程的 HEOS
+        state = _get_abstract_state(fluid_name, "HEOS")
+    else:
+        state = _get_abstract_state(fluid_name)
+    state.update(input_pair, value1, value2)
+    return state.T(), state.p(), state.hmass(), state.smass(), state.rhomass(), state.Q()
+
+# --- 环境参考状态与工质常数注册表 ---
+_fluid_registry = {}  # 工质 -> 常数字典 (或 None，表示该工质无法计算)
+
+def set_reference_state(T0_K_new, P0_Pa_new):
+    """
+    修改全局环境参考状态 (如使用 run_t0_p0_fitting 的反推结果)。
+    工质注册表中的死态焓/熵会在下次查询时自动重新计算。
+    """
+    global T0_CELSIUS, P0_KPA, T0_K, P0_PA
+    T0_K = T0_K_new
+    P0_PA = P0_Pa_new
+    T0_CELSIUS = T0_K - 273.15
+    P0_KPA = P0_PA / 1000
+
+def get_reference_state():
+    """返回当前的环境参考状态 (T0_K, P0_PA)"""
+    return T0_K, P0_PA
+
+def get_fluid_constants(fluid_name):
+    """
+    返回工质的常数字典，每个进程每种工质只计算一次，所有 StatePoint 共享。
+    包含: T0_K, P0_PA, h0, s0 (参考状态下的焓 J/kg 和熵 J/kgK), T_crit (K), P_crit (Pa),
+          T_triple (K), molar_mass (kg/mol)。
+    如果全局参考状态已改变，会自动重新计算 h0/s0。工质无法计算时返回 None。
+    """
+    if fluid_name in _fluid_registry:
+        constants = _fluid_registry[fluid_name]
+        if constants is None or (constants["T0_K"] == T0_K and constants["P0_PA"] == P0_PA):
+            return constants
+    try:
+        # 常数始终用 HEOS 计算，与 StatePoint 当前使用的后端无关
+        state = CP.AbstractState("HEOS", fluid_name)
+        constants = _fluid_registry.get(fluid_name) or {
+            "T_crit": state.T_critical(),
+            "P_crit": state.p_critical(),
+            "T_triple": state.Ttriple(),
+            "molar_mass": state.molar_mass()
+        }
+        state.update(CP.PT_INPUTS, P0_PA, T0_K)
+        constants.update({"T0_K": T0_K, "P0_PA": P0_PA, "h0": state.hmass(), "s0": state.smass()})
+    except ValueError:
+        constants = None
+    _fluid_registry[fluid_name] = constants
+    return constants
+
 # --- 核心物性计算类 ---
 class StatePoint:
-    def __init__(self, fluid_name, name=""):
+    # 固定属性，迭代中大量创建的状态点不再各自带一个 __dict__
+    __slots__ = ("fluid", "_name", "_name_args", "P", "T", "h", "s", "d", "e", "q", "m_dot")
+
+    def __init__(self, fluid_name, name="", name_args=None):
+        """
+        name_args 不为 None 时，name 作为格式模板，第一次读取 name 时才用 name_args 格式化
+        (参数中的 StatePoint 替换为其名称)，避免迭代中为从不打印的状态点拼接名称字符串。
+        """
         self.fluid = fluid_name
-        self.name = name
+        self._name = name
+        self._name_args = name_args
         self.P = None; self.T = None; self.h = None; self.s = None
         self.d = None; self.e = None; self.q = None; self.m_dot = None
-        try:
-            self._h0 = PropsSI('H', 'T', T0_K, 'P', P0_PA, self.fluid)
-            self._s0 = PropsSI('S', 'T', T0_K, 'P', P0_PA, self.fluid)
-        except ValueError:
-            self._h0 = None
-            self._s0 = None
+
+    @property
+    def name(self):
+        if self._name_args is not None:
+            args = [arg.name if isinstance(arg, StatePoint) else arg for arg in self._name_args]
+            self._name = self._name.format(*args)
+            self._name_args = None
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        self._name = value
+        self._name_args = None
+
+    def clone(self, m_dot=None, name=None, name_args=None):
+        """
+        复制状态点 (共享已计算的物性，不重新闪蒸)，可同时修改流量和名称。
+        用于分流/同状态的点，如 RC 进口和 GO 热侧进口都等于点8。
+        """
+        new_state = StatePoint.__new__(StatePoint)
+        for slot in StatePoint.__slots__:
+            setattr(new_state, slot, getattr(self, slot))
+        if m_dot is not None:
+            new_state.m_dot = m_dot
+        if name is not None:
+            new_state._name = name
+            new_state._name_args = name_args
+        return new_state
+
+    def with_flow(self, m_dot, name=None, name_args=None):
+        """返回相同热力学状态、流量为 m_dot 的新状态点"""
+        return self.clone(m_dot=m_dot, name=name, name_args=name_args)
 
     def _calculate_exergy(self):
-        if self.h is not None and self.s is not None and self._h0 is not None and self._s0 is not None:
-            self.e = (self.h - self._h0) - T0_K * (self.s - self._s0)
+        # 参考状态 (h0, s0, T0) 来自共享的工质注册表，不再为每个状态点单独计算
+        ref = get_fluid_constants(self.fluid)
+        if self.h is not None and self.s is not None and ref is not None:
+            self.e = (self.h - ref["h0"]) - ref["T0_K"] * (self.s - ref["s0"])
         else:
             self.e = None
 
     def props_from_PT(self, P_Pa, T_K):
         self.P = P_Pa; self.T = T_K
         try:
-            self.h = PropsSI('H', 'P', self.P, 'T', self.T, self.fluid)
-            self.s = PropsSI('S', 'P', self.P, 'T', self.T, self.fluid)
-            self.d = PropsSI('D', 'P', self.P, 'T', self.T, self.fluid)
+            if PROPERTY_BACKEND == "PropsSI":
+                self.h = PropsSI('H', 'P', self.P, 'T', self.T, self.fluid)
+                self.s = PropsSI('S', 'P', self.P, 'T', self.T, self.fluid)
+                self.d = PropsSI('D', 'P', self.P, 'T', self.T, self.fluid)
+            else:
+                _, _, self.h, self.s, self.d, _ = _flash(self.fluid, CP.PT_INPUTS, self.P, self.T)
             self._calculate_exergy()
         except Exception as err:
             print(f"计算P,T物性时出错 {self.name} ({self.fluid}): {err}")
@@ -60,11 +328,14 @@ class StatePoint:
     def props_from_PH(self, P_Pa, h_J_kg):
         self.P = P_Pa; self.h = h_J_kg
         try:
-            self.T = PropsSI('T', 'P', self.P, 'H', self.h, self.fluid)
-            self.s = PropsSI('S', 'P', self.P, 'H', self.h, self.fluid)
-            self.d = PropsSI('D', 'P', self.P, 'H', self.h, self.fluid)
-            try: self.q = PropsSI('Q', 'P', self.P, 'H', self.h, self.fluid)
-            except: self.q = None
+            if PROPERTY_BACKEND == "PropsSI":
+                self.T = PropsSI('T', 'P', self.P, 'H', self.h, self.fluid)
+                self.s = PropsSI('S', 'P', self.P, 'H', self.h, self.fluid)
+                self.d = PropsSI('D', 'P', self.P, 'H', self.h, self.fluid)
+                try: self.q = PropsSI('Q', 'P', self.P, 'H', self.h, self.fluid)
+                except: self.q = None
+            else:
+                self.T, _, _, self.s, self.d, self.q = _flash(self.fluid, CP.HmassP_INPUTS, self.h, self.P)
             self._calculate_exergy()
         except Exception as err:
             print(f"计算P,H物性时出错 {self.name} ({self.fluid}): {err}")
@@ -74,11 +345,14 @@ class StatePoint:
     def props_from_PS(self, P_Pa, s_J_kgK):
         self.P = P_Pa; self.s = s_J_kgK
         try:
-            self.T = PropsSI('T', 'P', self.P, 'S', self.s, self.fluid)
-            self.h = PropsSI('H', 'P', self.P, 'S', self.s, self.fluid)
-            self.d = PropsSI('D', 'P', self.P, 'S', self.s, self.fluid)
-            try: self.q = PropsSI('Q', 'P', self.P, 'S', self.s, self.fluid)
-            except: self.q = None
+            if PROPERTY_BACKEND == "PropsSI":
+                self.T = PropsSI('T', 'P', self.P, 'S', self.s, self.fluid)
+                self.h = PropsSI('H', 'P', self.P, 'S', self.s, self.fluid)
+                self.d = PropsSI('D', 'P', self.P, 'S', self.s, self.fluid)
+                try: self.q = PropsSI('Q', 'P', self.P, 'S', self.s, self.fluid)
+                except: self.q = None
+            else:
+                self.T, _, self.h, _, self.d, self.q = _flash(self.fluid, CP.PSmass_INPUTS, self.P, self.s)
             self._calculate_exergy()
         except Exception as err:
             print(f"计算P,S物性时出错 {self.name} ({self.fluid}): {err}")
@@ -88,10 +362,13 @@ class StatePoint:
     def props_from_PQ(self, P_Pa, Q_frac):
         self.P = P_Pa; self.q = Q_frac
         try:
-            self.T = PropsSI('T', 'P', self.P, 'Q', self.q, self.fluid)
-            self.h = PropsSI('H', 'P', self.P, 'Q', self.q, self.fluid)
-            self.s = PropsSI('S', 'P', self.P, 'Q', self.q, self.fluid)
-            self.d = PropsSI('D', 'P', self.P, 'Q', self.q, self.fluid)
+            if PROPERTY_BACKEND == "PropsSI":
+                self.T = PropsSI('T', 'P', self.P, 'Q', self.q, self.fluid)
+                self.h = PropsSI('H', 'P', self.P, 'Q', self.q, self.fluid)
+                self.s = PropsSI('S', 'P', self.P, 'Q', self.q, self.fluid)
+                self.d = PropsSI('D', 'P', self.P, 'Q', self.q, self.fluid)
+            else:
+                self.T, _, self.h, self.s, self.d, _ = _flash(self.fluid, CP.PQ_INPUTS, self.P, self.q)
             self._calculate_exergy()
         except Exception as err:
             print(f"计算P,Q物性时出错 {self.name} ({self.fluid}): {err}")
@@ -102,10 +379,13 @@ class StatePoint:
         """根据温度和干度计算物性"""
         self.T = T_K; self.q = Q_frac
         try:
-            self.P = PropsSI('P', 'T', self.T, 'Q', self.q, self.fluid)
-            self.h = PropsSI('H', 'T', self.T, 'Q', self.q, self.fluid)
-            self.s = PropsSI('S', 'T', self.T, 'Q', self.q, self.fluid)
-            self.d = PropsSI('D', 'T', self.T, 'Q', self.q, self.fluid)
+            if PROPERTY_BACKEND == "PropsSI":
+                self.P = PropsSI('P', 'T', self.T, 'Q', self.q, self.fluid)
+                self.h = PropsSI('H', 'T', self.T, 'Q', self.q, self.fluid)
+                self.s = PropsSI('S', 'T', self.T, 'Q', self.q, self.fluid)
+                self.d = PropsSI('D', 'T', self.T, 'Q', self.q, self.fluid)
+            else:
+                _, self.P, self.h, self.s, self.d, _ = _flash(self.fluid, CP.QT_INPUTS, self.q, self.T)
             self._calculate_exergy()
         except Exception as err:
             print(f"计算T,Q物性时出错 {self.name} ({self.fluid}): {err}")
@@ -132,6 +412,76 @@ class StatePoint:
                 f"  Q = {q_str}\n"
                 f"  m_dot = {m_dot_str} kg/s")
 
+# --- 批量物性计算 (结构体数组) ---
+class StateBatch:
+    """
+    同一工质的一组状态点，物性以 NumPy 数组保存 (P, T, h, s, d, q, e)，不为每个点创建 StatePoint。
+    props_from_* 的输入可以是数组或标量 (按 NumPy 规则广播)。
+    计算失败的元素在 valid 中为 False，对应物性为 NaN (代替 StatePoint 中的 None)；
+    单相区 q 为 -1，与 StatePoint 一致。
+    """
+
+    def __init__(self, fluid_name, name=""):
+        self.fluid = fluid_name
+        self.name = name
+        empty = np.empty(0)
+        self.P = empty; self.T = empty; self.h = empty; self.s = empty
+        self.d = empty; self.e = empty; self.q = empty
+        self.valid = np.empty(0, dtype=bool)
+
+    def __len__(self):
+        return len(self.valid)
+
+    def _evaluate(self, input_pair, value1, value2):
+        """逐元素闪蒸 (经过物性缓存和插值表后端)，填充全部物性数组和有效性掩码"""
+        value1, value2 = np.broadcast_arrays(np.asarray(value1, dtype=float), np.asarray(value2, dtype=float))
+        value1, value2 = value1.ravel(), value2.ravel()
+        results = np.full((len(value1), 6), np.nan)
+        valid = np.zeros(len(value1), dtype=bool)
+        for i in range(len(value1)):
+            if not (np.isfinite(value1[i]) and np.isfinite(value2[i])):
+                continue  # 上游已失败的元素 (NaN) 不再闪蒸
+            try:
+                results[i] = _flash(self.fluid, input_pair, float(value1[i]), float(value2[i]))
+                valid[i] = True
+            except ValueError:
+                pass
+        self.T, self.P, self.h, self.s, self.d, self.q = results.T.copy()
+        self.valid = valid & np.all(np.isfinite(results[:, :5]), axis=1)
+        self._calculate_exergy()
+        return self
+
+    def subset(self, index):
+        """按索引或布尔掩码取出其中一部分状态点，返回新的 StateBatch (不重新闪蒸)"""
+        batch = StateBatch(self.fluid, self.name)
+        for attr in ("P", "T", "h", "s", "d", "e", "q", "valid"):
+            setattr(batch, attr, getattr(self, attr)[index])
+        return batch
+
+    def _calculate_exergy(self):
+        ref = get_fluid_constants(self.fluid)
+        if ref is None:
+            self.e = np.full(len(self.valid), np.nan)
+            self.valid = np.zeros(len(self.valid), dtype=bool)
+            return
+        self.e = (self.h - ref["h0"]) - ref["T0_K"] * (self.s - ref["s0"])
+
+    def props_from_PT(self, P_Pa, T_K):
+        return self._evaluate(CP.PT_INPUTS, P_Pa, T_K)
+
+    def props_from_PH(self, P_Pa, h_J_kg):
+        return self._evaluate(CP.HmassP_INPUTS, h_J_kg, P_Pa)
+
+    def props_from_PS(self, P_Pa, s_J_kgK):
+        return self._evaluate(CP.PSmass_INPUTS, P_Pa, s_J_kgK)
+
+    def props_from_PQ(self, P_Pa, Q_frac):
+        return self._evaluate(CP.PQ_INPUTS, P_Pa, Q_frac)
+
+    def props_from_TQ(self, T_K, Q_frac):
+        """根据温度和干度计算物性"""
+        return self._evaluate(CP.QT_INPUTS, Q_frac, T_K)
+
 # --- T0/P0反推相关函数定义 (全局作用域) ---
 table10_data_for_fitting = [
     ("SCBC 1", "CO2", 7400.00, 35.00, 402.40, 1.66, 200.84),
@@ -149,22 +499,47 @@ table10_data_for_fitting = [
     ("ORC 012", "R245fa", 1500.00, 59.37, 279.52, 1.26, 6.29),
 ]
 
+# 表10状态点及其质量流量 (kg/s)，用于状态点验证和插值物性后端的精度检查
+validation_data = [
+    ("SCBC 1", "CO2", 7400.00, 35.00, 402.40, 1.66, 200.84, 1945.09),
+    ("SCBC 2", "CO2", 24198.00, 121.73, 453.36, 1.68, 246.29, 1945.09),
+    ("SCBC 3", "CO2", 24198.00, 281.92, 696.46, 2.21, 341.30, 2641.42),
+    ("SCBC 4", "CO2", 24198.00, 417.94, 867.76, 2.48, 434.43, 2641.42),
+    ("SCBC 5", "CO2", 24198.00, 599.85, 1094.91, 2.77, 579.03, 2641.42),
+    ("SCBC 6", "CO2", 7400.00, 455.03, 932.38, 2.80, 409.40, 2641.42),
+    ("SCBC 7", "CO2", 7400.00, 306.16, 761.08, 2.54, 312.52, 2641.42),
+    ("SCBC 8", "CO2", 7400.00, 147.55, 582.06, 2.17, 235.75, 1945.09),
+    ("SCBC 9", "CO2", 7400.00, 84.26, 503.44, 1.97, 214.69, 1945.09),
+    ("ORC 09", "R245fa", 1500.00, 127.76, 505.35, 1.86, 61.21, 677.22),
+    ("ORC 010", "R245fa", 445.10, 94.67, 485.51, 1.88, 37.52, 677.22),
+    ("ORC 011", "R245fa", 445.10, 58.66, 278.39, 1.26, 5.40, 677.22),
+    ("ORC 012", "R245fa", 1500.00, 59.37, 279.52, 1.26, 6.29, 677.22),
+]
+
 def exergy_error_func(params_T0_P0, data_points):
     T0_K_fit, P0_Pa_fit = params_T0_P0
-    errors = []
     if T0_K_fit <= 0 or P0_Pa_fit <= 0: return [1e6] * len(data_points)
-    for _, fluid, _, _, h_kJ_kg, s_kJ_kgK, e_kJ_kg_paper in data_points:
-        try:
-            _h0 = PropsSI('H', 'T', T0_K_fit, 'P', P0_Pa_fit, fluid)
-            _s0 = PropsSI('S', 'T', T0_K_fit, 'P', P0_Pa_fit, fluid)
-            h_J_paper = h_kJ_kg * 1000
-            s_J_paper = s_kJ_kgK * 1000
-            e_calc_J = (h_J_paper - _h0) - T0_K_fit * (s_J_paper - _s0)
-            errors.append(e_calc_J / 1000 - e_kJ_kg_paper)
-        except Exception: errors.append(1e6)
+    fluids = np.array([point[1] for point in data_points])
+    h_J_paper = np.array([point[4] for point in data_points]) * 1000
+    s_J_paper = np.array([point[5] for point in data_points]) * 1000
+    e_kJ_kg_paper = np.array([point[6] for point in data_points])
+    # 每种工质只计算一次参考状态，再对所有状态点做向量化计算
+    errors = np.full(len(data_points), 1e6)
+    for fluid in np.unique(fluids):
+        ref = StateBatch(fluid).props_from_PT(P0_Pa_fit, T0_K_fit)
+        if not ref.valid[0]:
+            continue
+        mask = fluids == fluid
+        e_calc_J = (h_J_paper[mask] - ref.h[0]) - T0_K_fit * (s_J_paper[mask] - ref.s[0])
+        errors[mask] = e_calc_J / 1000 - e_kJ_kg_paper[mask]
     return errors
 
-def run_t0_p0_fitting():
+def run_t0_p0_fitting(apply_result=False):
+    """
+    根据表10数据反推参考状态 T0/P0。
+    apply_result=True 时将结果设为全局参考状态 (工质注册表随之刷新)。
+    返回 (T0_K, P0_Pa)，失败时返回 None。
+    """
     print("\n--- 开始反推参考状态 T0 和 P0 ---")
     initial_params = [298.15, 101325.0]
     bounds = ([273.15, 80000.0], [323.15, 120000.0])
@@ -175,8 +550,45 @@ def run_t0_p0_fitting():
         if result.success:
             T0_fit_K, P0_fit_Pa = result.x
             print(f"  优化成功! 反推 T0 = {T0_fit_K - 273.15:.2f} °C, P0 = {P0_fit_Pa / 1000:.3f} kPa")
+            if apply_result:
+                set_reference_state(T0_fit_K, P0_fit_Pa)
+                print(f"  已将反推结果设为全局参考状态。")
+            return T0_fit_K, P0_fit_Pa
         else: print(f"  优化未成功: {result.message}")
     except Exception as e_fit: print(f"  运行反推时发生错误: {e_fit}")
+    return None
+
+def validate_property_backend(backend="BICUBIC&HEOS", data_points=None):
+    """
+    用表10状态点检查插值物性后端相对 HEOS 的精度。
+    每个点分别做 (P,T) 闪蒸和 (P,h) 反算 (循环模拟中最常用的输入对)，
+    返回各项最大绝对误差: dh (J/kg), ds (J/kgK), dd (kg/m³), de (J/kg), dT_PH (K)。
+    """
+    global PROPERTY_BACKEND
+    data_points = data_points or validation_data
+    max_errors = {"dh": 0.0, "ds": 0.0, "dd": 0.0, "de": 0.0, "dT_PH": 0.0}
+    saved_backend = PROPERTY_BACKEND
+    print(f"\n--- 物性后端 {backend} 与 HEOS 的对比 (表10状态点) ---")
+    print(f"{'状态点名':<10} {'dh(J/kg)':>10} {'ds(J/kgK)':>10} {'dd(kg/m³)':>10} {'de(J/kg)':>10} {'dT_PH(K)':>10}")
+    try:
+        for name, fluid, p_kpa, t_c, *_ in data_points:
+            P_Pa, T_K = to_pascal(p_kpa, 'kpa'), to_kelvin(t_c)
+            PROPERTY_BACKEND = "HEOS"
+            ref = StatePoint(fluid, name).props_from_PT(P_Pa, T_K)
+            PROPERTY_BACKEND = backend
+            tab = StatePoint(fluid, name).props_from_PT(P_Pa, T_K)
+            tab_ph = StatePoint(fluid, name).props_from_PH(P_Pa, ref.h)
+            errors = {"dh": abs(tab.h - ref.h), "ds": abs(tab.s - ref.s), "dd": abs(tab.d - ref.d),
+                      "de": abs(tab.e - ref.e), "dT_PH": abs(tab_ph.T - ref.T)}
+            for key, value in errors.items():
+                max_errors[key] = max(max_errors[key], value)
+            print(f"{name:<10} {errors['dh']:>10.3f} {errors['ds']:>10.5f} {errors['dd']:>10.5f} "
+                  f"{errors['de']:>10.3f} {errors['dT_PH']:>10.5f}")
+    finally:
+        PROPERTY_BACKEND = saved_backend
+    print(f"{'最大误差':<10} {max_errors['dh']:>10.3f} {max_errors['ds']:>10.5f} {max_errors['dd']:>10.5f} "
+          f"{max_errors['de']:>10.3f} {max_errors['dT_PH']:>10.5f}")
+    return max_errors
 
 # --- 主程序块 ---
 if __name__ == "__main__":
@@ -184,22 +596,6 @@ if __name__ == "__main__":
     print(f"当前使用的全局参考状态: T0 = {T0_CELSIUS:.2f} °C ({T0_K:.2f} K), P0 = {P0_KPA:.3f} kPa ({P0_PA:.0f} Pa)")
     print("--- 正在验证表10中的所有状态点 (基于论文给定的P,T) ---")
 
-    validation_data = [
-        ("SCBC 1", "CO2", 7400.00, 35.00, 402.40, 1.66, 200.84, 1945.09),
-        ("SCBC 2", "CO2", 24198.00, 121.73, 453.36, 1.68, 246.29, 1945.09),
-        ("SCBC 3", "CO2", 24198.00, 281.92, 696.46, 2.21, 341.30, 2641.42),
-        ("SCBC 4", "CO2", 24198.00, 417.94, 867.76, 2.48, 434.43, 2641.42),
-        ("SCBC 5", "CO2", 24198.00, 599.85, 1094.91, 2.77, 579.03, 2641.42),
-        ("SCBC 6", "CO2", 7400.00, 455.03, 932.38, 2.80, 409.40, 2641.42),
-        ("SCBC 7", "CO2", 7400.00, 306.16, 761.08, 2.54, 312.52, 2641.42),
-        ("SCBC 8", "CO2", 7400.00, 147.55, 582.06, 2.17, 235.75, 1945.09),
-        ("SCBC 9", "CO2", 7400.00, 84.26, 503.44, 1.97, 214.69, 1945.09),
-        ("ORC 09", "R245fa", 1500.00, 127.76, 505.35, 1.86, 61.21, 677.22),
-        ("ORC 010", "R245fa", 445.10, 94.67, 485.51, 1.88, 37.52, 677.22),
-        ("ORC 011", "R245fa", 445.10, 58.66, 278.39, 1.26, 5.40, 677.22),
-        ("ORC 012", "R245fa", 1500.00, 59.37, 279.52, 1.26, 6.29, 677.22),
-    ]
-
     output_csv_data = []
     csv_header = [
         "PointName", "Fluid", "P_kPa_input", "T_C_input", "h_kJ_kg_paper", 
@@ -249,4 +645,8 @@ if __name__ == "__main__":
 
     # --- (可选) 调用T0/P0反推函数 ---
     print("\n尝试执行T0/P0反推...")
-    run_t0_p0_fitting() 
\ No newline at end of file
+    run_t0_p0_fitting()
+
+    # --- 插值物性后端精度检查 (第一次运行会生成并保存物性表) ---
+    for tabulated_backend in TABULATED_BACKENDS:
+        validate_property_backend(tabulated_backend) 
\ No newline at end of file
@@ -0,0 +1,327 @@
+# sweep_engine.py
+# 通用 N 维参数扫描引擎: 任意参数组合的网格/列表扫描，进程内 (可并行) 计算，按热启动顺序排列，结果逐行写入 CSV/Parquet
+import os
+import io
+import csv
+import math
+import time
+import argparse
+import itertools
+import contextlib
+import functools
+import multiprocessing
+import numpy as np
+
+import state_point_calculator
+import full_cycle_simulator
+from modify_cycle_parameters import generate_cycle_parameters
+from genetic_algorithm_optimizer import default_worker_count
+
+# --- Configuration ---
+# 四个设计变量 (generate_cycle_parameters 的输入)，名称与 genetic_algorithm_optimizer.VAR_NAMES 一致
+DESIGN_VARIABLES = ("theta_5_c", "pr_scbc", "theta_w_c", "pr_orc")
+# 未被扫描的设计变量取此基准值 (敏感性分析脚本的基准工况)
+DEFAULT_DESIGN = {
+    "theta_5_c": 599.85,
+    "pr_scbc": 3.27,
+    "theta_w_c": 127.76,
+    "pr_orc": 3.37
+}
+# 其他可扫描参数写作 "节.参数" (如 "scbc_parameters.eta_T_turbine")，在生成的参数字典上覆盖; 常用的效率/效能可用简称
+PARAMETER_ALIASES = {
+    "eta_T_turbine": "scbc_parameters.eta_T_turbine",
+    "eta_C_compressor": "scbc_parameters.eta_C_compressor",
+    "eta_H_HTR_effectiveness": "scbc_parameters.eta_H_HTR_effectiveness",
+    "eta_L_LTR_effectiveness": "scbc_parameters.eta_L_LTR_effectiveness",
+    "eta_TO_turbine": "orc_parameters.eta_TO_turbine",
+    "eta_PO_pump": "orc_parameters.eta_PO_pump"
+}
+
+SWEEP_WORKERS = None  # None: 按 CPU 亲和性掩码取可用核数; 1: 在当前进程中依次计算
+SWEEP_CHUNKS_PER_WORKER = 4  # 并行时把热启动路径切成约 n_workers * 此数 段连续的块
+PROPERTY_CACHE_SIZE = 200000
+WARM_START_CACHE_SIZE = 5000
+SCBC_STAGE_CACHE_SIZE = 1000  # SCBC 子循环缓存: 只改变 ORC 参数的扫描点复用已收敛的 SCBC 解
+PARQUET_ROW_GROUP_SIZE = 1000  # Parquet 输出每攒够这么多行写一个 row group
+
+# 输出指标: CSV 列名 -> 由 CycleSimulationResult 计算的函数 (效率单位为 %，与模拟器输出文本一样保留两位小数)
+METRIC_FUNCTIONS = {
+    "Total_Thermal_Efficiency_percent":
+        lambda r: round(r.eta_combined_thermal * 100, 2) if r.eta_combined_thermal is not None else None,
+    "Total_Exergy_Efficiency_percent":
+        lambda r: round(r.eta_combined_exergy * 100, 2) if r.eta_combined_exergy is not None else None,
+    "SCBC_Net_Power_MW": lambda r: round(r.W_net_scbc_MW, 2),
+    "ORC_Net_Power_MW": lambda r: round(r.W_net_orc_MW, 2),
+    "Total_Net_Power_MW": lambda r: round(r.W_net_combined_MW, 2),
+    "Carnot_Efficiency_percent": lambda r: round(r.carnot_efficiency * 100, 2),
+    "Exergy_Eff_to_Carnot_Ratio":
+        lambda r: round(r.eta_combined_exergy * 100, 2) / round(r.carnot_efficiency * 100, 2)
+        if r.eta_combined_exergy is not None else None,
+    "SCBC_Thermal_Efficiency_percent": lambda r: round(r.eta_scbc_thermal * 100, 2),
+    "ORC_Thermal_Efficiency_percent": lambda r: round(r.eta_orc_thermal * 100, 2),
+    "Regen_Iterations": lambda r: r.regen_iterations
+}
+DEFAULT_METRICS = list(METRIC_FUNCTIONS)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(os.path.dirname(SCRIPT_DIR), "output")
+
+
+def resolve_parameter(name):
+    """参数名 -> 设计变量名或 (节, 参数) 元组; 无法识别时抛出 ValueError。"""
+    if name in DESIGN_VARIABLES:
+        return name
+    path = PARAMETER_ALIASES.get(name, name)
+    if path.count(".") != 1:
+        raise ValueError(f"未知的扫描参数: {name} (可用设计变量 {DESIGN_VARIABLES}、简称 "
+                         f"{tuple(PARAMETER_ALIASES)} 或 \"节.参数\")")
+    return tuple(path.split("."))
+
+
+def build_cases(grid, fixed=None):
+    """
+    由 grid ({参数名: 取值列表}) 生成全部扫描点 (笛卡尔积，最后一个参数变化最快，与嵌套循环的顺序相同)。
+    fixed ({参数名: 值}) 为所有扫描点共用的取值。返回 {参数名: 值} 字典列表。
+    """
+    names = list(grid)
+    for name in itertools.chain(names, fixed or {}):
+        resolve_parameter(name)
+    return [dict(fixed or {}, **dict(zip(names, values)))
+            for values in itertools.product(*(list(grid[name]) for name in names))]
+
+
+def case_parameters(case, param_overrides=None):
+    """
+    扫描点 -> 完整的循环参数字典: 设计变量 (缺省取 DEFAULT_DESIGN) 交给 generate_cycle_parameters，
+    其余参数和 param_overrides ({节: {参数: 值}}) 覆盖在生成的参数上。参数生成失败时返回 None。
+    """
+    design = dict(DEFAULT_DESIGN, **{name: value for name, value in case.items() if name in DESIGN_VARIABLES})
+    with contextlib.redirect_stdout(io.StringIO()):
+        params = generate_cycle_parameters(design["theta_5_c"], design["pr_scbc"], design["pr_orc"],
+                                           design["theta_w_c"])
+    if not params:
+        return None
+    for section, values in (param_overrides or {}).items():
+        params.setdefault(section, {}).update(values)
+    for name, value in case.items():
+        target = resolve_parameter(name)
+        if isinstance(target, tuple):
+            params.setdefault(target[0], {})[target[1]] = value
+    return params
+
+
+def metrics_from_result(sim_result, metrics=None):
+    """从 CycleSimulationResult 中计算 metrics (列名列表，默认 DEFAULT_METRICS) 中的指标，模拟失败时全部为 None。"""
+    metrics = metrics or DEFAULT_METRICS
+    if sim_result is None:
+        return {metric: None for metric in metrics}
+    return {metric: METRIC_FUNCTIONS[metric](sim_result) for metric in metrics}
+
+
+def simulate_case(case, metrics=None, param_overrides=None):
+    """计算一个扫描点，返回 (指标字典, 耗时秒数, 错误信息或 None)。"""
+    start_time = time.perf_counter()
+    try:
+        params = case_parameters(case, param_overrides)
+        if params is None:
+            return metrics_from_result(None, metrics), time.perf_counter() - start_time, "参数生成失败"
+        sim_result = full_cycle_simulator.simulate_scbc_orc_cycle(params, verbose=False)
+        error = None if sim_result is not None else "模拟未收敛"
+    except Exception as e:
+        sim_result, error = None, str(e)
+    return metrics_from_result(sim_result, metrics), time.perf_counter() - start_time, error
+
+
+@contextlib.contextmanager
+def sweep_caches():
+    """
+    在当前进程中开启扫描用的热启动、物性和 SCBC 子循环缓存，退出时关闭 (并清空) 其中由这里开启的缓存。
+    调用前已开启的缓存保持原样，扫描结束后模块级缓存状态与调用前相同 (如 simulate_many 要求热启动关闭)。
+    """
+    disable_on_exit = []
+    if not full_cycle_simulator.WARM_START_CACHE_ENABLED:
+        full_cycle_simulator.enable_warm_start_cache(WARM_START_CACHE_SIZE)
+        disable_on_exit.append(full_cycle_simulator.disable_warm_start_cache)
+    if not state_point_calculator.PROPERTY_CACHE_ENABLED:
+        state_point_calculator.enable_property_cache(PROPERTY_CACHE_SIZE)
+        disable_on_exit.append(state_point_calculator.disable_property_cache)
+    if SCBC_STAGE_CACHE_SIZE and not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED:
+        full_cycle_simulator.enable_scbc_stage_cache(SCBC_STAGE_CACHE_SIZE)
+        disable_on_exit.append(full_cycle_simulator.disable_scbc_stage_cache)
+    try:
+        yield
+    finally:
+        for disable_cache in disable_on_exit:
+            disable_cache()
+
+
+def _init_sweep_worker(property_cache_size, warm_start_cache_size, scbc_stage_cache_size):
+    """工作进程初始化: 开启各自的物性缓存、热启动缓存和 SCBC 子循环缓存。"""
+    if property_cache_size:
+        state_point_calculator.enable_property_cache(property_cache_size)
+    if warm_start_cache_size:
+        full_cycle_simulator.enable_warm_start_cache(warm_start_cache_size)
+    if scbc_stage_cache_size:
+        full_cycle_simulator.enable_scbc_stage_cache(scbc_stage_cache_size)
+
+
+def _simulate_chunk(indexed_cases, metrics, param_overrides):
+    """在工作进程中按顺序计算一段热启动路径，返回 [(扫描点序号, 指标字典, 耗时, 错误信息), ...]。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [(i, *simulate_case(case, metrics, param_overrides)) for i, case in indexed_cases]
+
+
+class RowWriter:
+    """
+    逐行写出扫描结果: .csv 每写一批就 flush，中断时已完成的行都在文件里;
+    .parquet 需要 pyarrow，每攒够 PARQUET_ROW_GROUP_SIZE 行写一个 row group。
+    """
+
+    def __init__(self, output_path, columns):
+        self.output_path = output_path
+        self.columns = columns
+        self.parquet = output_path.endswith(".parquet")
+        self.pending = []
+        if self.parquet:
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ImportError("写出 Parquet 需要安装 pyarrow (pip install pyarrow)，或改用 .csv 输出")
+            self.pyarrow = pyarrow
+            self.schema = None
+            self.parquet_writer = None
+        else:
+            self.file = open(output_path, 'w', encoding='utf-8', newline='')
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(columns)
+
+    def write_rows(self, rows):
+        if not self.parquet:
+            self.csv_writer.writerows([[row[column] for column in self.columns] for row in rows])
+            self.file.flush()
+            return
+        self.pending.extend(rows)
+        if len(self.pending) >= PARQUET_ROW_GROUP_SIZE:
+            self._flush_parquet()
+
+    def _flush_parquet(self):
+        if not self.pending:
+            return
+        table = self.pyarrow.Table.from_pylist(self.pending, schema=self.schema)
+        if self.parquet_writer is None:
+            self.schema = table.schema
+            self.parquet_writer = self.pyarrow.parquet.ParquetWriter(self.output_path, self.schema)
+        self.parquet_writer.write_table(table)
+        self.pending = []
+
+    def close(self):
+        if self.parquet:
+            self._flush_parquet()
+            if self.parquet_writer is not None:
+                self.parquet_writer.close()
+        else:
+            self.file.close()
+
+
+def write_rows(output_path, columns, rows):
+    """把全部行一次写入 output_path (先写临时文件再替换)。"""
+    temp_path = output_path + ".tmp" + os.path.splitext(output_path)[1]
+    writer = RowWriter(temp_path, columns)
+    writer.write_rows(rows)
+    writer.close()
+    os.replace(temp_path, output_path)
+
+
+def run_sweep(grid, fixed=None, output_path=None, metrics=None, column_names=None, n_workers=None,
+              param_overrides=None, sort_output=True, verbose=True):
+    """
+    扫描 grid ({参数名: 取值列表}) 的全部组合，fixed 为共用取值，未给出的设计变量取 DEFAULT_DESIGN。
+    - 扫描点按 order_for_continuation 排成热启动路径; n_workers > 1 时把路径切成连续的块派发给进程池，
+      每个工作进程沿自己的路径段热启动。热启动初值随分块变化，结果在求解容差内依赖于工作进程数;
+      需要逐位可复现的输出时用 n_workers=1 (在当前进程中计算，缓存由 sweep_caches 开启并在结束时恢复)
+    - 每个点 (并行时每个块) 完成后立即把结果行写入 output_path (.csv 或 .parquet)，并行时按完成顺序写出，
+      sort_output=True 时结束后按 build_cases 的顺序重写整个文件
+    - 输出列为各扫描参数 (column_names ({参数名: 列名}) 可重命名，fixed 中的参数不输出) 和 metrics
+      (METRIC_FUNCTIONS 的键，默认全部)
+    返回按 build_cases 顺序排列的结果行字典列表，模拟失败的点指标为 None。
+    """
+    cases = build_cases(grid, fixed)
+    names = list(grid)
+    metrics = metrics or DEFAULT_METRICS
+    column_names = column_names or {}
+    columns = [column_names.get(name, name) for name in names] + list(metrics)
+    n_workers = n_workers or SWEEP_WORKERS or default_worker_count()
+    n_workers = min(n_workers, len(cases)) or 1
+
+    order = full_cycle_simulator.order_for_continuation([[case[name] for name in grid] for case in cases])
+    rows_by_index = {}
+    writer = RowWriter(output_path, columns) if output_path else None
+    start_time = time.time()
+    if verbose:
+        print(f"开始扫描 {', '.join(grid)}: 共 {len(cases)} 个点, 工作进程 {n_workers}"
+              + (f", 结果写入 {output_path}" if output_path else ""))
+
+    def record(i, metric_values, eval_time_s, error):
+        row = {column_names.get(name, name): cases[i][name] for name in names}
+        row.update(metric_values)
+        rows_by_index[i] = row
+        if verbose:
+            point = ", ".join(f"{name}={cases[i][name]:.4g}" for name in grid)
+            status = f"失败: {error}" if error else ", ".join(f"{metric}={metric_values[metric]}" for metric in
+                                                              list(metrics)[:2])
+            print(f"  [{len(rows_by_index)}/{len(cases)}] {point}: {status} ({eval_time_s:.2f} 秒)")
+        return row
+
+    try:
+        if n_workers == 1:
+            with sweep_caches():
+                for i in order:
+                    row = record(i, *simulate_case(cases[i], metrics, param_overrides))
+                    if writer:
+                        writer.write_rows([row])
+        else:
+            chunk_size = max(1, math.ceil(len(order) / (n_workers * SWEEP_CHUNKS_PER_WORKER)))
+            chunks = [[(i, cases[i]) for i in order[start:start + chunk_size]]
+                      for start in range(0, len(order), chunk_size)]
+            with multiprocessing.Pool(n_workers, initializer=_init_sweep_worker,
+                                      initargs=(PROPERTY_CACHE_SIZE, WARM_START_CACHE_SIZE, SCBC_STAGE_CACHE_SIZE)) as pool:
+                simulate_chunk = functools.partial(_simulate_chunk, metrics=metrics, param_overrides=param_overrides)
+                for chunk_results in pool.imap_unordered(simulate_chunk, chunks):  # 按完成顺序收集，各块完成即写出
+                    rows = [record(*result) for result in chunk_results]
+                    if writer:
+                        writer.write_rows(rows)
+    finally:
+        if writer:
+            writer.close()
+
+    rows = [rows_by_index[i] for i in sorted(rows_by_index)]
+    if output_path and sort_output and len(rows) == len(cases):
+        write_rows(output_path, columns, rows)
+    if verbose:
+        n_failed = sum(1 for row in rows if all(row[metric] is None for metric in metrics))
+        print(f"扫描结束: {len(rows)} 个点 ({n_failed} 个失败)，耗时 {time.time() - start_time:.2f} 秒")
+    return rows
+
+
+def parse_grid_argument(text):
+    """命令行扫描参数: "名称=起点:终点:点数" (等间距，含两端) 或 "名称=值1,值2,..."。返回 (名称, 取值列表)。"""
+    name, _, values = text.partition("=")
+    if ":" in values:
+        start, stop, num = values.split(":")
+        return name, list(np.linspace(float(start), float(stop), int(num)))
+    return name, [float(value) for value in values.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SCBC/ORC联合循环通用参数扫描。")
+    parser.add_argument("--param", action="append", required=True, type=parse_grid_argument,
+                        help="扫描参数，如 pr_scbc=2.2:4.0:19 或 theta_w_c=110,120,130 或 eta_T_turbine=0.85,0.9 (可重复)")
+    parser.add_argument("--fixed", action="append", default=[], type=parse_grid_argument,
+                        help="固定参数，如 theta_5_c=599.85 (可重复)")
+    parser.add_argument("--output", default=os.path.join(OUTPUT_DIR, "sweep_results.csv"),
+                        help="输出文件 (.csv 或 .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="并行工作进程数 (默认 SWEEP_WORKERS)")
+    args = parser.parse_args()
+    run_sweep(dict(args.param), {name: values[0] for name, values in args.fixed}, args.output,
+              n_workers=args.workers)
@@ -0,0 +1,36 @@
+import os
+import sys
+
+# 代码是 code/ 下的平铺脚本 (互相以模块名导入)，测试时把该目录加入导入路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
+
+import pytest
+
+import full_cycle_simulator
+import genetic_algorithm_optimizer as ga
+import state_point_calculator
+
+GA_POPULATION_SIZE = 12
+
+
+@pytest.fixture
+def ga_output(monkeypatch, tmp_path):
+    """把 GA 的输出文件改到临时目录并缩小种群，结束时关闭 GA 在本进程中开启的缓存；返回切换输出目录的函数。"""
+    monkeypatch.setattr(ga, "POPULATION_SIZE", GA_POPULATION_SIZE)
+
+    def use_output_dir(name):
+        output_dir = tmp_path / name
+        output_dir.mkdir()
+        monkeypatch.setattr(ga, "OUTPUT_DIR", str(output_dir))
+        monkeypatch.setattr(ga, "FITNESS_CACHE_FILE", str(output_dir / "ga_fitness_cache.csv"))
+        monkeypatch.setattr(ga, "SURROGATE_LOG_FILE", str(output_dir / "ga_surrogate_log.csv"))
+        monkeypatch.setattr(ga, "CHECKPOINT_FILE", str(output_dir / "ga_checkpoint.pkl"))
+        monkeypatch.setattr(ga, "STEADY_STATE_TIMING_FILE", str(output_dir / "ga_steady_state_timing.csv"))
+        full_cycle_simulator.disable_warm_start_cache()
+        full_cycle_simulator.disable_scbc_stage_cache()
+        return output_dir
+
+    yield use_output_dir
+    full_cycle_simulator.disable_warm_start_cache()
+    full_cycle_simulator.disable_scbc_stage_cache()
+    state_point_calculator.disable_property_cache()
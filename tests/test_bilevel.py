@@ -0,0 +1,54 @@
+# 双层优化: 内层只求解一次 SCBC，外层返回日志中适应度最高的设计点
+import csv
+
+import numpy as np
+import pytest
+
+import bilevel_optimizer
+import full_cycle_simulator
+import genetic_algorithm_optimizer as ga
+import state_point_calculator
+
+SCBC_GENES = {"theta_5_c": 580.0, "pr_scbc": 3.2}
+
+
+@pytest.fixture(autouse=True)
+def small_bilevel_problem(monkeypatch, tmp_path):
+    monkeypatch.setattr(bilevel_optimizer, "BILEVEL_LOG_FILE", str(tmp_path / "bilevel_optimization_log.csv"))
+    monkeypatch.setattr(bilevel_optimizer, "INNER_MAX_ITERATIONS", 10)
+    yield
+    full_cycle_simulator.disable_warm_start_cache()
+    full_cycle_simulator.disable_scbc_stage_cache()
+    state_point_calculator.disable_property_cache()
+
+
+def test_orc_subproblem_solves_scbc_once():
+    inner = bilevel_optimizer.solve_orc_subproblem(SCBC_GENES, bilevel_optimizer.PARAM_OVERRIDES, grid_points=3)
+    assert inner["n_scbc_solves"] == 1
+    assert inner["n_orc_evaluations"] > 9
+    assert {var_name: inner["genes"][var_name] for var_name in bilevel_optimizer.SCBC_VAR_NAMES} == SCBC_GENES
+    lower, upper = ga.gene_bounds()
+    genes = np.array([inner["genes"][var_name] for var_name in ga.VAR_NAMES])
+    assert np.all((genes >= lower) & (genes <= upper))
+
+    # 返回的适应度就是该设计点的完整模拟结果，且不差于 ORC 网格中心点
+    full_cycle_simulator.disable_scbc_stage_cache()
+    sim_results = ga.run_simulation_inprocess(inner["genes"], bilevel_optimizer.PARAM_OVERRIDES)
+    assert inner["fitness"] == pytest.approx(ga.fitness_from_metrics(sim_results), abs=1e-9)
+    centre = dict(SCBC_GENES, theta_w_c=115.0, pr_orc=3.1)
+    centre_results = ga.run_simulation_inprocess(centre, bilevel_optimizer.PARAM_OVERRIDES)
+    assert inner["fitness"] >= ga.fitness_from_metrics(centre_results)
+
+
+def test_bilevel_optimization_returns_best_logged_point():
+    best = bilevel_optimizer.run_bilevel_optimization(n_workers=1, outer_grid_points=2, inner_grid_points=3,
+                                                      outer_max_iterations=2)
+    with open(bilevel_optimizer.BILEVEL_LOG_FILE, encoding="utf-8", newline="") as log_file:
+        log = list(csv.DictReader(log_file))
+    assert [row["Stage"] for row in log[:4]] == ["grid"] * 4
+    assert best["n_outer_points"] == len(log) == best["n_scbc_solves"]
+    assert best["n_orc_evaluations"] == sum(int(row["ORC_Evaluations"]) for row in log)
+    assert best["fitness"] == pytest.approx(max(float(row["Fitness"]) for row in log), abs=1e-8)
+    # 串行运行中开启的缓存在结束后关闭
+    assert not state_point_calculator.PROPERTY_CACHE_ENABLED
+    assert not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED
@@ -0,0 +1,83 @@
+# 遗传算法适应度缓存: 量化键、缓存文件读写，以及第二次运行直接复用缓存
+import csv
+import random
+
+import genetic_algorithm_optimizer as ga
+
+
+def read_log(output_dir):
+    with open(output_dir / "ga_optimization_log.csv", encoding="utf-8", newline="") as log_file:
+        return list(csv.DictReader(log_file))
+
+
+def test_cache_key_merges_genes_within_one_quantum():
+    genes = {"theta_5_c": 580.0, "pr_scbc": 3.2, "theta_w_c": 120.0, "pr_orc": 3.0}
+    nearby = dict(genes, theta_5_c=580.0 + 0.3 * ga.FITNESS_CACHE_QUANTUM["theta_5_c"])
+    distinct = dict(genes, theta_5_c=580.0 + 2 * ga.FITNESS_CACHE_QUANTUM["theta_5_c"])
+    assert ga.fitness_cache_key(nearby) == ga.fitness_cache_key(genes)
+    assert ga.fitness_cache_key(distinct) != ga.fitness_cache_key(genes)
+
+
+ENTRIES = {
+    ga.fitness_cache_key({"theta_5_c": 580.0, "pr_scbc": 3.2, "theta_w_c": 120.0, "pr_orc": 3.0}):
+        {"thermal_efficiency": 0.4312345678901234, "exergy_efficiency": 0.6312345678901234, "cost": None},
+    ga.fitness_cache_key({"theta_5_c": 500.0, "pr_scbc": 2.2, "theta_w_c": 100.0, "pr_orc": 2.2}):
+        {"thermal_efficiency": None, "exergy_efficiency": None, "cost": None},
+}
+
+
+def write_cache(cache_filename, fingerprint):
+    with open(cache_filename, "w", encoding="utf-8", newline="") as cache_file:
+        cache_writer = csv.writer(cache_file)
+        ga.write_fitness_cache_header(cache_writer, fingerprint)
+        for key, sim_results in ENTRIES.items():
+            ga.append_fitness_cache(cache_writer, key, sim_results)
+        cache_file.write("580,3.2")  # 中断时写了一半的行被跳过
+
+
+def test_cache_file_round_trip(tmp_path):
+    cache_filename = tmp_path / "ga_fitness_cache.csv"
+    fingerprint = ga.model_fingerprint()
+    write_cache(cache_filename, fingerprint)
+    assert ga.load_fitness_cache(str(cache_filename), fingerprint) == ENTRIES
+
+
+def test_cache_from_another_model_is_discarded(tmp_path):
+    # 适应度计算后端也是模型的一部分
+    assert ga.model_fingerprint("subprocess") != ga.model_fingerprint("inprocess")
+    cache_filename = tmp_path / "ga_fitness_cache.csv"
+    write_cache(cache_filename, ga.model_fingerprint("subprocess"))
+    assert ga.load_fitness_cache(str(cache_filename), ga.model_fingerprint("inprocess")) == {}
+    assert not cache_filename.exists()
+
+
+def test_previous_log_needs_matching_fingerprint(tmp_path):
+    log_filename = str(tmp_path / "ga_optimization_log.csv")
+    with open(log_filename, "w", encoding="utf-8", newline="") as log_file:
+        log_writer = csv.writer(log_file)
+        log_writer.writerow(["Generation", "Individual"] + ga.VAR_NAMES +
+                            ["Fitness", "ThermalEfficiency", "ExergyEfficiency", "Cost", "Backend", "EvalTime_s"])
+        log_writer.writerow([1, 1, 580.0, 3.2, 120.0, 3.0, 0.5, 0.43, 0.63, "N/A", "inprocess", 0.1])
+        log_writer.writerow([1, 2, 590.0, 3.3, 121.0, 3.1, 0.5, 0.44, 0.64, "N/A", "surrogate", 0.0])
+    fingerprint = ga.model_fingerprint()
+    # 没有指纹文件的旧日志不用作训练数据
+    assert ga.load_surrogate_training_data(log_filename, fingerprint) == {}
+    ga.write_log_fingerprint(log_filename, fingerprint)
+    assert list(ga.load_surrogate_training_data(log_filename, fingerprint)) == [ga.fitness_cache_key(
+        {"theta_5_c": 580.0, "pr_scbc": 3.2, "theta_w_c": 120.0, "pr_orc": 3.0})]
+    assert ga.load_surrogate_training_data(log_filename, ga.model_fingerprint("subprocess")) == {}
+
+
+def test_second_run_is_served_from_cache(ga_output, monkeypatch):
+    output_dir = ga_output("run")
+    monkeypatch.setattr(ga, "MAX_GENERATIONS", 2)
+    random.seed(2024)
+    ga.run_genetic_algorithm(backend="inprocess", n_workers=1)
+    first_log = read_log(output_dir)
+    random.seed(2024)
+    ga.run_genetic_algorithm(backend="inprocess", n_workers=1)
+    second_log = read_log(output_dir)
+
+    assert len(second_log) == len(first_log) == 2 * ga.POPULATION_SIZE
+    assert {row["Backend"] for row in second_log} == {"cache"}
+    assert [row["Fitness"] for row in second_log] == [row["Fitness"] for row in first_log]
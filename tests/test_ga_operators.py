@@ -0,0 +1,64 @@
+# 种群矩阵上的向量化算子: 选择、交叉、变异和生成下一代
+import numpy as np
+
+import genetic_algorithm_optimizer as ga
+
+
+def random_population(rng, n_individuals=200):
+    lower, upper = ga.gene_bounds()
+    return rng.uniform(lower, upper, size=(n_individuals, len(ga.VAR_NAMES)))
+
+
+def test_tournament_winner_is_best_contestant(monkeypatch):
+    monkeypatch.setattr(ga, "TOURNAMENT_SIZE", 50)
+    fitness = np.arange(100, dtype=float)
+    winners = ga.tournament_selection_matrix(fitness, 1000, np.random.default_rng(0))
+    assert winners.shape == (1000,)
+    # 50 人锦标赛几乎总能选到排名靠前的个体，永远选不到最差的个体
+    assert fitness[winners].mean() > 90
+    assert fitness[winners].min() > 0
+
+
+def test_crossover_blends_within_bounds(monkeypatch):
+    monkeypatch.setattr(ga, "CROSSOVER_PROBABILITY", 1.0)
+    rng = np.random.default_rng(1)
+    parents1, parents2 = random_population(rng), random_population(rng)
+    children1, children2 = ga.crossover_matrix(parents1, parents2, rng)
+    np.testing.assert_allclose(children1, 0.5 * (parents1 + parents2))
+    np.testing.assert_allclose(children2, children1)
+
+    monkeypatch.setattr(ga, "CROSSOVER_PROBABILITY", 0.0)
+    children1, children2 = ga.crossover_matrix(parents1, parents2, rng)
+    np.testing.assert_array_equal(children1, parents1)
+    np.testing.assert_array_equal(children2, parents2)
+
+
+def test_mutation_stays_within_bounds():
+    rng = np.random.default_rng(2)
+    genes = random_population(rng, 2000)
+    mutated = ga.mutate_matrix(genes, rng)
+    lower, upper = ga.gene_bounds()
+    assert np.all((mutated >= lower) & (mutated <= upper))
+    changed = np.mean(mutated != genes)
+    assert abs(changed - ga.MUTATION_PROBABILITY) < 0.03
+
+
+def test_breed_keeps_elite_and_population_size():
+    rng = np.random.default_rng(3)
+    genes = random_population(rng, 51)
+    fitness = rng.random(51)
+    next_genes = ga.breed_next_population(genes, fitness, rng)
+    assert next_genes.shape == genes.shape
+    np.testing.assert_array_equal(next_genes[0], genes[np.argmax(fitness)])
+    lower, upper = ga.gene_bounds()
+    assert np.all((next_genes >= lower) & (next_genes <= upper))
+
+
+def test_elite_is_taken_from_simulated_rows():
+    rng = np.random.default_rng(4)
+    genes = random_population(rng, 10)
+    fitness = np.linspace(0.5, 0.4, 10)
+    simulated = np.arange(10) >= 3  # 前三行的适应度为代理模型预测值
+    next_genes = ga.breed_next_population(genes, fitness, np.random.default_rng(5), simulated)
+    np.testing.assert_array_equal(next_genes[0], genes[3])
+    assert ga.elite_index(fitness, np.zeros(10, dtype=bool)) == 0
@@ -0,0 +1,51 @@
+# 进程池评估: 结果按个体顺序返回，与逐个在主进程中评估一致；超时的个体记为无效
+import pytest
+
+import genetic_algorithm_optimizer as ga
+
+GENES = [
+    (599.85, 3.27, 127.76, 3.37),
+    (550.0, 2.6, 115.0, 2.8),
+    (600.0, 3.3, 112.0, 4.0),
+    (520.0, 3.8, 105.0, 2.4),
+    (580.0, 2.9, 125.0, 3.6),
+    (560.0, 3.5, 120.0, 3.0),
+]
+
+
+@pytest.fixture(scope="module")
+def population():
+    return [{"genes": dict(zip(ga.VAR_NAMES, genes))} for genes in GENES]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ga.create_worker_pool(2) as worker_pool:
+        yield worker_pool
+
+
+def test_parallel_results_follow_population_order(population, pool):
+    serial = [ga.run_simulation_inprocess(ind["genes"]) for ind in population]
+    # 块大小 1: 相邻个体落在不同工作进程，完成顺序与派发顺序不同
+    results, worker_cache_stats, pool_broken = ga.evaluate_population_parallel(population, pool, 2, chunk_size=1)
+    assert not pool_broken
+    assert len(results) == len(population)
+    assert worker_cache_stats
+    for (sim_results, eval_time_s, _), expected in zip(results, serial):
+        assert eval_time_s > 0
+        # 工作进程不使用热启动，结果与主进程中的冷启动逐位一致
+        assert sim_results == expected
+    # 与分块方式 (调度) 无关
+    results, _, _ = ga.evaluate_population_parallel(population, pool, 2, chunk_size=3)
+    assert [sim_results for sim_results, _, _ in results] == serial
+
+
+def test_timed_out_individual_is_invalid(population, pool):
+    # 工作进程未评估过的 SCBC 参数，不会命中 SCBC 子循环缓存
+    unseen = [{"genes": dict(ind["genes"], theta_5_c=ind["genes"]["theta_5_c"] - 10.0)} for ind in population[:2]]
+    results, _, _ = ga.evaluate_population_parallel(unseen, pool, 2, chunk_size=1, timeout_s=1e-3)
+    assert [sim_results for sim_results, _, _ in results] == [None, None]
+    # 工作进程在超时后继续可用
+    results, _, pool_broken = ga.evaluate_population_parallel(population[:2], pool, 2, chunk_size=1)
+    assert not pool_broken
+    assert all(sim_results["thermal_efficiency"] is not None for sim_results, _, _ in results)
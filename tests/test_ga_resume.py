@@ -0,0 +1,40 @@
+# 遗传算法检查点续算: 中断后续算的日志应与不中断的运行逐行一致 (耗时列除外)
+import csv
+import random
+
+import pytest
+
+import full_cycle_simulator
+import genetic_algorithm_optimizer as ga
+
+GENERATIONS = 3
+INTERRUPT_AFTER = 2  # 在第 2 代的检查点之后中断
+
+
+def run_ga(monkeypatch, generations, n_workers, resume=False):
+    monkeypatch.setattr(ga, "MAX_GENERATIONS", generations)
+    if not resume:
+        random.seed(2024)
+    return ga.run_genetic_algorithm(n_workers=n_workers, resume=resume)
+
+
+def read_log(output_dir):
+    with open(output_dir / "ga_optimization_log.csv", encoding="utf-8", newline="") as log_file:
+        return [row[:-1] for row in csv.reader(log_file)]  # 去掉 EvalTime_s 列
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_resumed_run_matches_uninterrupted_run(monkeypatch, ga_output, n_workers):
+    uninterrupted_dir = ga_output("uninterrupted")
+    best_uninterrupted = run_ga(monkeypatch, GENERATIONS, n_workers)
+
+    resumed_dir = ga_output("resumed")
+    run_ga(monkeypatch, INTERRUPT_AFTER, n_workers)
+    # 模拟中断: 进程内的缓存随进程一起丢失，只剩检查点
+    full_cycle_simulator.disable_warm_start_cache()
+    full_cycle_simulator.disable_scbc_stage_cache()
+    best_resumed = run_ga(monkeypatch, GENERATIONS, n_workers, resume=True)
+
+    assert read_log(resumed_dir) == read_log(uninterrupted_dir)
+    assert best_resumed["genes"] == best_uninterrupted["genes"]
+    assert best_resumed["fitness"] == best_uninterrupted["fitness"]
@@ -0,0 +1,77 @@
+# GA + 局部精修混合优化器和 CMA-ES: 设计点记忆化、精修不劣于起点、CMA-ES 遵守模拟次数上限
+import csv
+
+import numpy as np
+import pytest
+
+import genetic_algorithm_optimizer as ga
+import hybrid_optimizer
+
+START_GENES = {"theta_5_c": 560.0, "pr_scbc": 3.0, "theta_w_c": 115.0, "pr_orc": 3.0}
+
+
+@pytest.fixture(autouse=True)
+def hybrid_log(monkeypatch, tmp_path):
+    log_filename = tmp_path / "hybrid_optimization_log.csv"
+    monkeypatch.setattr(hybrid_optimizer, "HYBRID_LOG_FILE", str(log_filename))
+    return log_filename
+
+
+def test_scaling_round_trip():
+    lower, upper = ga.gene_bounds()
+    genes = np.vstack([lower, upper, (lower + upper) / 2])
+    np.testing.assert_allclose(hybrid_optimizer.scale_genes(genes), [[0.0] * 4, [1.0] * 4, [0.5] * 4])
+    np.testing.assert_allclose(hybrid_optimizer.unscale_genes(hybrid_optimizer.scale_genes(genes)), genes)
+
+
+def test_evaluator_simulates_each_design_once():
+    evaluator = hybrid_optimizer.DesignEvaluator(n_workers=1)
+    try:
+        x = hybrid_optimizer.scale_genes([[START_GENES[var_name] for var_name in ga.VAR_NAMES]])[0]
+        objective, gradient = evaluator.objective_and_gradient(x)
+        assert evaluator.n_simulations == 1 + len(ga.VAR_NAMES)
+        assert objective < 0 and np.all(np.isfinite(gradient))
+        # 中心点和扰动点都已记忆化
+        assert evaluator.objective(x) == objective
+        evaluator.evaluate(np.vstack([x, x]))
+        assert evaluator.n_simulations == 1 + len(ga.VAR_NAMES)
+        assert evaluator.result(x)["fitness"] == -objective
+    finally:
+        evaluator.close()
+
+
+def test_refinement_does_not_lose_fitness(hybrid_log):
+    best = hybrid_optimizer.refine_solution(START_GENES, method="L-BFGS-B", n_workers=1, max_iterations=3,
+                                            log_filename=str(hybrid_log))
+    assert best["fitness"] >= best["start_fitness"]
+    assert best["n_simulations"] > 1
+    lower, upper = ga.gene_bounds()
+    genes = np.array([best["genes"][var_name] for var_name in ga.VAR_NAMES])
+    assert np.all((genes >= lower) & (genes <= upper))
+
+
+def test_cma_es_respects_evaluation_budget(hybrid_log):
+    best = hybrid_optimizer.run_cma_es(n_workers=1, max_evaluations=24, population_size=8, x0=START_GENES, seed=0)
+    with open(hybrid_log, encoding="utf-8", newline="") as log_file:
+        log = list(csv.DictReader(log_file))
+    assert best["n_simulations"] == len(log) <= 24
+    assert {row["Stage"] for row in log} == {"cma-es"}
+    # 返回的是所有真实模拟中适应度最高的设计点
+    assert best["fitness"] == pytest.approx(max(float(row["Fitness"]) for row in log), abs=1e-8)
+
+
+def test_evaluator_keeps_designs_closer_than_the_ga_cache_quantum():
+    evaluator = hybrid_optimizer.DesignEvaluator(n_workers=1)
+    try:
+        x = hybrid_optimizer.scale_genes([[START_GENES[var_name] for var_name in ga.VAR_NAMES]])[0]
+        # θ5 相差 0.003 °C: 落在同一个适应度缓存量化格内，但仍是不同的设计点
+        nearby = x + np.array([0.003 / 100.0, 0.0, 0.0, 0.0])
+        cache_keys = ga.fitness_cache_keys(hybrid_optimizer.unscale_genes(np.vstack([x, nearby])))
+        assert cache_keys[0] == cache_keys[1]
+        evaluator.evaluate(np.vstack([x, nearby]))
+        assert evaluator.n_simulations == 2
+        # 超出 [0, 1] 的点截断到边界后与边界点是同一个设计点
+        evaluator.evaluate(np.array([[1.2, 0.5, 0.5, 0.5], [1.0, 0.5, 0.5, 0.5]]))
+        assert evaluator.n_simulations == 3
+    finally:
+        evaluator.close()
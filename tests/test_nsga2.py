@@ -0,0 +1,70 @@
+# NSGA-II: 非支配排序、拥挤距离和 Pareto 存档
+import numpy as np
+
+import genetic_algorithm_optimizer as ga
+import nsga2_optimizer
+
+
+def naive_ranks(values):
+    """逐层剥离前沿的朴素实现 (越大越好)，用作对照。"""
+    ranks = np.full(len(values), -1)
+    remaining, rank = set(range(len(values))), 0
+    while remaining:
+        front = {i for i in remaining
+                 if not any(np.all(values[j] >= values[i]) and np.any(values[j] > values[i]) for j in remaining)}
+        for i in front:
+            ranks[i] = rank
+        remaining -= front
+        rank += 1
+    return ranks
+
+
+def test_fast_non_dominated_sort_matches_naive_sort():
+    rng = np.random.default_rng(0)
+    # 取整制造并列和重复点
+    values = np.round(rng.random((80, 2)) * 10)
+    np.testing.assert_array_equal(nsga2_optimizer.fast_non_dominated_sort(values), naive_ranks(values))
+
+
+def test_crowding_distance_on_a_single_front():
+    values = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0], [-np.inf, -np.inf]])
+    ranks = nsga2_optimizer.fast_non_dominated_sort(values)
+    assert list(ranks) == [0, 0, 0, 0, 1]
+    distance = nsga2_optimizer.crowding_distance(values, ranks)
+    assert np.isinf(distance[0]) and np.isinf(distance[3])
+    # 内部点: 每个目标上相邻两点的间距除以该目标在前沿上的跨度，再对两个目标求和
+    np.testing.assert_allclose(distance[1:3], [(3 / 4) * 2, (3 / 4) * 2])
+    assert distance[4] == 0.0  # 模拟失败的行
+
+
+def test_archive_keeps_only_feasible_unique_non_dominated_points():
+    genes = np.array([[550.0, 3.0, 115.0, 3.0],
+                      [560.0, 3.1, 116.0, 3.1],
+                      [570.0, 3.2, 117.0, 3.2],
+                      [550.0, 3.0, 115.0, 3.0],  # 与第一行重复
+                      [580.0, 3.3, 118.0, 3.3]])
+    values = np.array([[0.40, 0.60], [0.42, 0.58], [0.39, 0.59], [0.40, 0.60], [-np.inf, -np.inf]])
+    archive_genes, archive_values = nsga2_optimizer.update_pareto_archive(
+        np.empty((0, len(ga.VAR_NAMES))), np.empty((0, 2)), genes, values)
+    np.testing.assert_array_equal(archive_genes, genes[:2])
+    np.testing.assert_array_equal(archive_values, values[:2])
+
+    # 新点支配存档中的一个点
+    archive_genes, archive_values = nsga2_optimizer.update_pareto_archive(
+        archive_genes, archive_values, np.array([[590.0, 3.4, 119.0, 3.4]]), np.array([[0.43, 0.59]]))
+    np.testing.assert_array_equal(archive_values, [[0.40, 0.60], [0.43, 0.59]])
+
+
+def test_archive_round_trip_and_weighted_query(tmp_path):
+    archive_filename = str(tmp_path / "nsga2_pareto_archive.csv")
+    genes = np.array([[550.0, 3.0, 115.0, 3.0], [590.0, 3.4, 119.0, 3.4]])
+    metrics = [{"thermal_efficiency": 0.43, "exergy_efficiency": 0.59, "cost": None},
+               {"thermal_efficiency": 0.40, "exergy_efficiency": 0.62, "cost": None}]
+    nsga2_optimizer.save_pareto_archive(archive_filename, genes, metrics)
+    archive = nsga2_optimizer.load_pareto_archive(archive_filename)
+    # 按热效率升序保存
+    np.testing.assert_array_equal(archive[0], genes[::-1])
+    assert archive[1] == metrics[::-1]
+
+    assert nsga2_optimizer.best_for_weights(1.0, 0.0, 0.0, archive)["genes"]["theta_5_c"] == 550.0
+    assert nsga2_optimizer.best_for_weights(0.0, 1.0, 0.0, archive)["genes"]["theta_5_c"] == 590.0
@@ -0,0 +1,88 @@
+# 批量计算 simulate_many 与逐个计算 simulate_scbc_orc_cycle 的一致性
+import numpy as np
+import pytest
+
+import full_cycle_simulator
+import modify_cycle_parameters
+
+DESIGN_LOWER = np.array([500.0, 2.2, 100.0, 2.2])  # (θ5 °C, PR_SCBC, θw °C, PR_ORC)，与 GA 的基因范围相同
+DESIGN_UPPER = np.array([600.0, 4.0, 130.0, 4.0])
+RESULT_FIELDS = ("W_net_scbc_MW", "W_net_orc_MW", "Q_er_MW", "Q_go_MW", "m_dot_total_kg_s", "m_dot_orc_kg_s",
+                 "eta_scbc_thermal", "eta_orc_thermal", "eta_combined_thermal", "eta_combined_exergy")
+
+
+def random_designs(n_designs, seed):
+    """随机设计点加上两个角点。"""
+    rng = np.random.default_rng(seed)
+    designs = DESIGN_LOWER + rng.random((n_designs, 4)) * (DESIGN_UPPER - DESIGN_LOWER)
+    return np.vstack([designs, DESIGN_LOWER, DESIGN_UPPER])
+
+
+def design_params(designs, **scbc_overrides):
+    params_list = [modify_cycle_parameters.generate_cycle_parameters(t5_c, pr_scbc, pr_orc, theta_w_c)
+                   for t5_c, pr_scbc, theta_w_c, pr_orc in designs]
+    for params in params_list:
+        params["scbc_parameters"].update(scbc_overrides)
+    return params_list
+
+
+@pytest.fixture(autouse=True)
+def no_simulator_caches():
+    full_cycle_simulator.disable_warm_start_cache()
+    full_cycle_simulator.disable_scbc_stage_cache()
+    yield
+
+
+@pytest.mark.parametrize("regen_accelerator", ["wegstein", "substitution"])
+def test_simulate_many_matches_single_design(regen_accelerator):
+    designs = random_designs(6, seed=7)
+    params_list = design_params(designs, regen_accelerator=regen_accelerator)
+    batch = full_cycle_simulator.simulate_many(designs, params_list)
+
+    for i, params in enumerate(params_list):
+        single = full_cycle_simulator.simulate_scbc_orc_cycle(params, verbose=False)
+        assert single is not None
+        assert batch["valid"][i]
+        for field in RESULT_FIELDS:
+            assert batch[field][i] == pytest.approx(getattr(single, field), rel=1e-6, abs=1e-8), field
+
+
+@pytest.mark.parametrize("scbc_overrides, orc_overrides", [
+    ({"mass_flow_solve_mode": "iterative"}, {}),
+    ({"mass_flow_solve_mode": "equation_oriented"}, {}),
+    ({"regen_accelerator": "anderson"}, {}),
+    ({}, {"orc_mdot_solve_mode": "search"}),
+])
+def test_simulate_many_rejects_unsupported_modes(scbc_overrides, orc_overrides):
+    designs = random_designs(1, seed=0)
+    params_list = design_params(designs, **scbc_overrides)
+    for params in params_list:
+        params["orc_parameters"].update(orc_overrides)
+    with pytest.raises(ValueError):
+        full_cycle_simulator.simulate_many(designs, params_list)
+
+
+def test_simulate_many_rejects_warm_start():
+    full_cycle_simulator.enable_warm_start_cache()
+    try:
+        with pytest.raises(ValueError):
+            full_cycle_simulator.simulate_many(random_designs(1, seed=0))
+    finally:
+        full_cycle_simulator.disable_warm_start_cache()
+
+
+def test_simulate_many_rejects_mixed_regen_accelerators():
+    designs = random_designs(1, seed=0)
+    params_list = design_params(designs, regen_accelerator="wegstein") + \
+        design_params(designs, regen_accelerator="substitution")
+    with pytest.raises(ValueError):
+        full_cycle_simulator.simulate_many(np.vstack([designs, designs]), params_list)
+
+
+def test_non_finite_compressor_efficiency_is_invalid():
+    designs = random_designs(1, seed=0)
+    params_list = design_params(designs)
+    params_list[1]["scbc_parameters"]["eta_C_compressor"] = float("nan")
+    batch = full_cycle_simulator.simulate_many(designs, params_list)
+    assert list(batch["valid"]) == [True, False, True]
+    assert np.isnan(batch["eta_combined_thermal"][1])
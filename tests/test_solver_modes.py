@@ -0,0 +1,161 @@
+# 求解方式一致性: 默认求解方式与原始 (legacy) 方式在收紧的容差下应给出相同的效率
+import pytest
+
+import full_cycle_simulator
+import modify_cycle_parameters
+from state_point_calculator import StatePoint
+
+# (θ5 °C, PR_SCBC, θw °C, PR_ORC): 论文设计点、范围中部和 θ5 = 600 °C、PR_ORC = 4.0 的边界点
+DESIGNS = [
+    (599.85, 3.27, 127.76, 3.37),
+    (550.0, 2.6, 115.0, 2.8),
+    (600.0, 3.3, 112.0, 4.0),
+    (600.0, 4.0, 130.0, 4.0),
+]
+TOL_SCBC_H_KJ_KG = 1e-4  # 默认 0.1 kJ/kg 时不同求解方式的效率差约 1e-4，收紧后约 1e-7
+EFFICIENCY_TOL = 1e-6
+
+
+def design_params(design, scbc_overrides=None, orc_overrides=None):
+    t5_c, pr_scbc, theta_w_c, pr_orc = design
+    params = modify_cycle_parameters.generate_cycle_parameters(t5_c, pr_scbc, pr_orc, theta_w_c)
+    params["scbc_parameters"]["tol_scbc_h_kJ_kg"] = TOL_SCBC_H_KJ_KG
+    params["scbc_parameters"].update(scbc_overrides or {})
+    params["orc_parameters"].update(orc_overrides or {})
+    return params
+
+
+def simulate(design, scbc_overrides=None, orc_overrides=None, warm_start=None):
+    result = full_cycle_simulator.simulate_scbc_orc_cycle(design_params(design, scbc_overrides, orc_overrides),
+                                                          verbose=False, warm_start=warm_start)
+    assert result is not None
+    return result
+
+
+def assert_same_efficiencies(result, reference):
+    for field in ("eta_combined_thermal", "eta_combined_exergy", "eta_scbc_thermal", "eta_orc_thermal"):
+        assert getattr(result, field) == pytest.approx(getattr(reference, field), abs=EFFICIENCY_TOL), field
+
+
+@pytest.mark.parametrize("design", DESIGNS)
+def test_per_kg_matches_iterative_mass_flow(design):
+    assert_same_efficiencies(simulate(design, {"mass_flow_solve_mode": "iterative"}), simulate(design))
+
+
+@pytest.mark.parametrize("design", DESIGNS)
+def test_direct_orc_mdot_matches_search(design):
+    search = simulate(design, orc_overrides={"orc_mdot_solve_mode": "search"})
+    direct = simulate(design)
+    assert_same_efficiencies(search, direct)
+    assert search.m_dot_orc_kg_s == pytest.approx(direct.m_dot_orc_kg_s, rel=1e-6)
+
+
+@pytest.mark.parametrize("regen_accelerator", ["substitution", "anderson", "secant"])
+@pytest.mark.parametrize("design", DESIGNS)
+def test_wegstein_regen_matches_other_accelerators(design, regen_accelerator):
+    # 逐次代换收敛慢，收紧容差后 20 次迭代不够
+    other = simulate(design, {"regen_accelerator": regen_accelerator, "max_iter_scbc_main_loop": 200})
+    assert_same_efficiencies(other, simulate(design))
+
+
+@pytest.mark.parametrize("design", DESIGNS)
+def test_per_kg_matches_equation_oriented(design):
+    equation_oriented = simulate(design, {"mass_flow_solve_mode": "equation_oriented"})
+    per_kg = simulate(design)
+    assert_same_efficiencies(equation_oriented, per_kg)
+    assert equation_oriented.m_dot_orc_kg_s == pytest.approx(per_kg.m_dot_orc_kg_s, rel=1e-6)
+    # 联立求解没有流量/回热迭代，残差函数调用次数单独记录
+    assert equation_oriented.eo_nfev > 0 and per_kg.eo_nfev is None
+    assert equation_oriented.regen_iterations == equation_oriented.mflow_iterations == 0
+
+
+def neighbour(design):
+    """相邻设计点 (向范围内侧偏移)，用作热启动来源。"""
+    t5_c, pr_scbc, theta_w_c, pr_orc = design
+    return t5_c - 2.0, pr_scbc - 0.05, theta_w_c - 1.0, pr_orc - 0.05
+
+
+@pytest.mark.parametrize("design", DESIGNS)
+def test_warm_start_matches_cold_start(design):
+    warm = simulate(design, warm_start=simulate(neighbour(design)))
+    assert_same_efficiencies(warm, simulate(design))
+
+
+def test_warm_start_cache_matches_cold_start():
+    cold = [simulate(design) for design in DESIGNS]
+    full_cycle_simulator.enable_warm_start_cache()
+    try:
+        for design in DESIGNS:
+            simulate(neighbour(design))
+        warm = [simulate(design) for design in DESIGNS]
+        assert full_cycle_simulator.get_warm_start_cache_stats()["hits"] > 0
+    finally:
+        full_cycle_simulator.disable_warm_start_cache()
+    for warm_result, cold_result in zip(warm, cold):
+        assert_same_efficiencies(warm_result, cold_result)
+
+
+def test_warm_start_prediction_stays_near_neighbours():
+    # 三个近邻几乎共线 (θ5 只差 0.01 °C)，局部线性拟合沿 θ5 方向外推会远离近邻的取值
+    full_cycle_simulator.enable_warm_start_cache()
+    try:
+        for i, (dt5_c, h7_J_kg) in enumerate([(0.0, 4.0e5), (0.01, 4.5e5), (0.02, 4.6e5)]):
+            full_cycle_simulator._store_warm_start(
+                design_params((550.0 + dt5_c, 3.0 + 0.1 * i, 115.0, 3.0)),
+                {"h6_J_kg": 6.0e5 + 1e4 * i, "h7_J_kg": h7_J_kg, "m_dot_total_kg_s": 3000.0 + i,
+                 "m_dot_orc_kg_s": None})
+        predicted = full_cycle_simulator.find_warm_start(design_params((545.0, 3.1, 115.0, 3.0)))
+    finally:
+        full_cycle_simulator.disable_warm_start_cache()
+    # 预测值限制在近邻取值范围向外延伸半个范围之内
+    assert 3.7e5 <= predicted["h7_J_kg"] <= 4.9e5
+    assert 5.9e5 <= predicted["h6_J_kg"] <= 6.3e5
+
+
+def test_scbc_stage_cache_only_resolves_orc():
+    design = DESIGNS[0]
+    orc_only = design[:3] + (design[3] - 0.4,)
+    cold = [simulate(design), simulate(orc_only)]
+    full_cycle_simulator.enable_scbc_stage_cache()
+    try:
+        cached = [simulate(design), simulate(orc_only)]
+        stats = full_cycle_simulator.get_scbc_stage_cache_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert cached[1].regen_iterations == cached[1].mflow_iterations == 0
+        # 命中返回的是副本: 修改其中的状态点不影响之后的命中
+        turbine_inlet = "P5_ER_Out_Turbine_In"
+        cached[0].scbc_states[turbine_inlet].h = 0.0
+        assert simulate(design).scbc_states[turbine_inlet].h == cold[0].scbc_states[turbine_inlet].h
+        # "equation_oriented" 模式的键包含 ORC 参数 (结果中有联立解出的 ORC 流量)
+        simulate(design, {"mass_flow_solve_mode": "equation_oriented"})
+        simulate(orc_only, {"mass_flow_solve_mode": "equation_oriented"})
+        assert full_cycle_simulator.get_scbc_stage_cache_stats()["size"] == 3
+    finally:
+        full_cycle_simulator.disable_scbc_stage_cache()
+    for cached_result, cold_result in zip(cached, cold):
+        assert_same_efficiencies(cached_result, cold_result)
+        assert cached_result.m_dot_orc_kg_s == pytest.approx(cold_result.m_dot_orc_kg_s, rel=1e-9)
+
+
+@pytest.mark.parametrize("superheat_K", [0.0, -5.0])
+def test_direct_orc_mdot_falls_back_to_bracketed_solve(monkeypatch, superheat_K):
+    # 目标温度不高于饱和温度时出口不是过热蒸汽，直接公式不适用，改用有界求根
+    bracketed_calls = []
+    solve_orc_mdot_bracketed = full_cycle_simulator.solve_orc_mdot_bracketed
+
+    def spy(*args):
+        bracketed_calls.append(args)
+        return solve_orc_mdot_bracketed(*args)
+
+    monkeypatch.setattr(full_cycle_simulator, "solve_orc_mdot_bracketed", spy)
+    params = design_params(DESIGNS[0])
+    orc_params = params["orc_parameters"]
+    saturated = StatePoint(params["fluids"]["orc"], "sat").props_from_PQ(orc_params["P_eva_kPa_orc"] * 1e3, 1.0)
+    orc_params["target_theta_w_orc_turbine_inlet_C"] = saturated.T - 273.15 + superheat_K
+    result = full_cycle_simulator.simulate_scbc_orc_cycle(params, verbose=False)
+
+    assert len(bracketed_calls) == 1
+    outlet = result.orc_states["ORC_P_o3_EvaOut_TurbineIn"]
+    pump_outlet = result.orc_states["ORC_P_o2_PumpOut_EvaIn"]
+    assert outlet.T == pytest.approx(saturated.T + superheat_K, abs=1e-3)
+    assert result.m_dot_orc_kg_s * (outlet.h - pump_outlet.h) == pytest.approx(result.Q_go_MW * 1e6, rel=1e-9)
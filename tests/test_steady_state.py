@@ -0,0 +1,95 @@
+# 异步稳态 GA: 两个工作进程下按完成顺序写出全部评估，并记录工作进程利用率
+import csv
+import random
+import signal
+import time
+
+import pytest
+
+import full_cycle_simulator
+import genetic_algorithm_optimizer as ga
+import state_point_calculator
+
+MAX_EVALUATIONS = 30
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def test_steady_state_ga_with_two_workers(ga_output, monkeypatch):
+    output_dir = ga_output("run")
+    monkeypatch.setattr(ga, "USE_FITNESS_CACHE", False)
+    random.seed(2024)
+    best = ga.run_steady_state_ga(n_workers=2, max_evaluations=MAX_EVALUATIONS)
+
+    log = read_csv(output_dir / "ga_optimization_log.csv")
+    assert len(log) == MAX_EVALUATIONS
+    # 日志按完成顺序编号: 每 POPULATION_SIZE 次评估折算为一代
+    assert [(int(row["Generation"]), int(row["Individual"])) for row in log] == \
+           [(k // ga.POPULATION_SIZE + 1, k % ga.POPULATION_SIZE + 1) for k in range(MAX_EVALUATIONS)]
+    assert {row["Backend"] for row in log} == {"inprocess"}
+    assert f"{best['fitness']:.6f}" == max(log, key=lambda row: float(row["Fitness"]))["Fitness"]
+
+    timing = read_csv(output_dir / "ga_steady_state_timing.csv")
+    assert [int(row["Evaluations"]) for row in timing] == \
+           list(range(ga.POPULATION_SIZE, MAX_EVALUATIONS + 1, ga.POPULATION_SIZE))
+    assert all(0.0 < float(row["Utilization"]) <= 1.0 for row in timing)
+
+
+def test_steady_state_ga_runs_serially_with_one_worker(ga_output, monkeypatch):
+    output_dir = ga_output("serial")
+    monkeypatch.setattr(ga, "USE_FITNESS_CACHE", False)
+    monkeypatch.setattr(ga, "create_worker_pool", None)  # 串行评估不建进程池
+    logs = []
+    for _ in range(2):
+        random.seed(2024)
+        ga.run_steady_state_ga(n_workers=1, max_evaluations=MAX_EVALUATIONS)
+        logs.append(read_csv(output_dir / "ga_optimization_log.csv"))
+    assert len(logs[0]) == MAX_EVALUATIONS
+    assert {row["Backend"] for row in logs[0]} == {"inprocess"}
+    # 逐个评估: 同一种子下两次运行的个体序列和结果一致
+    assert [{k: v for k, v in row.items() if k != "EvalTime_s"} for row in logs[0]] == \
+           [{k: v for k, v in row.items() if k != "EvalTime_s"} for row in logs[1]]
+    # 由这里开启的缓存在结束后关闭
+    assert not state_point_calculator.PROPERTY_CACHE_ENABLED
+    assert not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED
+
+
+def test_steady_state_ga_rejects_other_backends(ga_output):
+    ga_output("backend")
+    with pytest.raises(ValueError):
+        ga.run_steady_state_ga(n_workers=1, max_evaluations=MAX_EVALUATIONS, backend="batch")
+
+
+def stuck_chunk(genes_list, timeout_s, param_overrides=None):
+    """θ5 的第三位小数为 0 的个体屏蔽 SIGALRM 后长时间不返回，模拟卡在 C 扩展内的评估。"""
+    if round(genes_list[0]["theta_5_c"] * 1000) % 10 == 0:
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        time.sleep(5.0)
+    return ga_evaluate_chunk(genes_list, timeout_s, param_overrides)
+
+
+ga_evaluate_chunk = ga._evaluate_chunk
+
+
+def test_stuck_worker_is_recorded_as_failed(ga_output, monkeypatch):
+    output_dir = ga_output("stuck")
+    monkeypatch.setattr(ga, "USE_FITNESS_CACHE", False)
+    monkeypatch.setattr(ga, "EVAL_TIMEOUT_S", 0.3)
+    monkeypatch.setattr(ga, "_evaluate_chunk", stuck_chunk)
+    random.seed(7)
+    start_time = time.perf_counter()
+    ga.run_steady_state_ga(n_workers=2, max_evaluations=MAX_EVALUATIONS)
+    assert time.perf_counter() - start_time < 5.0 * MAX_EVALUATIONS / 4
+
+    log = read_csv(output_dir / "ga_optimization_log.csv")
+    assert len(log) == MAX_EVALUATIONS
+    stuck = [round(float(row["theta_5_c"]) * 1000) % 10 == 0 for row in log]
+    failed = [row["ThermalEfficiency"] == "N/A" for row in log]
+    assert any(stuck)
+    assert all(failed_row for failed_row, stuck_row in zip(failed, stuck) if stuck_row)
+    # 与卡住的任务排在同一工作进程上的任务也会超时，每个卡住的工作进程最多再拖累 TASKS_PER_WORKER - 1 个
+    assert sum(failed) - sum(stuck) <= sum(stuck) * (ga.STEADY_STATE_TASKS_PER_WORKER - 1)
+    assert {row["Backend"] for row in log} == {"inprocess"}
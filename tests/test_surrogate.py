@@ -0,0 +1,60 @@
+# 代理模型预筛选: 部分个体只用预测值，真实模拟次数减少，历史最优和精英必须是真实模拟过的个体
+import csv
+import random
+
+import genetic_algorithm_optimizer as ga
+
+GENERATIONS = 5
+
+
+def read_csv(path):
+    with open(path, encoding="utf-8", newline="") as csv_file:
+        return list(csv.DictReader(csv_file))
+
+
+def test_surrogate_screens_part_of_each_generation(ga_output, monkeypatch):
+    output_dir = ga_output("run")
+    monkeypatch.setattr(ga, "USE_SURROGATE", True)
+    monkeypatch.setattr(ga, "USE_FITNESS_CACHE", False)
+    monkeypatch.setattr(ga, "MAX_GENERATIONS", GENERATIONS)
+    random.seed(2024)
+    best = ga.run_genetic_algorithm(backend="inprocess", n_workers=1)
+
+    log = read_csv(output_dir / "ga_optimization_log.csv")
+    assert len(log) == GENERATIONS * ga.POPULATION_SIZE
+    screened = [row for row in log if row["Backend"] == "surrogate"]
+    assert screened
+    assert all(row["Backend"] != "surrogate" for row in log if row["Generation"] == "1")
+
+    surrogate_log = read_csv(output_dir / "ga_surrogate_log.csv")
+    assert sum(int(row["Screened"]) for row in surrogate_log) == len(screened)
+
+    simulated_genes = {tuple(row[var_name] for var_name in ga.VAR_NAMES) for row in log
+                       if row["Backend"] != "surrogate"}
+    assert tuple(f"{best['genes'][var_name]:.4f}" for var_name in ga.VAR_NAMES) in simulated_genes
+
+
+def test_elite_is_a_simulated_individual(ga_output, monkeypatch):
+    output_dir = ga_output("optimistic")
+    monkeypatch.setattr(ga, "USE_SURROGATE", True)
+    monkeypatch.setattr(ga, "USE_FITNESS_CACHE", False)
+    monkeypatch.setattr(ga, "MAX_GENERATIONS", GENERATIONS)
+    # 过于乐观的代理模型: 预测值都高于任何真实模拟的适应度
+    predict_surrogate = ga.predict_surrogate
+
+    def optimistic_prediction(surrogate, genes_matrix):
+        predicted, distance = predict_surrogate(surrogate, genes_matrix)
+        return predicted + 1.0, distance
+
+    monkeypatch.setattr(ga, "predict_surrogate", optimistic_prediction)
+    random.seed(2024)
+    ga.run_genetic_algorithm(backend="inprocess", n_workers=1)
+
+    log = read_csv(output_dir / "ga_optimization_log.csv")
+    # 每代的精英 (下一代第 1 个个体) 是上一代真实模拟过的个体中适应度最高的
+    for generation in range(1, GENERATIONS):
+        rows = [row for row in log if int(row["Generation"]) == generation]
+        simulated = [row for row in rows if row["Backend"] != "surrogate"]
+        elite = next(row for row in log if int(row["Generation"]) == generation + 1 and row["Individual"] == "1")
+        best_simulated = max(simulated, key=lambda row: float(row["Fitness"]))
+        assert [elite[var_name] for var_name in ga.VAR_NAMES] == [best_simulated[var_name] for var_name in ga.VAR_NAMES]
@@ -0,0 +1,87 @@
+# 通用参数扫描引擎: 扫描点生成、参数覆盖、结果顺序和并行/串行一致性
+import csv
+
+import pytest
+
+import full_cycle_simulator
+import state_point_calculator
+import sweep_engine
+
+GRID = {"pr_scbc": [2.6, 3.2], "theta_w_c": [110.0, 130.0]}
+FIXED = {"theta_5_c": 599.85}
+METRICS = ["Total_Thermal_Efficiency_percent", "Total_Net_Power_MW"]
+
+
+def test_build_cases_is_a_nested_loop_product():
+    cases = sweep_engine.build_cases(GRID, FIXED)
+    assert [(case["pr_scbc"], case["theta_w_c"]) for case in cases] == \
+           [(2.6, 110.0), (2.6, 130.0), (3.2, 110.0), (3.2, 130.0)]
+    assert all(case["theta_5_c"] == 599.85 for case in cases)
+    with pytest.raises(ValueError):
+        sweep_engine.build_cases({"no_such_parameter": [1.0]})
+
+
+def test_case_parameters_apply_aliases_and_sections():
+    params = sweep_engine.case_parameters(
+        {"pr_orc": 3.0, "eta_T_turbine": 0.88, "orc_parameters.eta_PO_pump": 0.7},
+        param_overrides={"scbc_parameters": {"tol_scbc_h_kJ_kg": 1e-4}})
+    assert params["orc_parameters"]["target_pr_orc_expansion_ratio"] == 3.0
+    assert params["scbc_parameters"]["T5_turbine_inlet_C"] == sweep_engine.DEFAULT_DESIGN["theta_5_c"]
+    assert params["scbc_parameters"]["eta_T_turbine"] == 0.88
+    assert params["orc_parameters"]["eta_PO_pump"] == 0.7
+    assert params["scbc_parameters"]["tol_scbc_h_kJ_kg"] == 1e-4
+
+
+def test_run_sweep_writes_rows_in_grid_order(tmp_path):
+    output_path = str(tmp_path / "sweep.csv")
+    rows = sweep_engine.run_sweep(GRID, FIXED, output_path, metrics=METRICS, column_names={"pr_scbc": "PR_scbc"},
+                                  n_workers=1, verbose=False)
+    with open(output_path, encoding="utf-8", newline="") as output_file:
+        written = list(csv.DictReader(output_file))
+    assert list(written[0]) == ["PR_scbc", "theta_w_c"] + METRICS
+    assert [(float(row["PR_scbc"]), float(row["theta_w_c"])) for row in written] == \
+           [(row["PR_scbc"], row["theta_w_c"]) for row in rows] == \
+           [(2.6, 110.0), (2.6, 130.0), (3.2, 110.0), (3.2, 130.0)]
+    # 热启动路径上的结果与逐点冷启动一致 (指标保留两位小数)
+    for case, row in zip(sweep_engine.build_cases(GRID, FIXED), rows):
+        metric_values, _, error = sweep_engine.simulate_case(case, METRICS)
+        assert error is None
+        for metric in METRICS:
+            assert row[metric] == pytest.approx(metric_values[metric], abs=0.011)
+
+
+def test_parallel_sweep_matches_serial_sweep(tmp_path):
+    output_path = str(tmp_path / "sweep.csv")
+    serial = sweep_engine.run_sweep(GRID, FIXED, metrics=METRICS, n_workers=1, verbose=False)
+    parallel = sweep_engine.run_sweep(GRID, FIXED, output_path, metrics=METRICS, n_workers=2, verbose=False)
+    assert len(parallel) == len(serial)
+    # 各块按完成顺序写出，结束后按网格顺序重写
+    with open(output_path, encoding="utf-8", newline="") as output_file:
+        written = list(csv.DictReader(output_file))
+    assert [(float(row["pr_scbc"]), float(row["theta_w_c"])) for row in written] == \
+           [(row["pr_scbc"], row["theta_w_c"]) for row in serial]
+    for parallel_row, serial_row in zip(parallel, serial):
+        assert parallel_row["pr_scbc"] == serial_row["pr_scbc"]
+        for metric in METRICS:
+            assert parallel_row[metric] == pytest.approx(serial_row[metric], abs=0.011)
+
+
+def test_serial_sweep_restores_cache_state():
+    rows = sweep_engine.run_sweep(GRID, FIXED, metrics=METRICS, n_workers=1, verbose=False)
+    assert not full_cycle_simulator.WARM_START_CACHE_ENABLED
+    assert not full_cycle_simulator.SCBC_STAGE_CACHE_ENABLED
+    assert not state_point_calculator.PROPERTY_CACHE_ENABLED
+    # simulate_many 要求热启动关闭
+    results = full_cycle_simulator.simulate_many([[599.85, 2.6, 110.0, 3.37]])
+    assert results["valid"][0]
+    assert round(results["eta_combined_thermal"][0] * 100, 2) == \
+           pytest.approx(rows[0]["Total_Thermal_Efficiency_percent"], abs=0.011)
+
+    # 调用前已开启的缓存保持开启
+    state_point_calculator.enable_property_cache()
+    try:
+        sweep_engine.run_sweep(GRID, FIXED, metrics=METRICS, n_workers=1, verbose=False)
+        assert state_point_calculator.PROPERTY_CACHE_ENABLED
+        assert not full_cycle_simulator.WARM_START_CACHE_ENABLED
+    finally:
+        state_point_calculator.disable_property_cache()